@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from time import perf_counter
 
 from fastapi import FastAPI, HTTPException
@@ -15,13 +16,58 @@ from src.controllers.exercise_controller import exercise_controller
 from src.controllers.user_controller import user_controller
 from starlette import status
 from starlette.requests import Request
-from starlette.responses import JSONResponse
 
 from src.security.secrets import SECRET
+from src.services.ArticlesService import article_views_flusher
+from src.services.RevocationService import revocation_refresher
+from src.utils.compression import CompressionMiddleware
+from src.utils.query_stats import (
+    DUPLICATE_QUERY_HEADER,
+    QUERY_COUNT_HEADER,
+    QUERY_TIME_HEADER,
+    QueryStats,
+    current_query_stats,
+    log_query_stats,
+)
+from src.utils.periodic import PeriodicTask
+from src.utils.reference_data import refresh_reference_tables
+from src.utils.sanitizer import sanitizer
+from src.utils.serialization import (
+    SERIALIZATION_TIME_HEADER,
+    SerializationStats,
+    TimedORJSONResponse,
+    current_serialization_stats,
+    log_serialization_stats,
+)
 
 ic(f"Targeted db: {SECRET.MARIADB_DATABASE}")
 
-app = FastAPI()
+
+reference_data_refresher = PeriodicTask(
+    "reference-data-refresh",
+    SECRET.REFERENCE_DATA_REFRESH_SECONDS,
+    refresh_reference_tables,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Loads the most read articles, the reference data and the revoked tokens
+    # before the first request
+    await article_views_flusher.run_once()
+    await reference_data_refresher.run_once()
+    await revocation_refresher.run_once()
+    article_views_flusher.start()
+    reference_data_refresher.start()
+    revocation_refresher.start()
+    yield
+    await revocation_refresher.stop(run_last=False)
+    await reference_data_refresher.stop(run_last=False)
+    await article_views_flusher.stop()
+    sanitizer.shutdown()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=TimedORJSONResponse)
 origins = ["*"]
 app.add_middleware(
     CORSMiddleware,
@@ -30,6 +76,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware, minimum_size=SECRET.COMPRESSION_MINIMUM_SIZE)
 app.include_router(admin_controller)
 app.include_router(auth_controller)
 app.include_router(user_controller)
@@ -74,10 +121,24 @@ async def check_user_role(
     uri = request.url.path.rstrip("/")
     method = request.method
     ic(f"Requested {method} {uri = }")
+    query_stats = QueryStats()
+    stats_token = current_query_stats.set(query_stats)
+    serialization_stats = SerializationStats()
+    serialization_token = current_serialization_stats.set(serialization_stats)
     start_time = perf_counter()
-    response: _StreamingResponse = await next_function(request)
+    try:
+        response: _StreamingResponse = await next_function(request)
+    finally:
+        current_query_stats.reset(stats_token)
+        current_serialization_stats.reset(serialization_token)
     process_time = perf_counter() - start_time
     response.headers["X-Process-Time"] = str(process_time)
+    response.headers[QUERY_COUNT_HEADER] = str(query_stats.count)
+    response.headers[QUERY_TIME_HEADER] = str(query_stats.total_time)
+    response.headers[DUPLICATE_QUERY_HEADER] = str(query_stats.duplicates)
+    response.headers[SERIALIZATION_TIME_HEADER] = str(serialization_stats.total_time)
+    log_query_stats(method, uri, query_stats)
+    log_serialization_stats(method, uri, serialization_stats)
     return response
 
 
@@ -94,7 +155,7 @@ async def validation_exception_handler(request, exc):
         error_type = error.get("type").capitalize().replace("_", " ")
         error_message = error.get("msg").removeprefix(f"{error_type}, ")
         errors_dict[location] = {"type": error.get("type"), "message": error_message}
-    return JSONResponse(
+    return TimedORJSONResponse(
         status_code=status.HTTP_400_BAD_REQUEST,
         content={"message": VALIDATION_ERROR, "errors": errors_dict},
     )
@@ -102,7 +163,7 @@ async def validation_exception_handler(request, exc):
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc):
-    return JSONResponse(
+    return TimedORJSONResponse(
         status_code=exc.status_code,
         content={"message": exc.detail},
     )
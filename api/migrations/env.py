@@ -1,21 +1,19 @@
 from logging.config import fileConfig
 
-from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 from src.models import SQLModel
 
 from alembic import context
 
-from src.security.secrets import SECRET
+from src.utils.db_backend import create_sync_database_engine, get_database_url
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
-section = config.config_ini_section
-config.set_section_option(section, "MARIADB_USER", SECRET.MARIADB_USER)
-config.set_section_option(section, "MARIADB_PASSWORD", SECRET.MARIADB_PASSWORD)
-config.set_section_option(section, "MARIADB_HOST", SECRET.MARIADB_HOST)
-config.set_section_option(section, "MARIADB_DATABASE", SECRET.MARIADB_DATABASE)
+# The ini file goes through the configparser interpolation
+config.set_main_option(
+    "sqlalchemy.url", get_database_url(is_async=False).replace("%", "%%")
+)
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -66,14 +64,18 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
-    connectable = engine_from_config(
-        config.get_section(config.config_ini_section, {}),
-        prefix="sqlalchemy.",
+    connectable = create_sync_database_engine(
+        config.get_main_option("sqlalchemy.url"),
         poolclass=pool.NullPool,
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite rebuilds the table for most ALTER statements
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
         with context.begin_transaction():
             context.run_migrations()
 
@@ -0,0 +1,39 @@
+"""category article count
+
+Revision ID: 5b7e9c1d2f40
+Revises: 8d1f4c2a9b73
+Create Date: 2026-10-18 15:41:09.532817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel  # noqa: F401
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e9c1d2f40'
+down_revision: Union[str, None] = '8d1f4c2a9b73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'category',
+        sa.Column('article_count', sa.Integer(), server_default='0', nullable=False),
+    )
+    # Counts of the articles already there, kept up to date by the API from now on
+    op.execute(
+        'UPDATE category SET article_count = '
+        '(SELECT COUNT(*) FROM article WHERE article.id_category = category.id)'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # A plain ALTER on SQLite too, a batch copy of the table would break the
+    # foreign keys of the articles
+    op.drop_column('category', 'article_count')
@@ -0,0 +1,50 @@
+"""hot query indexes
+
+Revision ID: 8d1f4c2a9b73
+Revises: 2ffa199d1d75
+Create Date: 2026-10-18 10:12:44.218301
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel  # noqa: F401
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d1f4c2a9b73'
+down_revision: Union[str, None] = '2ffa199d1d75'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_article_created_at', 'article', ['created_at'], unique=False)
+    op.create_index('ix_article_id_category_created_at', 'article', ['id_category', 'created_at'], unique=False)
+    op.create_index('ix_login_log_id_user_date_connexion', 'login_log', ['id_user', 'date_connexion'], unique=False)
+    op.create_index('ix_user_deleted_at_disabled_at', 'user', ['deleted_at', 'disabled_at'], unique=False)
+    op.create_index('ix_user_role_deleted_at_disabled_at', 'user', ['role', 'deleted_at', 'disabled_at'], unique=False)
+
+
+def ensure_foreign_key_index(table: str, column: str) -> None:
+    """
+    MariaDB silently drops the implicit index of a foreign key once a composite
+    index starting with the same column exists, it must be back before the
+    composite index can be dropped.
+    """
+    indexes = sa.inspect(op.get_bind()).get_indexes(table)
+    if not any(index['column_names'] == [column] for index in indexes):
+        op.create_index(column, table, [column], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_role_deleted_at_disabled_at', table_name='user')
+    op.drop_index('ix_user_deleted_at_disabled_at', table_name='user')
+    ensure_foreign_key_index('login_log', 'id_user')
+    op.drop_index('ix_login_log_id_user_date_connexion', table_name='login_log')
+    ensure_foreign_key_index('article', 'id_category')
+    op.drop_index('ix_article_id_category_created_at', table_name='article')
+    op.drop_index('ix_article_created_at', table_name='article')
@@ -0,0 +1,34 @@
+"""article view count
+
+Revision ID: c3a84e6f1b25
+Revises: 5b7e9c1d2f40
+Create Date: 2026-10-18 17:06:52.118904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel  # noqa: F401
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a84e6f1b25'
+down_revision: Union[str, None] = '5b7e9c1d2f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'article',
+        sa.Column('view_count', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.create_index('ix_article_view_count', 'article', ['view_count'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_article_view_count', table_name='article')
+    op.drop_column('article', 'view_count')
@@ -0,0 +1,42 @@
+"""token revocation
+
+Revision ID: e7d2b5a9c413
+Revises: c3a84e6f1b25
+Create Date: 2026-10-18 21:42:17.503816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel  # noqa: F401
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7d2b5a9c413'
+down_revision: Union[str, None] = 'c3a84e6f1b25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'token_revocation',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('jti', sqlmodel.sql.sqltypes.AutoString(length=32), nullable=True),
+        sa.Column('id_user', sa.Uuid(), nullable=True),
+        sa.Column('revoked_before', sa.Double(), nullable=False),
+        sa.Column('expires_at', sa.Double(), nullable=False),
+        sa.ForeignKeyConstraint(['id_user'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_token_revocation_expires_at', 'token_revocation', ['expires_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_token_revocation_expires_at', table_name='token_revocation')
+    op.drop_table('token_revocation')
@@ -39,6 +39,7 @@ TARGET_USER_DISABLED_SUCCESSFULLY = "Le compte cible a bien été désactivé"
 TARGET_USER_ENABLED_SUCCESSFULLY = "Le compte cible a bien été activé"
 TARGET_USER_DELETED_SUCCESSFULLY = "Le compte cible a bien été supprimé"
 TARGET_USER_PROMOTED_SUCCESSFULLY = "Le compte cible a bien été promu"
+USER_LOGGED_OUT_SUCCESSFULLY = "Vous avez bien été déconnecté"
 TARGET_USER_PASSWORD_RESET_SUCCESSFULLY = "Le mot de passe à bien été réinitialisé" # NOSONAR
 TARGET_USER_DOESNT_EXISTS = UserAdminError("Le compte cible n'existe pas")
 TARGET_USER_IS_ADMIN = UserAdminError("Le compte cible est un administrateur")
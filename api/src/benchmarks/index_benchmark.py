@@ -0,0 +1,195 @@
+"""
+Latency of the hot query shapes before and after the 8d1f4c2a9b73 indexes.
+
+The database configured in api.env is reset and seeded, use a dedicated one:
+    python -m src.benchmarks.index_benchmark --articles 200000
+"""
+import argparse
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from random import choice, randint, random
+from statistics import median, quantiles
+from time import perf_counter
+from typing import Awaitable, Callable, Dict, List
+
+from alembic import command
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert, select, text
+
+from main import app
+from src.enums.Roles import Roles
+from src.fixtures.reset_db import alembic_cfg, engine, reset
+from src.models import Article, Category, LoginLog, User
+from src.services.JWTService import JWTService
+from src.services.PasswordService import crypt_context
+from src.utils.db import SessionFactory, async_engine
+
+INDEX_REVISION = "8d1f4c2a9b73"
+PREVIOUS_REVISION = "2ffa199d1d75"
+CHUNK_SIZE = 5000
+CATEGORIES = 20
+NOW = datetime.now()
+
+
+def chunked_insert(model, rows: List[dict]):
+    with engine.begin() as connection:
+        for start in range(0, len(rows), CHUNK_SIZE):
+            connection.execute(insert(model), rows[start : start + CHUNK_SIZE])
+
+
+def random_date(days: int = 365) -> datetime:
+    return NOW - timedelta(seconds=randint(0, days * 24 * 3600))
+
+
+def seed(nb_users: int, nb_articles: int, nb_logins: int) -> User:
+    print(f"🚀 Seeding {nb_users} users, {nb_articles} articles, {nb_logins} logins")
+    hashed_password = crypt_context.hash("benchmark")
+    admin = User(
+        login="admin",
+        email="admin@email.com",
+        hashed_password=hashed_password,
+        role=Roles.ADMIN,
+    )
+    users = [admin.model_dump()]
+    for index in range(nb_users):
+        status = random()
+        users.append(
+            User(
+                login=f"user_{index}",
+                email=f"user_{index}@email.com",
+                hashed_password=hashed_password,
+                role=Roles.ADMIN if index % 50 == 0 else Roles.USER,
+                disabled_at=random_date() if 0.8 < status <= 0.9 else None,
+                deleted_at=random_date() if status > 0.9 else None,
+                created_at=random_date(),
+            ).model_dump()
+        )
+    chunked_insert(User, users)
+    chunked_insert(
+        Category, [{"label": f"Category {index}"} for index in range(CATEGORIES)]
+    )
+    user_ids = [user["id"] for user in users]
+    chunked_insert(
+        Article,
+        [
+            {
+                "title": f"Article {index}",
+                "content": "<p>Lorem ipsum dolor sit amet</p>",
+                "created_at": random_date(),
+                "id_user": admin.id,
+                "id_category": randint(1, CATEGORIES),
+            }
+            for index in range(nb_articles)
+        ],
+    )
+    chunked_insert(
+        LoginLog,
+        [
+            {"date_connexion": random_date(), "id_user": choice(user_ids)}
+            for _ in range(nb_logins)
+        ],
+    )
+    print("✅ Seeded with success !")
+    return admin
+
+
+async def last_logins_of_user(user_id: uuid.UUID):
+    async with SessionFactory() as session:
+        sql = (
+            select(LoginLog)
+            .where(LoginLog.id_user == user_id)
+            .order_by(LoginLog.date_connexion.desc())
+            .limit(20)
+        )
+        await session.exec(sql)
+
+
+def get_scenarios(
+    client: AsyncClient, token: str, user_id: uuid.UUID
+) -> Dict[str, Callable[[], Awaitable]]:
+    headers = {"Authorization": f"Bearer {token}"}
+    return {
+        "GET /articles/": lambda: client.get("/articles/"),
+        "GET /articles/?category_id=1": lambda: client.get(
+            "/articles/", params={"category_id": 1}
+        ),
+        "GET /admin/users?status=disabled": lambda: client.get(
+            "/admin/users", params={"status": "disabled"}, headers=headers
+        ),
+        "GET /admin/users?status=enabled&role=admin": lambda: client.get(
+            "/admin/users",
+            params={"status": "enabled", "role": Roles.ADMIN.value},
+            headers=headers,
+        ),
+        "login_log of a user by date": lambda: last_logins_of_user(user_id),
+    }
+
+
+async def measure(token: str, user_id: uuid.UUID, runs: int) -> Dict[str, List[float]]:
+    timings: Dict[str, List[float]] = {}
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://benchmark"
+    ) as client:
+        for name, scenario in get_scenarios(client, token, user_id).items():
+            # The first call warms the pool and the buffer pool of the server
+            await scenario()
+            durations = []
+            for _ in range(runs):
+                start_time = perf_counter()
+                await scenario()
+                durations.append((perf_counter() - start_time) * 1000)
+            timings[name] = durations
+    # The next measure runs on another schema, no connection is reused
+    await async_engine.dispose()
+    return timings
+
+
+def p95(durations: List[float]) -> float:
+    return quantiles(durations, n=20)[-1]
+
+
+def print_report(before: Dict[str, List[float]], after: Dict[str, List[float]]):
+    print(
+        f"{'scenario':<45}{'before p50':>12}{'after p50':>12}"
+        f"{'before p95':>12}{'after p95':>12}{'speedup':>9}"
+    )
+    for name, durations in before.items():
+        before_median, after_median = median(durations), median(after[name])
+        print(
+            f"{name:<45}{before_median:>10.2f}ms{after_median:>10.2f}ms"
+            f"{p95(durations):>10.2f}ms{p95(after[name]):>10.2f}ms"
+            f"{before_median / after_median:>8.1f}x"
+        )
+
+
+def run(nb_users: int, nb_articles: int, nb_logins: int, runs: int):
+    reset()
+    admin = seed(nb_users, nb_articles, nb_logins)
+    token = JWTService.create_access_token(admin)
+    with engine.begin() as connection:
+        if connection.dialect.name == "sqlite":
+            connection.execute(text("ANALYZE"))
+        else:
+            connection.execute(text("ANALYZE TABLE article, login_log, user"))
+
+    print(f"🚀 Downgrade to {PREVIOUS_REVISION}")
+    command.downgrade(alembic_cfg, PREVIOUS_REVISION)
+    before = asyncio.run(measure(token, admin.id, runs))
+
+    print(f"🚀 Upgrade to {INDEX_REVISION}")
+    command.upgrade(alembic_cfg, INDEX_REVISION)
+    after = asyncio.run(measure(token, admin.id, runs))
+    command.upgrade(alembic_cfg, "head")
+
+    print_report(before, after)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--articles", type=int, default=100000)
+    parser.add_argument("--logins", type=int, default=200000)
+    parser.add_argument("--runs", type=int, default=30)
+    arguments = parser.parse_args()
+    run(arguments.users, arguments.articles, arguments.logins, arguments.runs)
@@ -0,0 +1,139 @@
+"""
+Cost per row of the list endpoints: ORM entities, ORM columns, and the Core
+select mapped into plain dicts then validated once per response.
+
+Runs on an in-memory sqlite database, nothing else is touched:
+    python -m src.benchmarks.read_path_benchmark --rows 10000
+"""
+import argparse
+import asyncio
+import uuid
+from datetime import datetime
+from time import perf_counter
+from typing import Awaitable, Callable, Dict
+
+from sqlalchemy import insert
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.dto.dto_articles import GetAllArticleResponse, GetArticleResponseMin
+from src.dto.dto_utilisateurs import UserAdminViewAllUsers, UserAdminViewSingleUser
+from src.models import Article, Category, User
+from src.services.ArticlesService import ArticleService
+from src.utils.db_backend import create_database_engine
+from src.utils.rows import fetch_dicts
+
+USER_COLUMNS = [getattr(User, field) for field in UserAdminViewSingleUser.model_fields]
+
+
+async def seed(engine, nb_rows: int):
+    now = datetime.now()
+    users = [
+        {
+            "id": uuid.uuid4(),
+            "login": f"user_{index}",
+            "email": f"user_{index}@email.com",
+            "hashed_password": "benchmark",
+            "created_at": now,
+        }
+        for index in range(nb_rows)
+    ]
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+        await connection.execute(insert(User), users)
+        await connection.execute(insert(Category), [{"label": "Category"}])
+        await connection.execute(
+            insert(Article),
+            [
+                {
+                    "title": f"Article {index}",
+                    "content": "<p>Lorem ipsum dolor sit amet</p>" * 10,
+                    "created_at": now,
+                    "id_user": users[0]["id"],
+                    "id_category": 1,
+                }
+                for index in range(nb_rows)
+            ],
+        )
+
+
+async def articles_orm_entities(session: AsyncSession):
+    result = await session.exec(select(Article, User, Category).join(User).join(Category))
+    articles = []
+    for article, _, _ in result.all():
+        article_model = article.model_dump()
+        article_model["category"] = article.category.label
+        article_model["creator"] = article.user.login
+        articles.append(GetArticleResponseMin.model_validate(article_model))
+    return GetAllArticleResponse(articles=articles)
+
+
+async def articles_orm_columns(session: AsyncSession):
+    result = await session.exec(ArticleService.build_list_query())
+    return GetAllArticleResponse(
+        articles=[GetArticleResponseMin.model_validate(row._mapping) for row in result]
+    )
+
+
+async def articles_core_dicts(session: AsyncSession):
+    rows = await fetch_dicts(session, ArticleService.build_list_query())
+    return GetAllArticleResponse.model_validate({"articles": rows})
+
+
+async def users_orm_entities(session: AsyncSession):
+    result = await session.exec(select(User))
+    return UserAdminViewAllUsers(
+        users=[
+            UserAdminViewSingleUser.model_validate(user.model_dump())
+            for user in result.all()
+        ]
+    )
+
+
+async def users_core_dicts(session: AsyncSession):
+    rows = await fetch_dicts(session, select(*USER_COLUMNS))
+    return UserAdminViewAllUsers.model_validate({"users": rows})
+
+
+SCENARIOS: Dict[str, Callable[[AsyncSession], Awaitable]] = {
+    "articles: ORM entities + model_dump": articles_orm_entities,
+    "articles: ORM columns + RowMapping": articles_orm_columns,
+    "articles: Core select + dicts": articles_core_dicts,
+    "users: ORM entities + model_dump": users_orm_entities,
+    "users: Core select + dicts": users_core_dicts,
+}
+
+
+async def measure(nb_rows: int, runs: int) -> Dict[str, float]:
+    engine = create_database_engine("sqlite+aiosqlite:///:memory:")
+    await seed(engine, nb_rows)
+    timings: Dict[str, float] = {}
+    try:
+        for name, scenario in SCENARIOS.items():
+            best = float("inf")
+            for _ in range(runs):
+                # A new session each run, the identity map starts empty
+                async with AsyncSession(engine) as session:
+                    start_time = perf_counter()
+                    await scenario(session)
+                    best = min(best, perf_counter() - start_time)
+            timings[name] = best / nb_rows * 1_000_000
+    finally:
+        await engine.dispose()
+    return timings
+
+
+def run(nb_rows: int, runs: int):
+    print(f"🚀 {nb_rows} rows, best of {runs} runs")
+    timings = asyncio.run(measure(nb_rows, runs))
+    print(f"{'read path':<45}{'per row':>12}")
+    for name, microseconds in timings.items():
+        print(f"{name:<45}{microseconds:>10.2f}µs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=5)
+    arguments = parser.parse_args()
+    run(arguments.rows, arguments.runs)
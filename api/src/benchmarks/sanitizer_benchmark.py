@@ -0,0 +1,130 @@
+"""
+Cost of cleaning TipTap HTML in the thread pool (previous path) compared to
+the worker processes of src.utils.sanitizer, on a small and a very large
+document. The loop lag is the worst delay of a 1ms ticker while cleaning:
+it is the latency every other request of the worker would suffer.
+    python -m src.benchmarks.sanitizer_benchmark --concurrency 16
+"""
+import argparse
+import asyncio
+from statistics import median
+from time import perf_counter
+from typing import Awaitable, Callable, Dict, List
+
+from src.utils.sanitizer import Sanitizer, clean_html
+
+TICK_SECONDS = 0.001
+
+
+def tiptap_document(nb_paragraphs: int, seed: int = 0) -> str:
+    """HTML shaped like the output of the editor, with a few forbidden tags"""
+    blocks = []
+    for index in range(nb_paragraphs):
+        blocks.append(
+            f'<h2>Étape {seed}-{index}</h2><p style="color: red">Respirez '
+            f"<strong>profondément</strong>, <em>relâchez</em> les épaules "
+            f'<a href="https://example.com/{index}" onclick="track()">ici</a>.'
+            f"<script>alert({index})</script></p>"
+            f"<ul><li>inspirez</li><li>expirez</li></ul><img src=x onerror=y>"
+        )
+    return "".join(blocks)
+
+
+async def thread_clean(contents: List[str]) -> List[str]:
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(
+        *(loop.run_in_executor(None, clean_html, content) for content in contents)
+    )
+
+
+async def measure_lag(work: Awaitable) -> tuple:
+    """Duration of the work and worst delay of the ticker meanwhile"""
+    worst_lag = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal worst_lag
+        while not done:
+            start_time = perf_counter()
+            await asyncio.sleep(TICK_SECONDS)
+            worst_lag = max(worst_lag, perf_counter() - start_time - TICK_SECONDS)
+
+    ticker_task = asyncio.create_task(ticker())
+    start_time = perf_counter()
+    await work
+    duration = perf_counter() - start_time
+    done = True
+    await ticker_task
+    return duration * 1000, worst_lag * 1000
+
+
+async def run_scenario(
+    clean: Callable[[List[str]], Awaitable[List[str]]],
+    contents: List[str],
+    runs: int,
+) -> Dict[str, float]:
+    # The first call starts the worker processes
+    await clean(contents[:1])
+    durations, lags = [], []
+    for _ in range(runs):
+        duration, lag = await measure_lag(clean(contents))
+        durations.append(duration)
+        lags.append(lag)
+    return {
+        "p50": median(durations),
+        "docs/s": len(contents) / (median(durations) / 1000),
+        "lag": max(lags),
+    }
+
+
+async def run(concurrency: int, runs: int, workers: int):
+    documents = {
+        "small (~2KB)": 5,
+        "very large (~1MB)": 2500,
+    }
+    print(
+        f"{'document':<20}{'path':<12}{'p50':>12}{'docs/s':>10}{'max lag':>12}"
+    )
+    for name, nb_paragraphs in documents.items():
+        # Distinct documents, the memo only helps the last scenario
+        contents = [
+            tiptap_document(nb_paragraphs, seed) for seed in range(concurrency)
+        ]
+        size = len(contents[0].encode()) + 1
+        sanitizer = Sanitizer(
+            workers=workers,
+            max_content_bytes=size,
+            timeout_seconds=600,
+            memo_size=0,
+        )
+        memoized = Sanitizer(
+            workers=workers,
+            max_content_bytes=size,
+            timeout_seconds=600,
+            memo_size=concurrency,
+        )
+        await memoized.sanitize_batch(contents)
+        scenarios = {
+            "threads": thread_clean,
+            "processes": sanitizer.sanitize_batch,
+            "memo": memoized.sanitize_batch,
+        }
+        try:
+            for path, clean in scenarios.items():
+                result = await run_scenario(clean, contents, runs)
+                print(
+                    f"{name:<20}{path:<12}{result['p50']:>10.2f}ms"
+                    f"{result['docs/s']:>10.1f}{result['lag']:>10.2f}ms"
+                )
+        finally:
+            sanitizer.shutdown()
+            memoized.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=4)
+    arguments = parser.parse_args()
+    asyncio.run(run(arguments.concurrency, arguments.runs, arguments.workers))
@@ -0,0 +1,83 @@
+"""
+Throughput of authenticated requests with and without the verified-token cache.
+
+The route only runs the token dependencies, no database is touched:
+    python -m src.benchmarks.token_cache_benchmark --requests 5000
+"""
+import argparse
+import asyncio
+from time import perf_counter
+from typing import Dict, List
+
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.enums.Roles import Roles
+from src.models import User
+from src.security.secrets import SECRET
+from src.services.AuthService import AuthService
+from src.services.JWTService import JWTService, token_cache
+
+benchmark_app = FastAPI()
+
+
+@benchmark_app.get("/protected", dependencies=[Depends(AuthService.is_logged_as_user)])
+async def protected():
+    return {"hello": "world"}
+
+
+def get_tokens(nb_users: int) -> List[str]:
+    return [
+        JWTService.create_access_token(
+            User(login=f"user_{index}", email=f"user_{index}@email.com", role=Roles.USER)
+        )
+        for index in range(nb_users)
+    ]
+
+
+async def measure_requests(tokens: List[str], nb_requests: int) -> float:
+    """Requests per second, each user sending its token in turn"""
+    async with AsyncClient(
+        transport=ASGITransport(app=benchmark_app), base_url="http://benchmark"
+    ) as client:
+        start_time = perf_counter()
+        for index in range(nb_requests):
+            token = tokens[index % len(tokens)]
+            response = await client.get(
+                "/protected", headers={"Authorization": f"Bearer {token}"}
+            )
+            assert response.status_code == 200
+        return nb_requests / (perf_counter() - start_time)
+
+
+def measure_decode(tokens: List[str], nb_decodes: int) -> float:
+    """Microseconds per JWTService.decode_jwt call"""
+    start_time = perf_counter()
+    for index in range(nb_decodes):
+        JWTService.decode_jwt(tokens[index % len(tokens)])
+    return (perf_counter() - start_time) / nb_decodes * 1_000_000
+
+
+def run(nb_users: int, nb_requests: int):
+    tokens = get_tokens(nb_users)
+    results: Dict[str, tuple] = {}
+    for name, max_size in (("without cache", 0), ("with cache", SECRET.TOKEN_CACHE_SIZE)):
+        token_cache.max_size = max_size
+        token_cache.clear()
+        token_cache.hits = token_cache.misses = 0
+        throughput = asyncio.run(measure_requests(tokens, nb_requests))
+        decode_time = measure_decode(tokens, nb_requests * 10)
+        results[name] = (throughput, decode_time, token_cache.hit_rate)
+
+    print(f"🚀 {nb_requests} requests from {nb_users} users")
+    print(f"{'':<16}{'requests/s':>12}{'decode':>12}{'hit rate':>10}")
+    for name, (throughput, decode_time, hit_rate) in results.items():
+        print(f"{name:<16}{throughput:>12.0f}{decode_time:>10.2f}µs{hit_rate:>10.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=5000)
+    arguments = parser.parse_args()
+    run(arguments.users, arguments.requests)
@@ -1,10 +1,12 @@
 import uuid
-from typing import Optional, Annotated
+from typing import List, Optional, Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
-from src.dto.dto_articles import CreateArticle
-from src.dto.dto_utilisateurs import UserAdminViewAllUsers
+from src.dto.dto_articles import CreateArticle, ImportArticlesResponse
+from src.dto.dto_monitoring import CacheStats, DbPoolStats, SlowQueryRecord
+from src.dto.dto_utilisateurs import UserAdminViewAllUsers, user_list_serializer
+from src.enums.ExportFormat import ExportFormat
 from src.enums.Roles import Roles
 from src.Messages.user_messages import (
     TARGET_USER_DELETED_SUCCESSFULLY,
@@ -15,8 +17,10 @@ from src.Messages.user_messages import (
 from src.models import User
 from src.services.ArticlesService import ArticleService
 from src.services.AuthService import AuthService
+from src.services.MonitoringService import MonitoringService
 from src.services.UserService import UserService
-from src.utils.db import SessionDep
+from src.utils.db import ReadSessionDep, ReadSessionOpenerDep, SessionDep
+from src.utils.export import export_response
 
 admin_controller = APIRouter(
     prefix="/admin",
@@ -30,7 +34,7 @@ admin_controller = APIRouter(
 
 @admin_controller.get("/users", status_code=200, response_model=UserAdminViewAllUsers)
 async def get_users(
-    session: SessionDep,
+    session: ReadSessionDep,
     page: int = 1,
     size: int = 10,
     status: Optional[str] = None,
@@ -47,7 +51,18 @@ async def get_users(
     result = await UserService.get_users_with_pagination(
         session, page, size, status, role
     )
-    return result
+    return user_list_serializer.response(result)
+
+
+@admin_controller.get("/users/export", status_code=200)
+async def export_users(
+    open_session: ReadSessionOpenerDep,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    status: Optional[str] = None,
+    role: Optional[Roles] = None,
+):
+    body = UserService.export_users(open_session, export_format, status, role)
+    return export_response(body, export_format, "users")
 
 
 @admin_controller.patch("/users/disable/{user_uuid_to_disable}", status_code=200)
@@ -84,6 +99,27 @@ async def create_article(
     return {"message": "Article créé avec succès"}
 
 
+@admin_controller.post(
+    "/articles/import", status_code=200, response_model=ImportArticlesResponse
+)
+async def import_articles(
+    request: Request,
+    current_user: Annotated[User, Depends(AuthService.get_current_user_in_jwt)],
+    session: SessionDep,
+):
+    # One article per NDJSON line, the body is never read whole
+    return await ArticleService.import_articles(session, current_user, request.stream())
+
+
+@admin_controller.get("/articles/export", status_code=200)
+async def export_articles(
+    open_session: ReadSessionOpenerDep,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+):
+    body = ArticleService.export_articles(open_session, export_format)
+    return export_response(body, export_format, "articles")
+
+
 @admin_controller.delete("/articles/{article_id}", status_code=200)
 async def delete_article(
     article_id: int,
@@ -91,3 +127,18 @@ async def delete_article(
 ):
     await ArticleService.delete_article(session, article_id)
     return {"message": "Article supprimé avec succès"}
+
+
+@admin_controller.get("/monitoring/db-pool", response_model=List[DbPoolStats])
+async def get_db_pool_stats():
+    return MonitoringService.get_db_pool_stats()
+
+
+@admin_controller.get("/monitoring/slow-queries", response_model=List[SlowQueryRecord])
+async def get_slow_queries():
+    return MonitoringService.get_slow_queries()
+
+
+@admin_controller.get("/monitoring/caches", response_model=List[CacheStats])
+async def get_cache_stats():
+    return MonitoringService.get_cache_stats()
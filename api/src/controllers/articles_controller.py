@@ -1,10 +1,21 @@
-from typing import Optional
+from typing import Annotated, List, Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Header, Query
 
-from src.dto.dto_articles import GetAllArticleResponse, GetArticleResponseFull
+from src.dto.dto_articles import (
+    GetAllArticleResponse,
+    GetArticleResponseFull,
+    PopularArticle,
+    SearchArticlesResponse,
+    popular_articles_serializer,
+    search_results_serializer,
+)
+from src.security.secrets import SECRET
 from src.services.ArticlesService import ArticleService
-from src.utils.db import SessionDep
+from src.utils.db import ReadSessionDep
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
 
 article_controller = APIRouter(
     prefix="/articles",
@@ -14,15 +25,43 @@ article_controller = APIRouter(
 
 @article_controller.get("/", response_model=GetAllArticleResponse)
 async def get_articles(
-    session: SessionDep,
+    session: ReadSessionDep,
     category_id: Optional[int] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    with_count: bool = False,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    return await ArticleService.get_all_response(
+        session, category_id, limit, cursor, with_count, if_none_match
+    )
+
+
+@article_controller.get("/search", response_model=SearchArticlesResponse)
+async def search_articles(
+    session: ReadSessionDep,
+    q: str = Query(min_length=1, max_length=200),
+    page: int = Query(1, ge=1),
+    size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    results = await ArticleService.search_articles(session, q, page, size)
+    return search_results_serializer.response(results)
+
+
+@article_controller.get("/popular", response_model=List[PopularArticle])
+async def get_popular_articles(
+    limit: int = Query(10, ge=1, le=SECRET.POPULAR_ARTICLES_SIZE),
 ):
-    return await ArticleService.get_all(session, category_id)
+    articles = ArticleService.get_popular_articles(limit)
+    return popular_articles_serializer.response(articles)
 
 
 @article_controller.get("/{article_id}", response_model=GetArticleResponseFull)
 async def get_article(
     article_id: int,
-    session: SessionDep,
+    session: ReadSessionDep,
+    if_none_match: Annotated[Optional[str], Header()] = None,
 ):
-    return await ArticleService.get_article(session, article_id)
+    return await ArticleService.get_article_response(
+        session, article_id, if_none_match
+    )
@@ -3,6 +3,7 @@ from typing import Annotated
 from fastapi import APIRouter, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 
+from src.Messages.user_messages import USER_LOGGED_OUT_SUCCESSFULLY
 from src.dto.dto_token import LoginResponse
 from src.dto.dto_utilisateurs import (
     CreateUser,
@@ -10,6 +11,7 @@ from src.dto.dto_utilisateurs import (
     UserProfile,
 )
 from src.models import User
+from src.security.principal import PrincipalDep
 from src.services.JWTService import JWTService
 from src.services.AuthService import (
     AuthService,
@@ -38,6 +40,12 @@ async def login_for_access_token(
     )
 
 
+@auth_controller.post("/logout", status_code=200)
+async def logout(session: SessionDep, principal: PrincipalDep):
+    await AuthService.logout(session, principal)
+    return {"message": USER_LOGGED_OUT_SUCCESSFULLY}
+
+
 @auth_controller.get("/session", response_model=UserProfile)
 async def read_users_me(
     current_user: Annotated[User, Depends(AuthService.get_current_user_in_jwt)],
@@ -1,9 +1,9 @@
-from typing import List
+from typing import Annotated, List, Optional
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Header
 from src.models.Category import Category
 from src.services.CategoryService import CategoryService
-from src.utils.db import SessionDep
+from src.utils.db import ReadSessionOpenerDep
 
 category_controller = APIRouter(
     prefix="/categories",
@@ -12,16 +12,19 @@ category_controller = APIRouter(
 
 
 @category_controller.get("/", response_model=List[Category])
-async def get_all_categories(session: SessionDep):
-    return await CategoryService.get_all_categories(session)
+async def get_all_categories(
+    open_session: ReadSessionOpenerDep,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    return await CategoryService.get_all_categories_response(open_session, if_none_match)
 
 
 @category_controller.get("/{category_id}", response_model=Category)
-async def get_category(category_id: int, session: SessionDep):
-    category = await CategoryService.get_category_by_id(session, category_id)
-    if not category:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Catégorie avec l'ID {category_id} non trouvée",
-        )
-    return category
+async def get_category(
+    category_id: int,
+    open_session: ReadSessionOpenerDep,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    return await CategoryService.get_category_response(
+        open_session, category_id, if_none_match
+    )
@@ -1,9 +1,9 @@
-from typing import List
+from typing import Annotated, List, Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Header
 from src.models import ExerciseCoherenceCardiac
 from src.services.ExerciseService import ExerciseService
-from src.utils.db import SessionDep
+from src.utils.db import ReadSessionOpenerDep
 
 exercise_controller = APIRouter(
     prefix="/exercises",
@@ -12,12 +12,19 @@ exercise_controller = APIRouter(
 
 
 @exercise_controller.get("/", response_model=List[ExerciseCoherenceCardiac])
-async def get_all_exercises(session: SessionDep):
-    result = await ExerciseService.get_all(session)
-    return result
+async def get_all_exercises(
+    open_session: ReadSessionOpenerDep,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    return await ExerciseService.get_all_response(open_session, if_none_match)
 
 
 @exercise_controller.get("/{exercise_id}", response_model=ExerciseCoherenceCardiac)
-async def get_exercise(exercise_id: int, session: SessionDep):
-    result = await ExerciseService.get_exercise(session, exercise_id)
-    return result
+async def get_exercise(
+    exercise_id: int,
+    open_session: ReadSessionOpenerDep,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    return await ExerciseService.get_exercise_response(
+        open_session, exercise_id, if_none_match
+    )
@@ -1,7 +1,9 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel
 
+from src.utils.serialization import Serializer
+
 
 class CreateArticle(BaseModel):
     title: str
@@ -24,4 +26,39 @@ class GetArticleResponseFull(GetArticleResponseMin):
 
 class GetAllArticleResponse(BaseModel):
     articles: List[GetArticleResponseMin]
-    count: int
+    # Only counted on demand, the page itself never depends on the table size
+    count: Optional[int] = None
+    # Cursor of the next page, None on the last one
+    next_cursor: Optional[str] = None
+
+
+class PopularArticle(GetArticleResponseMin):
+    views: int
+
+
+class SearchArticleResult(GetArticleResponseMin):
+    score: float
+
+
+class SearchArticlesResponse(BaseModel):
+    articles: List[SearchArticleResult]
+    total: int
+    total_pages: int
+    current_page: int
+
+
+class ImportArticleError(BaseModel):
+    line: int
+    detail: str
+
+
+class ImportArticlesResponse(BaseModel):
+    imported: int
+    errors: List[ImportArticleError]
+
+
+# Encoders of the responses, compiled once at import
+article_serializer = Serializer(GetArticleResponseFull)
+article_list_serializer = Serializer(GetAllArticleResponse)
+popular_articles_serializer = Serializer(List[PopularArticle])
+search_results_serializer = Serializer(SearchArticlesResponse)
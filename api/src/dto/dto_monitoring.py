@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class WaitHistogramBucket(BaseModel):
+    le_ms: Optional[float] = Field(
+        description="Upper bound of the bucket, null for the overflow bucket"
+    )
+    count: int
+
+
+class DbPoolStats(BaseModel):
+    name: str = Field(examples=["primary"])
+    host: str
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    max_overflow: int
+    timeout: float
+    recycle: int
+    pre_ping: bool
+    wait_count: int
+    wait_total_ms: float
+    wait_max_ms: float
+    timeouts: int
+    wait_histogram: List[WaitHistogramBucket]
+
+
+class SlowQueryRecord(BaseModel):
+    statement: str
+    parameter_shapes: List[str]
+    duration_ms: float
+    caller: Optional[str] = Field(examples=["UserService.get_total_users"])
+    explain: Optional[List[dict]]
+    recorded_at: datetime
+
+
+class CacheStats(BaseModel):
+    name: str = Field(examples=["articles"])
+    size: int
+    max_size: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    hit_rate: float = Field(description="Share of the lookups served by the cache")
+    evictions: int
+    expirations: int
+    invalidations: int
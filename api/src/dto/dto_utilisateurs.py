@@ -6,6 +6,7 @@ from pydantic import BaseModel, EmailStr, Field, field_validator
 from datetime import datetime
 
 from src.enums.Roles import Roles
+from src.utils.serialization import Serializer
 from src.validators.user_validator import (
     login_validator,
     correct_email_validator,
@@ -72,3 +73,7 @@ class UserAdminViewAllUsers(BaseModel):
     total_users: int = Field(default=1)
     total_pages: int = Field(default=1)
     current_page: int = Field(default=1)
+
+
+# Encoder of the admin user page, compiled once at import
+user_list_serializer = Serializer(UserAdminViewAllUsers)
@@ -1,16 +1,15 @@
 from random import choices
 from string import ascii_letters, digits
 
-from sqlmodel import create_engine, Session
+from sqlmodel import Session
 from typing import List
 from src.enums.Roles import Roles
 from src.security.secrets import SECRET
 from src.services.PasswordService import crypt_context
 from src.models import Category, User, ExerciseCoherenceCardiac
+from src.utils.db_backend import create_sync_database_engine
 
-sync_engine = create_engine(
-    f"mysql+pymysql://{SECRET.MARIADB_USER}:{SECRET.MARIADB_PASSWORD}@{SECRET.MARIADB_HOST}/{SECRET.MARIADB_DATABASE}",
-)
+sync_engine = create_sync_database_engine()
 
 master_account = "misterbalise"
 password_to_update = random_string = ''.join(choices(ascii_letters + digits, k=100))
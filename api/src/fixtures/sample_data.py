@@ -2,17 +2,16 @@ from datetime import datetime
 from itertools import product
 from random import randint
 from faker import Faker
-from sqlmodel import create_engine, Session
+from sqlmodel import Session
 from typing import List
 from enum import Enum
 from src.enums.Roles import Roles
-from src.security.secrets import SECRET
 from src.services.PasswordService import crypt_context
 from src.models import Article, Category, User, LoginLog, ExerciseCoherenceCardiac
+from src.services.CategoryService import CategoryService
+from src.utils.db_backend import create_sync_database_engine
 
-sync_engine = create_engine(
-    f"mysql+pymysql://{SECRET.MARIADB_USER}:{SECRET.MARIADB_PASSWORD}@{SECRET.MARIADB_HOST}/{SECRET.MARIADB_DATABASE}",
-)
+sync_engine = create_sync_database_engine()
 
 fake = Faker(locale="en")
 
@@ -162,6 +161,7 @@ def load_sample_data():
             articles = create_sample_articles(admins, categories, rolls=1)
             for elem in articles:
                 session.add(elem)
+            session.exec(CategoryService.build_recount_query())
             session.commit()
             print("✅ Articles loaded with success !")
             login_logs = create_sample_login_logs(all_users, rolls=4)
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 from sqlmodel import Field, Relationship, SQLModel
-from sqlalchemy import Column
+from sqlalchemy import Column, Index
 from sqlalchemy.types import Text
 
 if TYPE_CHECKING:
@@ -11,11 +11,21 @@ if TYPE_CHECKING:
 
 class Article(SQLModel, table=True):
     __tablename__ = "article"
+    __table_args__ = (
+        Index("ix_article_created_at", "created_at"),
+        Index("ix_article_id_category_created_at", "id_category", "created_at"),
+        # Most read articles, refreshed by the view counter flush
+        Index("ix_article_view_count", "view_count"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str
     content: str = Field(sa_column=Column(Text,nullable=False))
     created_at: datetime = Field(default_factory=datetime.now)
+    # Views flushed by the article view counter, behind by a few seconds
+    view_count: int = Field(
+        default=0, nullable=False, sa_column_kwargs={"server_default": "0"}
+    )
     id_user: uuid.UUID = Field(foreign_key="user.id")
     id_category: int = Field(foreign_key="category.id")
 
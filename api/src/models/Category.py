@@ -10,6 +10,10 @@ class Category(SQLModel, table=True):
 
     id: Optional[int] = Field(default=None, primary_key=True)
     label: str = Field(max_length=100, nullable=False, index=True)
+    # Maintained by the article writes, the categories never count their articles
+    article_count: int = Field(
+        default=0, nullable=False, sa_column_kwargs={"server_default": "0"}
+    )
 
     # Relations
     articles: List["Article"] = Relationship(back_populates="category")
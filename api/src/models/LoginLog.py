@@ -1,6 +1,7 @@
 import uuid
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
@@ -9,6 +10,9 @@ if TYPE_CHECKING:
 
 class LoginLog(SQLModel, table=True):
     __tablename__ = "login_log"
+    __table_args__ = (
+        Index("ix_login_log_id_user_date_connexion", "id_user", "date_connexion"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     date_connexion:datetime = Field(default_factory=datetime.now)
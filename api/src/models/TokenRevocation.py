@@ -0,0 +1,20 @@
+import uuid
+from typing import Optional
+from sqlalchemy import Column, Double
+from sqlmodel import Field, SQLModel
+
+
+class TokenRevocation(SQLModel, table=True):
+    """
+    One token revoked by its jti, or every token of a user issued before
+    revoked_before. Times are seconds since the epoch, like the iat and exp claims.
+    """
+
+    __tablename__ = "token_revocation"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    jti: Optional[str] = Field(default=None, max_length=32)
+    id_user: Optional[uuid.UUID] = Field(default=None, foreign_key="user.id")
+    revoked_before: float = Field(sa_column=Column(Double, nullable=False))
+    # Every token it revokes has expired by then, the row is pruned
+    expires_at: float = Field(sa_column=Column(Double, nullable=False, index=True))
@@ -1,6 +1,7 @@
 import uuid
 from datetime import datetime
 from typing import List, Optional, TYPE_CHECKING
+from sqlalchemy import Index
 from sqlmodel import Relationship, Field, SQLModel
 
 from src.enums.Roles import Roles
@@ -12,6 +13,11 @@ if TYPE_CHECKING:
 
 class User(SQLModel, table=True):
     __tablename__ = "user"
+    __table_args__ = (
+        # Status filters of the admin user list, with and without role
+        Index("ix_user_deleted_at_disabled_at", "deleted_at", "disabled_at"),
+        Index("ix_user_role_deleted_at_disabled_at", "role", "deleted_at", "disabled_at"),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     login: str = Field(unique=True)
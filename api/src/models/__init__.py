@@ -3,4 +3,5 @@ from src.models.ExerciseCoherenceCardiac import ExerciseCoherenceCardiac  # noqa
 from src.models.LoginLog import LoginLog  # noqa: F401
 from src.models.Category import Category  # noqa: F401
 from src.models.Articles import Article  # noqa: F401
+from src.models.TokenRevocation import TokenRevocation  # noqa: F401
 from sqlmodel import SQLModel  # noqa: F401
@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+from typing import Annotated, Optional
+
+from fastapi import Depends
+from starlette.requests import Request
+
+from src.enums.Roles import Roles
+from src.models import User
+from src.services.JWTService import JWTService, oauth2_scheme
+
+
+@dataclass
+class Principal:
+    """Verified claims of the bearer token of a request, and its user once loaded"""
+
+    claims: dict
+    user: Optional[User] = None
+    is_user_loaded: bool = False
+
+    @property
+    def login(self) -> str:
+        return self.claims["sub"]
+
+    @property
+    def role(self) -> Optional[str]:
+        return self.claims.get("role")
+
+    @property
+    def is_user(self) -> bool:
+        return self.role in Roles.__members__.values()
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == Roles.ADMIN
+
+
+async def get_principal(
+    request: Request, token: Annotated[str, Depends(oauth2_scheme)]
+) -> Principal:
+    """
+    The token is verified on the first call of the request, every other
+    dependency gets the principal kept in the request state.
+    """
+    principal: Optional[Principal] = getattr(request.state, "principal", None)
+    if principal is None:
+        principal = Principal(claims=JWTService.decode_jwt(token))
+        request.state.principal = principal
+    return principal
+
+
+PrincipalDep = Annotated[Principal, Depends(get_principal)]
@@ -1,4 +1,5 @@
 import os
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -19,6 +20,59 @@ class Settings(BaseSettings):
     ALGORITHM: str = Field(... if IS_PROD else "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(... if IS_PROD else 60, le=60)
     BCRYPT_HASH_ROUND: int = Field(... if IS_PROD else 8, ge=12 if IS_PROD else 8)
+    # mariadb, or sqlite for a single node running without a database server
+    DB_BACKEND: Literal["mariadb", "sqlite"] = Field("mariadb")
+    SQLITE_PATH: str = Field("cesi-zen.db")
+    SQLITE_BUSY_TIMEOUT_MS: int = Field(5000, ge=0)
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL"] = Field("NORMAL")
+    SQLITE_CACHE_SIZE_KB: int = Field(65536, ge=0)
+    SQLITE_MMAP_SIZE_MB: int = Field(256, ge=0)
+    # Connection pool of the async engine
+    DB_POOL_SIZE: int = Field(10, ge=1)
+    DB_MAX_OVERFLOW: int = Field(20, ge=0)
+    DB_POOL_TIMEOUT: float = Field(30, gt=0)
+    # Must stay below the MariaDB wait_timeout
+    DB_POOL_RECYCLE: int = Field(1800, ge=-1)
+    DB_POOL_PRE_PING: bool = Field(True)
+    # Comma separated async urls of the read replicas, empty to read on the primary
+    DB_REPLICA_URLS: str = Field("")
+    DB_REPLICA_RETRY_SECONDS: int = Field(30, ge=1)
+    # Statements slower than the threshold are kept with their EXPLAIN output
+    SLOW_QUERY_THRESHOLD_MS: float = Field(200, ge=0)
+    SLOW_QUERY_BUFFER_SIZE: int = Field(100, ge=1)
+    SLOW_QUERY_EXPLAIN: bool = Field(True)
+    # Serialized article list pages and details, dropped by the article writes
+    ARTICLE_CACHE_SIZE: int = Field(512, ge=1)
+    ARTICLE_CACHE_TTL_SECONDS: float = Field(60, gt=0)
+    # Worker processes cleaning the article HTML, 0 to clean in threads
+    SANITIZER_WORKERS: int = Field(2, ge=0)
+    SANITIZER_MAX_CONTENT_BYTES: int = Field(2_000_000, ge=1)
+    SANITIZER_TIMEOUT_SECONDS: float = Field(10, gt=0)
+    # Cleaned contents kept by hash, 0 to disable
+    SANITIZER_MEMO_SIZE: int = Field(256, ge=0)
+    # Articles of a bulk import inserted and committed together
+    ARTICLE_IMPORT_CHUNK_SIZE: int = Field(500, ge=1, le=5000)
+    # and flushed sooner once their contents reach this size: one INSERT must stay
+    # well under max_allowed_packet of MariaDB, 16 MiB by default
+    ARTICLE_IMPORT_CHUNK_MAX_BYTES: int = Field(4 * 1024 * 1024, ge=1)
+    # Rows fetched from the server-side cursor per batch of an export
+    EXPORT_BATCH_SIZE: int = Field(1000, ge=1)
+    # Smaller responses are sent uncompressed, the encoding would cost more than it saves
+    COMPRESSION_MINIMUM_SIZE: int = Field(1024, ge=0)
+    # Article views counted in memory, written to the database every few seconds
+    VIEW_COUNTER_SHARDS: int = Field(16, ge=1)
+    VIEW_COUNTER_FLUSH_SECONDS: float = Field(10, gt=0)
+    # Most read articles kept in memory for GET /articles/popular
+    POPULAR_ARTICLES_SIZE: int = Field(50, ge=1)
+    # Categories and exercises held in memory, reloaded from the database this often
+    REFERENCE_DATA_REFRESH_SECONDS: float = Field(60, gt=0)
+    # Verified token claims kept until the token expires, 0 to verify every request
+    TOKEN_CACHE_SIZE: int = Field(10000, ge=0)
+    # Users of the authenticated requests, dropped by the writes on the user
+    USER_CACHE_SIZE: int = Field(10000, ge=0)
+    USER_CACHE_TTL_SECONDS: float = Field(30, gt=0)
+    # Revoked tokens held in memory, the entries of the other workers picked up this often
+    REVOCATION_REFRESH_SECONDS: float = Field(5, gt=0)
     model_config = SettingsConfigDict(env_file=api_file)
 
 
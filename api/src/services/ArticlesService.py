@@ -1,17 +1,103 @@
-from typing import Optional, Tuple
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from fastapi.exceptions import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import and_, case, func, insert, or_, update
+from sqlalchemy.orm import defer
 from sqlmodel import select
+from starlette.responses import Response
 from src.dto.dto_articles import (
     CreateArticle,
     GetAllArticleResponse,
     GetArticleResponseFull,
-    GetArticleResponseMin,
+    ImportArticleError,
+    ImportArticlesResponse,
+    PopularArticle,
+    SearchArticlesResponse,
+    article_list_serializer,
+    article_serializer,
 )
+from src.enums.ExportFormat import ExportFormat
 from src.models import Article, Category, User
+from src.security.secrets import SECRET
 from src.services.CategoryService import CategoryService
-from src.utils.db import SessionDep
-from src.utils.sanitizer import sanitize_content_async
+from src.utils.cache import LRUCache
+from src.utils.counters import ShardedCounter
+from src.utils.db import SessionDep, SessionOpener, get_session
+from src.utils.etag import get_conditional_response, get_table_version
+from src.utils.export import stream_export
+from src.utils.ndjson import iter_lines
+from src.utils.pagination import decode_cursor, encode_cursor
+from src.utils.periodic import PeriodicTask
+from src.utils.rows import fetch_dicts
+from src.utils.sanitizer import (
+    ContentTooLargeError,
+    SanitizeUnavailableError,
+    sanitize_content_async,
+    sanitizer,
+)
+from src.utils.search import SearchIndex
+
+article_cache = LRUCache(
+    "articles",
+    max_size=SECRET.ARTICLE_CACHE_SIZE,
+    ttl_seconds=SECRET.ARTICLE_CACHE_TTL_SECONDS,
+)
+
+# Title and content of every article, kept in step with the table on each search
+article_search_index = SearchIndex()
+
+# Views of this worker not written yet, GET /articles/{id} never writes
+article_views = ShardedCounter(SECRET.VIEW_COUNTER_SHARDS)
+# Most read articles as of the last flush, by id
+popular_articles: Dict[int, PopularArticle] = {}
+# Articles updated by one statement of the flush
+VIEW_FLUSH_BATCH_SIZE = 500
+
+
+def get_list_tag(category_id: Optional[int]) -> str:
+    return f"list:category:{category_id}" if category_id else "list:all"
+
+
+def get_detail_tag(article_id: int) -> str:
+    return f"detail:{article_id}"
+
+
+def get_validation_detail(error: ValidationError) -> str:
+    """'title: Field required', or the message alone for the whole line"""
+    return ", ".join(
+        ": ".join(filter(None, [".".join(map(str, detail["loc"])), detail["msg"]]))
+        for detail in error.errors()
+    )
+
+
+def batch_rows_by_content_size(
+    rows: List[dict], max_bytes: int
+) -> Iterator[List[dict]]:
+    """Consecutive rows whose contents add up to max_bytes, a larger row alone"""
+    batch: List[dict] = []
+    batch_bytes = 0
+    for row in rows:
+        size = len(row["content"].encode())
+        if batch and batch_bytes + size > max_bytes:
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append(row)
+        batch_bytes += size
+    if batch:
+        yield batch
 
 
 class ArticleService:
@@ -22,30 +108,152 @@ class ArticleService:
         current_user: User,
         create_article: CreateArticle,
     ) -> Article:
-        category = await CategoryService.get_category_by_id(
-            session, create_article.category
-        )
+        category = await CategoryService.get_category(session, create_article.category)
         if not category:
             raise HTTPException(status_code=400, detail="La catégorie n'existe pas")
-        sanitized_content = await sanitize_content_async(create_article.content)
+        try:
+            sanitized_content = await sanitize_content_async(create_article.content)
+        except ContentTooLargeError as error:
+            raise HTTPException(status_code=413, detail=str(error))
+        except SanitizeUnavailableError as error:
+            raise HTTPException(status_code=503, detail=str(error))
         new_article = Article(
             title=create_article.title,
             content=sanitized_content,
-            category=category,
+            id_category=category.id,
             user=current_user,
         )
         session.add(new_article)
+        await CategoryService.add_to_article_count(session, category.id, 1)
         await session.commit()
         await session.refresh(new_article)
+        await CategoryService.refresh_categories(session)
+        article_cache.invalidate_tags(get_list_tag(None), get_list_tag(category.id))
+        article_search_index.add(new_article.id, new_article.title, sanitized_content)
         return new_article
 
+    @classmethod
+    def parse_import_line(
+        cls, line: Optional[bytes], category_ids: Set[int]
+    ) -> CreateArticle:
+        """Raise ValueError with the reason the line cannot be imported"""
+        if line is None:
+            raise ValueError("La ligne est trop longue")
+        try:
+            item = CreateArticle.model_validate_json(line)
+        except ValidationError as error:
+            raise ValueError(get_validation_detail(error))
+        if item.category not in category_ids:
+            raise ValueError("La catégorie n'existe pas")
+        sanitizer.check_size(item.content)
+        return item
+
+    @classmethod
+    async def insert_import_chunk(
+        cls,
+        session: SessionDep,
+        current_user: User,
+        chunk: List[Tuple[int, CreateArticle]],
+    ) -> List[ImportArticleError]:
+        try:
+            # Spread over the sanitizer workers, duplicates are cleaned once
+            contents = await sanitizer.sanitize_batch([item.content for _, item in chunk])
+        except SanitizeUnavailableError as error:
+            return [ImportArticleError(line=line, detail=str(error)) for line, _ in chunk]
+        created_at = datetime.now()
+        rows = [
+            {
+                "title": item.title,
+                "content": content,
+                "created_at": created_at,
+                "id_user": current_user.id,
+                "id_category": item.category,
+            }
+            for (_, item), content in zip(chunk, contents)
+        ]
+        # Multi-row INSERTs, the ids are not needed back. Cleaning can make a
+        # content longer, the size of each statement is checked again.
+        for batch in batch_rows_by_content_size(
+            rows, SECRET.ARTICLE_IMPORT_CHUNK_MAX_BYTES
+        ):
+            await session.exec(insert(Article).values(batch))
+        category_counts = Counter(row["id_category"] for row in rows)
+        for category_id, count in category_counts.items():
+            await CategoryService.add_to_article_count(session, category_id, count)
+        await session.commit()
+        await CategoryService.refresh_categories(session)
+        article_cache.invalidate_tags(
+            get_list_tag(None), *map(get_list_tag, category_counts)
+        )
+        return []
+
+    @classmethod
+    async def import_articles(
+        cls, session: SessionDep, current_user: User, body: AsyncIterable[bytes]
+    ) -> ImportArticlesResponse:
+        """
+        Create an article per NDJSON line of the body, read as it is received.
+        Lines are committed by chunks of ARTICLE_IMPORT_CHUNK_SIZE lines or
+        ARTICLE_IMPORT_CHUNK_MAX_BYTES of content, a wrong line is reported
+        and does not stop the import.
+        """
+        category_ids = {
+            category.id for category in await CategoryService.get_all_categories(session)
+        }
+        # Escaped in JSON, a content can take twice its size
+        max_line_bytes = 2 * sanitizer.max_content_bytes
+        imported = 0
+        errors: List[ImportArticleError] = []
+        chunk: List[Tuple[int, CreateArticle]] = []
+        chunk_bytes = 0
+
+        async def insert_chunk():
+            nonlocal imported, chunk_bytes
+            chunk_errors = await ArticleService.insert_import_chunk(
+                session, current_user, chunk
+            )
+            imported += len(chunk) - len(chunk_errors)
+            errors.extend(chunk_errors)
+            chunk.clear()
+            chunk_bytes = 0
+
+        async for line_number, line in iter_lines(body, max_line_bytes):
+            try:
+                item = ArticleService.parse_import_line(line, category_ids)
+            except ValueError as error:
+                errors.append(ImportArticleError(line=line_number, detail=str(error)))
+                continue
+            chunk.append((line_number, item))
+            chunk_bytes += len(item.content.encode())
+            if (
+                len(chunk) == SECRET.ARTICLE_IMPORT_CHUNK_SIZE
+                or chunk_bytes >= SECRET.ARTICLE_IMPORT_CHUNK_MAX_BYTES
+            ):
+                await insert_chunk()
+        if chunk:
+            await insert_chunk()
+        errors.sort(key=lambda error: error.line)
+        return ImportArticlesResponse(imported=imported, errors=errors)
+
     @classmethod
     async def delete_article(cls, session: SessionDep, article_id: int) -> bool:
-        article = await session.get(Article, article_id)
+        # The content is not needed to delete the row
+        article = await session.get(
+            Article, article_id, options=[defer(Article.content)]
+        )
         if not article:
             raise HTTPException(status_code=404, detail="Article introuvable")
         await session.delete(article)
+        await CategoryService.add_to_article_count(session, article.id_category, -1)
         await session.commit()
+        await CategoryService.refresh_categories(session)
+        article_cache.invalidate_tags(
+            get_list_tag(None),
+            get_list_tag(article.id_category),
+            get_detail_tag(article_id),
+        )
+        article_search_index.remove(article_id)
+        popular_articles.pop(article_id, None)
         return True
 
     @classmethod
@@ -53,37 +261,267 @@ class ArticleService:
         cls, session: SessionDep, article_id: int
     ) -> GetArticleResponseFull:
         sql = (
-            select(Article, User, Category)
-            .join(User)
-            .join(Category)
+            ArticleService.build_list_query()
+            .add_columns(Article.content)
             .where(Article.id == article_id)
         )
-        result = await session.exec(sql)
-        tuple_result: Optional[Tuple[Article, User, Category]] = result.first()
-        if not tuple_result:
+        rows = await fetch_dicts(session, sql)
+        if not rows:
             raise HTTPException(status_code=404, detail="Article introuvable")
-        article, _, _ = tuple_result
-        article_model = article.model_dump()
-        article_model["category"] = article.category.label
-        article_model["creator"] = article.user.login
-        return GetArticleResponseFull.model_validate(article_model)
+        return GetArticleResponseFull.model_validate(rows[0])
 
     @classmethod
-    async def get_all(
+    async def get_article_version(
+        cls, session: SessionDep, article_id: int
+    ) -> Optional[tuple]:
+        # Articles are never updated, a new row under the same id is the only change
+        sql = select(Article.id, Article.created_at).where(Article.id == article_id)
+        result = await session.exec(sql)
+        row = result.first()
+        return tuple(row) if row else None
+
+    @classmethod
+    async def get_article_response(
+        cls, session: SessionDep, article_id: int, if_none_match: Optional[str]
+    ) -> Response:
+        async def build_body() -> bytes:
+            article = await ArticleService.get_article(session, article_id)
+            return article_serializer.dump_json(article)
+
+        response = await get_conditional_response(
+            if_none_match,
+            key=("detail", article_id),
+            get_version=lambda: ArticleService.get_article_version(session, article_id),
+            build_body=build_body,
+            cache=article_cache,
+            tags=[get_detail_tag(article_id)],
+        )
+        # Counted on every read, the cached and not modified ones too
+        article_views.increment(article_id)
+        return response
+
+    @classmethod
+    def build_list_query(cls):
+        """
+        Only the columns of GetArticleResponseMin, the content of the articles
+        never leaves the database on the list
+        """
+        return (
+            select(
+                Article.id,
+                Article.title,
+                Article.id_category,
+                Article.created_at,
+                User.login.label("creator"),
+                Category.label.label("category"),
+            )
+            .join(User, User.id == Article.id_user)
+            .join(Category, Category.id == Article.id_category)
+        )
+
+    @classmethod
+    def build_cursor_filter(cls, sql, cursor: str):
+        try:
+            created_at, article_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Le curseur n'est pas valide")
+        # Rows strictly after the cursor in the (created_at, id) descending order
+        return sql.where(
+            or_(
+                Article.created_at < created_at,
+                and_(Article.created_at == created_at, Article.id < article_id),
+            )
+        )
+
+    @classmethod
+    async def count_articles(
         cls, session: SessionDep, category_id: Optional[int]
-    ) -> GetAllArticleResponse:
-        sql = select(Article, User, Category).join(User).join(Category)
+    ) -> int:
+        sql = select(func.count(Article.id))
         if category_id:
-            sql = sql.where(Category.id == category_id)
-        sql = sql.order_by(Article.created_at.desc())
+            sql = sql.where(Article.id_category == category_id)
         result = await session.exec(sql)
-        rows = result.all()
-        mapped_articles = []
-        for article, _, _ in rows:
-            article_model = article.model_dump()
-            article_model["category"] = article.category.label
-            article_model["creator"] = article.user.login
-            mapped_articles.append(GetArticleResponseMin.model_validate(article_model))
-        return GetAllArticleResponse(
-            articles=mapped_articles, count=len(mapped_articles)
+        return result.one()
+
+    @classmethod
+    async def get_all(
+        cls,
+        session: SessionDep,
+        category_id: Optional[int],
+        limit: int,
+        cursor: Optional[str] = None,
+        with_count: bool = False,
+    ) -> GetAllArticleResponse:
+        sql = ArticleService.build_list_query()
+        if category_id:
+            sql = sql.where(Article.id_category == category_id)
+        if cursor:
+            sql = ArticleService.build_cursor_filter(sql, cursor)
+        # The id breaks the ties of created_at in the order of the index
+        sql = sql.order_by(Article.created_at.desc(), Article.id.desc())
+        # The extra row tells whether there is a next page
+        rows = await fetch_dicts(session, sql.limit(limit + 1))
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+        count = None
+        if with_count:
+            count = await ArticleService.count_articles(session, category_id)
+        # One validation pass over the whole page
+        return GetAllArticleResponse.model_validate(
+            {"articles": rows, "count": count, "next_cursor": next_cursor}
+        )
+
+    @classmethod
+    async def get_list_version(
+        cls, session: SessionDep, category_id: Optional[int]
+    ) -> tuple:
+        criteria = [Article.id_category == category_id] if category_id else []
+        return await get_table_version(session, Article.id, *criteria)
+
+    @classmethod
+    async def get_all_response(
+        cls,
+        session: SessionDep,
+        category_id: Optional[int],
+        limit: int,
+        cursor: Optional[str] = None,
+        with_count: bool = False,
+        if_none_match: Optional[str] = None,
+    ) -> Response:
+        async def build_body() -> bytes:
+            articles = await ArticleService.get_all(
+                session, category_id, limit, cursor, with_count
+            )
+            return article_list_serializer.dump_json(articles)
+
+        return await get_conditional_response(
+            if_none_match,
+            key=("list", category_id, limit, cursor, with_count),
+            get_version=lambda: ArticleService.get_list_version(session, category_id),
+            build_body=build_body,
+            cache=article_cache,
+            tags=[get_list_tag(category_id)],
         )
+
+    @classmethod
+    def export_articles(
+        cls,
+        open_session: SessionOpener,
+        export_format: ExportFormat,
+    ) -> AsyncIterator[bytes]:
+        sql = ArticleService.build_list_query().add_columns(Article.content)
+        return stream_export(
+            open_session, sql.order_by(Article.id), GetArticleResponseFull, export_format
+        )
+
+    @classmethod
+    async def flush_article_views(cls, session: SessionDep):
+        """
+        Add the views counted since the last flush to the articles, then reload
+        the most read ones, the views flushed by the other workers included
+        """
+        views = article_views.drain()
+        article_ids = list(views)
+        try:
+            for start in range(0, len(article_ids), VIEW_FLUSH_BATCH_SIZE):
+                batch = {
+                    article_id: views[article_id]
+                    for article_id in article_ids[start : start + VIEW_FLUSH_BATCH_SIZE]
+                }
+                sql = (
+                    update(Article)
+                    .where(Article.id.in_(batch))
+                    .values(
+                        view_count=Article.view_count
+                        + case(batch, value=Article.id, else_=0)
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await session.exec(sql)
+            await session.commit()
+        except BaseException:
+            # Cancelled included, the views are counted again by the next flush
+            article_views.restore(views)
+            raise
+        sql = (
+            ArticleService.build_list_query()
+            .add_columns(Article.view_count.label("views"))
+            .order_by(Article.view_count.desc(), Article.id.desc())
+            .limit(SECRET.POPULAR_ARTICLES_SIZE)
+        )
+        rows = await fetch_dicts(session, sql)
+        popular_articles.clear()
+        popular_articles.update(
+            (row["id"], PopularArticle.model_validate(row)) for row in rows
+        )
+
+    @classmethod
+    def get_popular_articles(cls, limit: int) -> List[PopularArticle]:
+        """From memory, with the views not flushed yet"""
+        articles = [
+            article.model_copy(
+                update={"views": article.views + article_views.get(article.id)}
+            )
+            for article in popular_articles.values()
+        ]
+        articles.sort(key=lambda article: (article.views, article.id), reverse=True)
+        return articles[:limit]
+
+    @classmethod
+    async def sync_search_index(cls, session: SessionDep):
+        """
+        Index the articles written by the other workers since the last search,
+        the articles of this one are indexed by create_article and delete_article
+        """
+        version = await ArticleService.get_list_version(session, None)
+        if version == article_search_index.version:
+            return
+        sql = select(Article.id, Article.title, Article.content)
+        result = await session.exec(sql.where(Article.id > article_search_index.max_id))
+        for article_id, title, content in result.all():
+            article_search_index.add(article_id, title, content)
+        article_count, _ = version
+        if len(article_search_index) != article_count:
+            # Articles were deleted elsewhere, only a rebuild finds which ones
+            article_search_index.clear()
+            result = await session.exec(sql)
+            for article_id, title, content in result.all():
+                article_search_index.add(article_id, title, content)
+        article_search_index.version = version
+
+    @classmethod
+    async def search_articles(
+        cls, session: SessionDep, query: str, page: int, size: int
+    ) -> SearchArticlesResponse:
+        await ArticleService.sync_search_index(session)
+        ranked = article_search_index.search(query)
+        page_scores = dict(ranked[(page - 1) * size : page * size])
+        rows = []
+        if page_scores:
+            sql = ArticleService.build_list_query().where(Article.id.in_(page_scores))
+            rows = await fetch_dicts(session, sql)
+        rows_by_id = {row["id"]: row for row in rows}
+        return SearchArticlesResponse.model_validate(
+            {
+                "articles": [
+                    {**rows_by_id[article_id], "score": score}
+                    for article_id, score in page_scores.items()
+                    if article_id in rows_by_id
+                ],
+                "total": len(ranked),
+                "total_pages": (len(ranked) + size - 1) // size,
+                "current_page": page,
+            }
+        )
+
+
+async def flush_article_views():
+    async with asynccontextmanager(get_session)() as session:
+        await ArticleService.flush_article_views(session)
+
+
+article_views_flusher = PeriodicTask(
+    "article-views-flush", SECRET.VIEW_COUNTER_FLUSH_SECONDS, flush_article_views
+)
@@ -1,13 +1,12 @@
 from datetime import datetime
-from typing import Annotated, Optional
-from fastapi import Depends
+from typing import Optional
 
 from src.Messages.jwt_messages import CREDENTIALS_EXCEPTION, INSUFFISANT_ROLE_EXCEPTION
-from src.enums.Roles import Roles
 
 from src.models import User, LoginLog
-from src.services.JWTService import JWTService, oauth2_scheme
+from src.security.principal import PrincipalDep
 from src.services.PasswordService import PasswordService
+from src.services.RevocationService import RevocationService
 from src.services.UserService import UserService
 from src.utils.db import SessionDep
 
@@ -20,9 +19,9 @@ class AuthService:
         username: str,
         password: str,
     ) -> Optional[User]:
-        user = await UserService.get_user_by_login_with_validity_check(
-            session, username
-        )
+        # Not from the user cache: another worker may have changed the password
+        # or disabled the user less than a TTL ago
+        user = await UserService.get_valid_user_by_login(session, username)
         if not user:
             raise CREDENTIALS_EXCEPTION
         is_correct_password = await PasswordService.verify_password(
@@ -34,36 +33,41 @@ class AuthService:
         login_log = LoginLog(user=user)
         session.add(login_log)
         await session.commit()
+        # The cached user still has the previous last login date
+        UserService.invalidate_cached_user(user)
         return user
 
+    @classmethod
+    async def logout(cls, session: SessionDep, principal: PrincipalDep) -> True:
+        # Tokens issued before the jti claim only expire
+        if principal.claims.get("jti") is not None:
+            revocation = RevocationService.revoke_token(session, principal.claims)
+            await session.commit()
+            RevocationService.apply(revocation)
+        return True
+
     @classmethod
     async def get_current_user_in_jwt(
         cls,
         session: SessionDep,
-        token: Annotated[str, Depends(oauth2_scheme)],
+        principal: PrincipalDep,
     ) -> User:
-        username = JWTService.decode_jwt(token).get("sub")
-        user = await UserService.get_user_by_login_with_validity_check(
-            session, username
-        )
-        return user
+        # Loaded once per request, the other dependencies share it
+        if not principal.is_user_loaded:
+            principal.user = await UserService.get_user_by_login_with_validity_check(
+                session, principal.login
+            )
+            principal.is_user_loaded = True
+        return principal.user
 
     @classmethod
-    async def is_logged_as_user(
-        cls,
-        token: Annotated[str, Depends(oauth2_scheme)],
-    ) -> True:
-        role = JWTService.decode_jwt(token)["role"]
-        if role not in Roles.__members__.values():
+    async def is_logged_as_user(cls, principal: PrincipalDep) -> True:
+        if not principal.is_user:
             raise INSUFFISANT_ROLE_EXCEPTION
         return True
 
     @classmethod
-    async def is_logged_as_admin(
-        cls,
-        token: Annotated[str, Depends(oauth2_scheme)],
-    ) -> True:
-        role = JWTService.decode_jwt(token)["role"]
-        if role != Roles.ADMIN:
+    async def is_logged_as_admin(cls, principal: PrincipalDep) -> True:
+        if not principal.is_admin:
             raise INSUFFISANT_ROLE_EXCEPTION
         return True
@@ -1,20 +1,76 @@
 from typing import List, Optional
 
+from fastapi import HTTPException, status
+from sqlalchemy import func, update
 from sqlmodel import select
+from starlette.responses import Response
+from src.models.Articles import Article
 from src.models.Category import Category
-from src.utils.db import SessionDep
+from src.utils.db import SessionDep, SessionOpener
+from src.utils.etag import get_cached_response
+from src.utils.reference_data import ReferenceTable
+
+# A handful of rows: served from memory, reloaded on the article writes
+category_table = ReferenceTable("categories", Category, order_by=Category.label)
 
 
 class CategoryService:
 
     @classmethod
-    async def get_category_by_id(
+    async def get_category(
         cls, session: SessionDep, category_id: int
     ) -> Optional[Category]:
-        result = await session.exec(select(Category).where(Category.id == category_id))
-        return result.first()
+        snapshot = await category_table.get_snapshot(session)
+        return snapshot.rows.get(category_id)
 
     @classmethod
     async def get_all_categories(cls, session: SessionDep) -> List[Category]:
-        result = await session.exec(select(Category).order_by(Category.label))
-        return result.all()
+        snapshot = await category_table.get_snapshot(session)
+        return snapshot.values()
+
+    @classmethod
+    async def add_to_article_count(
+        cls, session: SessionDep, category_id: int, delta: int
+    ):
+        """In the transaction of the article write, committed with it"""
+        sql = (
+            update(Category)
+            .where(Category.id == category_id)
+            .values(article_count=Category.article_count + delta)
+            .execution_options(synchronize_session=False)
+        )
+        await session.exec(sql)
+
+    @classmethod
+    async def refresh_categories(cls, session: SessionDep):
+        """After the commit of an article write, the counters have changed"""
+        await category_table.load(session)
+
+    @classmethod
+    def build_recount_query(cls):
+        """Count the articles again, after rows were written around the API"""
+        return update(Category).values(
+            article_count=select(func.count(Article.id))
+            .where(Article.id_category == Category.id)
+            .scalar_subquery()
+        )
+
+    @classmethod
+    async def get_all_categories_response(
+        cls, open_session: SessionOpener, if_none_match: Optional[str]
+    ) -> Response:
+        snapshot = await category_table.open_snapshot(open_session)
+        return get_cached_response(if_none_match, snapshot.body)
+
+    @classmethod
+    async def get_category_response(
+        cls, open_session: SessionOpener, category_id: int, if_none_match: Optional[str]
+    ) -> Response:
+        snapshot = await category_table.open_snapshot(open_session)
+        cached = snapshot.row_bodies.get(category_id)
+        if cached is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Catégorie avec l'ID {category_id} non trouvée",
+            )
+        return get_cached_response(if_none_match, cached)
@@ -1,28 +1,36 @@
-from typing import List
+from typing import Optional
 
 from fastapi.exceptions import HTTPException
-from sqlmodel import select
+from starlette.responses import Response
 from src.models import ExerciseCoherenceCardiac
-from src.utils.db import SessionDep
+from src.utils.db import SessionOpener
+from src.utils.etag import get_cached_response
+from src.utils.reference_data import ReferenceTable
+
+# Written around the API only, picked up by the periodic refresh
+exercise_table = ReferenceTable(
+    "exercises", ExerciseCoherenceCardiac, order_by=ExerciseCoherenceCardiac.id
+)
 
 
 class ExerciseService:
     @classmethod
-    async def get_all(cls, session: SessionDep) -> List[ExerciseCoherenceCardiac]:
-        sql = select(ExerciseCoherenceCardiac)
-        result = await session.exec(sql)
-        exercises = result.all()
-        if not exercises:
+    async def get_all_response(
+        cls, open_session: SessionOpener, if_none_match: Optional[str]
+    ) -> Response:
+        snapshot = await exercise_table.open_snapshot(open_session)
+        if not snapshot.rows:
             raise HTTPException(
                 status_code=404, detail="Liste des exercises non trouvée"
             )
-        return exercises
+        return get_cached_response(if_none_match, snapshot.body)
 
     @classmethod
-    async def get_exercise(
-        cls, session: SessionDep, exercise_id: int
-    ) -> ExerciseCoherenceCardiac:
-        exercise = await session.get(ExerciseCoherenceCardiac, exercise_id)
-        if not exercise:
+    async def get_exercise_response(
+        cls, open_session: SessionOpener, exercise_id: int, if_none_match: Optional[str]
+    ) -> Response:
+        snapshot = await exercise_table.open_snapshot(open_session)
+        cached = snapshot.row_bodies.get(exercise_id)
+        if cached is None:
             raise HTTPException(404, "Exercice non trouvé")
-        return exercise
+        return get_cached_response(if_none_match, cached)
@@ -1,5 +1,8 @@
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from hashlib import blake2b
+from time import time
+from typing import Optional, Tuple
+from uuid import uuid4
 
 import jwt
 from fastapi.security import OAuth2PasswordBearer
@@ -10,15 +13,36 @@ from src.Messages.jwt_messages import (
     CREDENTIALS_EXCEPTION,
     CANT_FIND_USER_TOKEN_EXCEPTION,
     INVALID_ROLE_EXCEPTION,
+    REVOKED_TOKEN_EXCEPTION,
 )
 from src.enums.Roles import Roles
 from src.models import User
 from src.security.secrets import SECRET
+from src.utils.cache import LRUCache
+from src.utils.revocation import RevocationList
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Claims of the tokens already verified, until their expiry at the latest
+token_cache = LRUCache(
+    "tokens",
+    max_size=SECRET.TOKEN_CACHE_SIZE,
+    ttl_seconds=SECRET.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+# Checked after the cache, a revoked token is refused even when its claims are cached
+revocation_list = RevocationList()
+
+
+def get_token_digest(token: str) -> bytes:
+    """Cache key of a token, the bearer tokens themselves are never kept"""
+    return blake2b(token.encode(), digest_size=16).digest()
+
 
 class JWTService:
+    # Key and algorithm the cached claims were verified with
+    _signing_key: Optional[Tuple[str, str]] = None
+
     @classmethod
     def create_token(cls, data: dict, expires_delta: timedelta) -> str:
         to_encode = data.copy()
@@ -36,6 +60,9 @@ class JWTService:
         access_token_expires = timedelta(minutes=SECRET.ACCESS_TOKEN_EXPIRE_MINUTES)
         return JWTService.create_token(
             data={
+                "jti": uuid4().hex,
+                # Not rounded, a token issued right after a revocation stays valid
+                "iat": time(),
                 "user_id": str(user.id),
                 "sub": user.login,
                 "email": user.email,
@@ -45,7 +72,16 @@ class JWTService:
         )
 
     @classmethod
-    def decode_jwt(cls, token: str) -> dict:
+    def get_cached_claims(cls, digest: bytes) -> Optional[dict]:
+        signing_key = (SECRET.SECRET_KEY, SECRET.ALGORITHM)
+        if signing_key != JWTService._signing_key:
+            # Verified with the previous key, none of them can be trusted
+            token_cache.clear()
+            JWTService._signing_key = signing_key
+        return token_cache.get(digest)
+
+    @classmethod
+    def verify_jwt(cls, token: str) -> dict:
         try:
             data = jwt.decode(token, SECRET.SECRET_KEY, algorithms=[SECRET.ALGORITHM])
         except ExpiredSignatureError:
@@ -55,3 +91,16 @@ class JWTService:
         if data.get("role") not in Roles.__members__.values():
             raise INVALID_ROLE_EXCEPTION
         return data
+
+    @classmethod
+    def decode_jwt(cls, token: str) -> dict:
+        digest = get_token_digest(token)
+        data = JWTService.get_cached_claims(digest)
+        if data is None:
+            data = JWTService.verify_jwt(token)
+            expires_at = data.get("exp")
+            ttl_seconds = expires_at - time() if expires_at is not None else None
+            token_cache.set(digest, data, ttl_seconds=ttl_seconds)
+        if revocation_list.is_revoked(data):
+            raise REVOKED_TOKEN_EXCEPTION
+        return data
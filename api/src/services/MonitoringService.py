@@ -0,0 +1,79 @@
+from typing import List
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.dto.dto_monitoring import (
+    CacheStats,
+    DbPoolStats,
+    SlowQueryRecord,
+    WaitHistogramBucket,
+)
+from src.utils.cache import caches
+from src.utils.db import async_engine, replica_engines, slow_query_recorder
+from src.utils.db_pool import InstrumentedQueuePool
+
+
+class MonitoringService:
+    @classmethod
+    def get_engine_pool_stats(cls, name: str, engine: AsyncEngine) -> DbPoolStats:
+        pool: InstrumentedQueuePool = engine.pool
+        histogram = pool.wait_histogram
+        return DbPoolStats(
+            name=name,
+            host=engine.url.host or engine.url.database or "",
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            # The pool counts the opened connections above pool_size, which is
+            # negative until pool_size connections have been opened
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+            recycle=pool._recycle,
+            pre_ping=pool._pre_ping,
+            wait_count=histogram.total_count,
+            wait_total_ms=histogram.total_ms,
+            wait_max_ms=histogram.max_ms,
+            timeouts=histogram.timeouts,
+            wait_histogram=[
+                WaitHistogramBucket(le_ms=bound, count=count)
+                for bound, count in histogram.buckets()
+            ],
+        )
+
+    @classmethod
+    def get_db_pool_stats(cls) -> List[DbPoolStats]:
+        engines = [("primary", async_engine)] + [
+            (f"replica_{index}", engine) for index, engine in enumerate(replica_engines)
+        ]
+        # A StaticPool of an in-memory SQLite database has nothing to report
+        return [
+            cls.get_engine_pool_stats(name, engine)
+            for name, engine in engines
+            if isinstance(engine.pool, InstrumentedQueuePool)
+        ]
+
+    @classmethod
+    def get_slow_queries(cls) -> List[SlowQueryRecord]:
+        return [
+            SlowQueryRecord.model_validate(record, from_attributes=True)
+            for record in slow_query_recorder.records()
+        ]
+
+    @classmethod
+    def get_cache_stats(cls) -> List[CacheStats]:
+        return [
+            CacheStats(
+                name=cache.name,
+                size=len(cache),
+                max_size=cache.max_size,
+                ttl_seconds=cache.ttl_seconds,
+                hits=cache.hits,
+                misses=cache.misses,
+                hit_rate=cache.hit_rate,
+                evictions=cache.evictions,
+                expirations=cache.expirations,
+                invalidations=cache.invalidations,
+            )
+            for cache in caches.values()
+        ]
@@ -0,0 +1,69 @@
+from contextlib import asynccontextmanager
+from time import time
+
+from sqlalchemy import delete
+from sqlmodel import select
+
+from src.models import TokenRevocation, User
+from src.security.secrets import SECRET
+from src.services.JWTService import revocation_list
+from src.utils.db import SessionDep, get_session
+from src.utils.periodic import PeriodicTask
+
+
+class RevocationService:
+    """
+    The entries are written with the change that revokes the tokens, then
+    applied to the revocation list of this worker once committed. The other
+    workers pick them up on their next refresh.
+    """
+
+    @classmethod
+    def revoke_token(cls, session: SessionDep, claims: dict) -> TokenRevocation:
+        revocation = TokenRevocation(
+            jti=claims["jti"], revoked_before=time(), expires_at=claims["exp"]
+        )
+        session.add(revocation)
+        return revocation
+
+    @classmethod
+    def revoke_user_tokens(cls, session: SessionDep, user: User) -> TokenRevocation:
+        now = time()
+        revocation = TokenRevocation(
+            id_user=user.id,
+            revoked_before=now,
+            # The last token issued before now expires at the latest then
+            expires_at=now + SECRET.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        )
+        session.add(revocation)
+        return revocation
+
+    @classmethod
+    def apply(cls, revocation: TokenRevocation):
+        if revocation.jti is not None:
+            revocation_list.revoke_token(revocation.jti, revocation.expires_at)
+        if revocation.id_user is not None:
+            revocation_list.revoke_user(
+                str(revocation.id_user), revocation.revoked_before, revocation.expires_at
+            )
+
+    @classmethod
+    async def refresh_revocations(cls, session: SessionDep):
+        """Delete the expired entries, then apply the ones of the other workers"""
+        now = time()
+        await session.exec(delete(TokenRevocation).where(TokenRevocation.expires_at <= now))
+        await session.commit()
+        result = await session.exec(select(TokenRevocation))
+        for revocation in result.all():
+            RevocationService.apply(revocation)
+        revocation_list.prune(now)
+
+
+async def refresh_revocations():
+    async with asynccontextmanager(get_session)() as session:
+        await RevocationService.refresh_revocations(session)
+
+
+revocation_refresher = PeriodicTask(
+    "token-revocation-refresh", SECRET.REVOCATION_REFRESH_SECONDS, refresh_revocations
+)
@@ -1,7 +1,8 @@
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import AsyncIterator, Optional
 
+from sqlalchemy.orm import make_transient_to_detached
 from sqlmodel import select
 
 from src.Messages.user_messages import (
@@ -21,6 +22,7 @@ from src.Messages.validators_messages import (
     LOGIN_ALREADY_EXISTS_ERROR,
     PASSWORD_WRONG_IN_DATABASE,
 )
+from src.enums.ExportFormat import ExportFormat
 from src.enums.Roles import Roles
 from src.models import User
 from src.dto.dto_utilisateurs import (
@@ -29,8 +31,13 @@ from src.dto.dto_utilisateurs import (
     UserAdminViewSingleUser,
     ResetPassword,
 )
+from src.security.secrets import SECRET
 from src.services.PasswordService import PasswordService
-from src.utils.db import SessionDep
+from src.services.RevocationService import RevocationService
+from src.utils.cache import LRUCache
+from src.utils.db import SessionDep, SessionOpener
+from src.utils.export import stream_export
+from src.utils.rows import fetch_dicts
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy import func
 
@@ -38,6 +45,14 @@ DISABLED_STATUS = "disabled"
 DELETED_STATUS = "deleted"
 ENABLED_STATUS = "enabled"
 
+# Columns of the valid users of the authenticated requests by login, dropped
+# by every write on the user. The other workers see a write after the TTL.
+user_cache = LRUCache(
+    "users",
+    max_size=SECRET.USER_CACHE_SIZE,
+    ttl_seconds=SECRET.USER_CACHE_TTL_SECONDS,
+)
+
 
 class UserService:
     @classmethod
@@ -73,9 +88,8 @@ class UserService:
         return result.first()
 
     @classmethod
-    async def get_user_by_login_with_validity_check(
-        cls, session: SessionDep, login: str
-    ) -> Optional[User]:
+    async def get_valid_user_by_login(cls, session: SessionDep, login: str) -> User:
+        """Always read from the database, for the login and the cache misses"""
         user = await UserService.get_user_by_login(session, login)
         if user is None:
             raise USER_DOESNT_EXISTS
@@ -85,6 +99,26 @@ class UserService:
             raise USER_IS_DISABLED
         return user
 
+    @classmethod
+    async def get_user_by_login_with_validity_check(
+        cls, session: SessionDep, login: str
+    ) -> Optional[User]:
+        cached = user_cache.get(login)
+        if cached is not None:
+            # A copy per request, attached to its session as an already stored
+            # row: its writes are flushed without any SELECT first
+            user = User.model_validate(cached)
+            make_transient_to_detached(user)
+            return await session.merge(user, load=False)
+        user = await UserService.get_valid_user_by_login(session, login)
+        user_cache.set(login, user.model_dump())
+        return user
+
+    @classmethod
+    def invalidate_cached_user(cls, user: User):
+        """After the commit of a write on the user, the next request reads it again"""
+        user_cache.invalidate(user.login)
+
     @classmethod
     async def get_user_by_email(cls, session: SessionDep, email: str) -> Optional[User]:
         sql = select(User).where(User.email == email)
@@ -105,7 +139,10 @@ class UserService:
         if user.disabled_at:
             raise TARGET_USER_IS_ALREADY_DISABLED
         user.disabled_at = datetime.now()
+        revocation = RevocationService.revoke_user_tokens(session, user)
         await session.commit()
+        UserService.invalidate_cached_user(user)
+        RevocationService.apply(revocation)
         return True
 
     @classmethod
@@ -121,6 +158,7 @@ class UserService:
             raise TARGET_USER_IS_ALREADY_ENABLED
         user.disabled_at = None
         await session.commit()
+        UserService.invalidate_cached_user(user)
         return True
 
     @classmethod
@@ -133,7 +171,10 @@ class UserService:
         if user.role == Roles.ADMIN:
             raise TARGET_USER_IS_ADMIN
         user.deleted_at = datetime.now()
+        revocation = RevocationService.revoke_user_tokens(session, user)
         await session.commit()
+        UserService.invalidate_cached_user(user)
+        RevocationService.apply(revocation)
         return True
 
     @classmethod
@@ -148,7 +189,10 @@ class UserService:
         if current_user.deleted_at:
             raise TARGET_USER_IS_ALREADY_DELETED
         current_user.deleted_at = datetime.now()
+        revocation = RevocationService.revoke_user_tokens(session, current_user)
         await session.commit()
+        UserService.invalidate_cached_user(current_user)
+        RevocationService.apply(revocation)
         return True
 
     @classmethod
@@ -166,7 +210,10 @@ class UserService:
             reset_password_dto.password
         )
         current_user.hashed_password = new_hashed_password
+        revocation = RevocationService.revoke_user_tokens(session, current_user)
         await session.commit()
+        UserService.invalidate_cached_user(current_user)
+        RevocationService.apply(revocation)
         return True
 
     @classmethod
@@ -183,6 +230,7 @@ class UserService:
         user.role = Roles.ADMIN
         user.disabled_at = None
         await session.commit()
+        UserService.invalidate_cached_user(user)
         return True
 
     @classmethod
@@ -209,16 +257,17 @@ class UserService:
         size: int,
         status: Optional[str],
         role: Optional[Roles] = None,
-    ) -> list[User]:
+    ) -> list[dict]:
         offset = (page - 1) * size
-        sql = select(User)
+        # The columns of UserAdminViewSingleUser as plain rows, no User entities
+        sql = select(
+            *(getattr(User, field) for field in UserAdminViewSingleUser.model_fields)
+        )
         if status:
             sql = UserService.build_status_filter(sql, status)
         if role:
             sql = UserService.build_role_filter(sql, role)
-        sql = sql.offset(offset).limit(size)
-        result = await session.exec(sql)
-        return result.all()
+        return await fetch_dicts(session, sql.offset(offset).limit(size))
 
     @classmethod
     async def get_total_users(
@@ -244,12 +293,33 @@ class UserService:
         total_users = await UserService.get_total_users(session, status, role)
         users = await UserService.get_users_paginated(session, page, size, status, role)
         total_pages = (total_users + size - 1) // size
-        mapped_users = [
-            UserAdminViewSingleUser.model_validate(user.model_dump()) for user in users
-        ]
-        return UserAdminViewAllUsers(
-            users=mapped_users,
-            total_users=total_users,
-            total_pages=total_pages,
-            current_page=page,
+        # One validation pass over the whole page
+        return UserAdminViewAllUsers.model_validate(
+            {
+                "users": users,
+                "total_users": total_users,
+                "total_pages": total_pages,
+                "current_page": page,
+            }
+        )
+
+    @classmethod
+    def export_users(
+        cls,
+        open_session: SessionOpener,
+        export_format: ExportFormat,
+        status: Optional[str] = None,
+        role: Optional[Roles] = None,
+    ) -> AsyncIterator[bytes]:
+        # The columns of UserAdminViewSingleUser, never the password hash
+        sql = select(
+            *(getattr(User, field) for field in UserAdminViewSingleUser.model_fields)
+        )
+        if status:
+            sql = UserService.build_status_filter(sql, status)
+        if role:
+            sql = UserService.build_role_filter(sql, role)
+        # The primary key order comes from the index, no sort before the first row
+        return stream_export(
+            open_session, sql.order_by(User.id), UserAdminViewSingleUser, export_format
         )
@@ -0,0 +1,145 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock
+from time import monotonic
+from typing import Any, Dict, Hashable, Iterable, Optional, Set
+
+from starlette.responses import Response
+
+from src.security.secrets import SECRET
+from src.utils.compression import STORED_LEVELS, accepted_encoding, compress
+
+# Clients keep the body but check it is still current before using it
+REVALIDATE_HEADERS = {"Cache-Control": "no-cache"}
+
+# Every cache of the process by name, for the monitoring and the tests
+caches: Dict[str, "LRUCache"] = {}
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    expires_at: float
+    tags: Set[str] = field(default_factory=set)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Body serialized once, sent as is on every hit"""
+
+    body: bytes
+    etag: Optional[str] = None
+    media_type: str = "application/json"
+    # Compressed bodies by encoding, each one made by the first request asking for it
+    encoded_bodies: Dict[str, bytes] = field(
+        default_factory=dict, compare=False, repr=False
+    )
+
+    def get_encoded_body(self, encoding: str) -> bytes:
+        body = self.encoded_bodies.get(encoding)
+        if body is None:
+            body = compress(self.body, encoding, STORED_LEVELS[encoding])
+            self.encoded_bodies[encoding] = body
+        return body
+
+    def to_response(self) -> Response:
+        headers = {}
+        if self.etag:
+            headers = {"ETag": self.etag, **REVALIDATE_HEADERS}
+        body = self.body
+        # Negotiated by the CompressionMiddleware, which sends encoded bodies as is
+        encoding = accepted_encoding.get()
+        if encoding and len(self.body) >= SECRET.COMPRESSION_MINIMUM_SIZE:
+            body = self.get_encoded_body(encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Vary"] = "Accept-Encoding"
+            if self.etag:
+                headers["ETag"] = f"W/{self.etag}"
+        return Response(content=body, media_type=self.media_type, headers=headers)
+
+
+class LRUCache:
+    """
+    Bounded cache evicting the least recently used entry once full.
+    Entries also expire after ttl_seconds, and can be dropped by tag
+    when the data they were built from changes.
+    """
+
+    def __init__(self, name: str, max_size: int, ttl_seconds: float):
+        self.name = name
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        caches[name] = self
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        tags: Iterable[str] = (),
+        ttl_seconds: Optional[float] = None,
+    ) -> Any:
+        """ttl_seconds shortens the lifetime of this entry, never extends it"""
+        if ttl_seconds is None or ttl_seconds > self.ttl_seconds:
+            ttl_seconds = self.ttl_seconds
+        with self._lock:
+            self._entries[key] = CacheEntry(
+                value=value, expires_at=monotonic() + ttl_seconds, tags=set(tags)
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def invalidate_tags(self, *tags: str):
+        tags = set(tags)
+        with self._lock:
+            stale_keys = [
+                key for key, entry in self._entries.items() if entry.tags & tags
+            ]
+            for key in stale_keys:
+                del self._entries[key]
+            self.invalidations += len(stale_keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def clear_caches():
+    for cache in caches.values():
+        cache.clear()
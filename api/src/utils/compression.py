@@ -0,0 +1,179 @@
+import zlib
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# Best ratio first, when the client accepts several with the same weight
+PREFERRED_ENCODINGS = tuple(
+    encoding
+    for encoding, module in (("zstd", zstandard), ("br", brotli), ("gzip", zlib))
+    if module is not None
+)
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+# Levels of the bodies compressed on each request, cheap to produce
+DYNAMIC_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+# Levels of the cached bodies, compressed once per version
+STORED_LEVELS = {"zstd": 9, "br": 6, "gzip": 9}
+
+# Encoding negotiated for the current request, None when sent as is
+accepted_encoding: ContextVar[Optional[str]] = ContextVar(
+    "accepted_encoding", default=None
+)
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Highest weighted encoding of an Accept-Encoding header we can produce"""
+    weights: Dict[str, float] = {}
+    for item in (accept_encoding or "").split(","):
+        name, _, parameters = item.partition(";")
+        name = name.strip().lower()
+        weight = 1.0
+        parameter, _, value = parameters.partition("=")
+        if parameter.strip() == "q":
+            try:
+                weight = float(value)
+            except ValueError:
+                weight = 0.0
+        if name:
+            weights[name] = weight
+    default = weights.get("*", 0.0)
+    candidates = [
+        (weights.get(encoding, default), -rank, encoding)
+        for rank, encoding in enumerate(PREFERRED_ENCODINGS)
+    ]
+    weight, _, encoding = max(candidates, default=(0.0, 0, None))
+    return encoding if weight > 0 else None
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class StreamCompressor:
+    """Same interface over the incremental compressors of each encoding"""
+
+    def __init__(self, encoding: str, level: int):
+        if encoding == "zstd":
+            compressor = zstandard.ZstdCompressor(level=level).compressobj()
+            self._compress, self._finish = compressor.compress, compressor.flush
+        elif encoding == "br":
+            compressor = brotli.Compressor(quality=level)
+            self._compress, self._finish = compressor.process, compressor.finish
+        else:
+            # 31 bits of window: a gzip header and trailer around the deflate data
+            compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+            self._compress, self._finish = compressor.compress, compressor.flush
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compress(data)
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    compressor = StreamCompressor(encoding, level)
+    return compressor.compress(body) + compressor.finish()
+
+
+def weaken_etag(headers: MutableHeaders):
+    """The compressed bytes differ from the ones the strong ETag stands for"""
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+class CompressionMiddleware:
+    """
+    Compress the responses of at least minimum_size bytes in the encoding
+    preferred by the client. Streamed responses are compressed chunk by chunk,
+    responses already encoded (the cached ones) are sent as they are.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        token = accepted_encoding.set(encoding)
+        try:
+            if encoding is None:
+                await self.app(scope, receive, send)
+            else:
+                responder = CompressionResponder(send, encoding, self.minimum_size)
+                await self.app(scope, receive, responder.send)
+        finally:
+            accepted_encoding.reset(token)
+
+
+class CompressionResponder:
+    def __init__(self, send: Send, encoding: str, minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[StreamCompressor] = None
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            # Held until the first chunk of the body tells its size
+            self.start_message = message
+            return
+        if message["type"] == "http.response.body":
+            if self.start_message is not None:
+                message = self.start(message)
+                await self._send(self.start_message)
+                self.start_message = None
+            elif self.compressor is not None:
+                message = self.compress(message)
+        await self._send(message)
+
+    def start(self, message: Message) -> Message:
+        """Choose on the first chunk of the body, before the headers go out"""
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        if "content-encoding" in headers or not is_compressible(
+            headers.get("content-type")
+        ):
+            return message
+        headers.add_vary_header("Accept-Encoding")
+        more_body = message.get("more_body", False)
+        if not more_body and len(message.get("body", b"")) < self.minimum_size:
+            return message
+        headers["Content-Encoding"] = self.encoding
+        weaken_etag(headers)
+        self.compressor = StreamCompressor(self.encoding, DYNAMIC_LEVELS[self.encoding])
+        message = self.compress(message)
+        if more_body:
+            # The size of a stream is unknown until its end
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(message["body"]))
+        return message
+
+    def compress(self, message: Message) -> Message:
+        more_body = message.get("more_body", False)
+        data = self.compressor.compress(message.get("body", b""))
+        if not more_body:
+            data += self.compressor.finish()
+        return {"type": "http.response.body", "body": data, "more_body": more_body}
@@ -0,0 +1,44 @@
+from collections import Counter
+from threading import Lock
+from typing import Dict, Hashable, List
+
+
+class ShardedCounter:
+    """
+    Counts waiting to be written, spread over shards with a lock each so
+    that concurrent increments rarely wait on one another.
+    """
+
+    def __init__(self, nb_shards: int):
+        self._locks = [Lock() for _ in range(nb_shards)]
+        self._shards: List[Counter] = [Counter() for _ in range(nb_shards)]
+
+    def _get_index(self, key: Hashable) -> int:
+        return hash(key) % len(self._shards)
+
+    def increment(self, key: Hashable, amount: int = 1):
+        index = self._get_index(key)
+        with self._locks[index]:
+            self._shards[index][key] += amount
+
+    def get(self, key: Hashable) -> int:
+        index = self._get_index(key)
+        with self._locks[index]:
+            return self._shards[index][key]
+
+    def drain(self) -> Dict[Hashable, int]:
+        """Take every pending count, the shards start again from zero"""
+        drained: Dict[Hashable, int] = {}
+        for index, lock in enumerate(self._locks):
+            with lock:
+                shard, self._shards[index] = self._shards[index], Counter()
+            drained.update(shard)
+        return drained
+
+    def restore(self, drained: Dict[Hashable, int]):
+        """Put back counts that could not be written"""
+        for key, amount in drained.items():
+            self.increment(key, amount)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
@@ -1,26 +1,87 @@
-from typing import Annotated
+from contextlib import asynccontextmanager
+from typing import Annotated, AsyncContextManager, Callable
 
 from fastapi import Depends
-from sqlmodel import create_engine, Session
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.security.secrets import SECRET
+from src.utils.db_backend import (
+    WriterQueue,
+    WriterQueuedSession,
+    create_database_engine,
+)
+from src.utils.db_replicas import ReplicaRouter, is_disconnect_error
+from src.utils.query_stats import register_query_observer
+from src.utils.slow_queries import SlowQueryRecorder
+
 
-async_engine = AsyncEngine(
-    create_engine(
-        url=f"mysql+aiomysql://{SECRET.MARIADB_USER}:{SECRET.MARIADB_PASSWORD}@{SECRET.MARIADB_HOST}/{SECRET.MARIADB_DATABASE}"
-    )
+slow_query_recorder = SlowQueryRecorder(
+    threshold_ms=SECRET.SLOW_QUERY_THRESHOLD_MS,
+    size=SECRET.SLOW_QUERY_BUFFER_SIZE,
+    explain=SECRET.SLOW_QUERY_EXPLAIN,
+)
+register_query_observer(slow_query_recorder.observe)
+
+
+SessionOpener = Callable[[], AsyncContextManager[AsyncSession]]
+
+
+def create_session_factory(
+    engine: AsyncEngine, class_: type = AsyncSession, **kwargs
+) -> sessionmaker:
+    return sessionmaker(bind=engine, class_=class_, expire_on_commit=False, **kwargs)
+
+
+async_engine = create_database_engine()
+replica_engines = [
+    create_database_engine(url.strip())
+    for url in SECRET.DB_REPLICA_URLS.split(",")
+    if url.strip()
+]
+
+writer_queue = WriterQueue(enabled=async_engine.dialect.name == "sqlite")
+SessionFactory = create_session_factory(
+    async_engine, class_=WriterQueuedSession, writer_queue=writer_queue
+)
+read_router = ReplicaRouter(
+    primary_factory=SessionFactory,
+    replica_factories=[create_session_factory(engine) for engine in replica_engines],
+    retry_seconds=SECRET.DB_REPLICA_RETRY_SECONDS,
 )
 
 
 async def get_session() -> AsyncSession:
-    Session = sessionmaker(
-        bind=async_engine, class_=AsyncSession, expire_on_commit=False
-    )
-    async with Session() as session:
+    # The session only checks out a connection on its first query and gives it
+    # back to the pool on commit or rollback. On SQLite it waits in the writer
+    # queue from its first write until then.
+    async with SessionFactory() as session:
         yield session
 
 
-SessionDep = Annotated[Session, Depends(get_session)]
+async def get_read_session() -> AsyncSession:
+    """Read only session, served by a healthy replica when there is one"""
+    replica_index, session = await read_router.open_session()
+    async with session:
+        try:
+            yield session
+        except DBAPIError as error:
+            # A replica losing its connection is skipped until its retry delay is over
+            if replica_index is not None and is_disconnect_error(error):
+                read_router.mark_down(replica_index)
+            raise
+
+
+def get_read_session_opener() -> SessionOpener:
+    """
+    For streamed responses: the dependencies are closed before the body is
+    sent, the stream opens its own read session when it starts.
+    """
+    return asynccontextmanager(get_read_session)
+
+
+SessionDep = Annotated[AsyncSession, Depends(get_session)]
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
+ReadSessionOpenerDep = Annotated[SessionOpener, Depends(get_read_session_opener)]
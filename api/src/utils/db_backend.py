@@ -0,0 +1,195 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.security.secrets import SECRET
+from src.utils.db_pool import InstrumentedQueuePool
+from src.utils.query_stats import instrument_engine
+
+MARIADB_BACKEND = "mariadb"
+SQLITE_BACKEND = "sqlite"
+
+
+def get_database_url(is_async: bool = True) -> str:
+    """Url of the configured database, with the async or the sync driver"""
+    if SECRET.DB_BACKEND == SQLITE_BACKEND:
+        driver = "sqlite+aiosqlite" if is_async else "sqlite"
+        return f"{driver}:///{SECRET.SQLITE_PATH}"
+    driver = "mysql+aiomysql" if is_async else "mysql+pymysql"
+    return f"{driver}://{SECRET.MARIADB_USER}:{SECRET.MARIADB_PASSWORD}@{SECRET.MARIADB_HOST}/{SECRET.MARIADB_DATABASE}"
+
+
+def is_sqlite_url(url: str) -> bool:
+    return make_url(url).get_backend_name() == SQLITE_BACKEND
+
+
+def is_memory_url(url: str) -> bool:
+    return make_url(url).database in (None, "", ":memory:")
+
+
+def get_sqlite_pragmas() -> dict:
+    return {
+        # Readers no longer block the writer and the other way around
+        "journal_mode": "WAL",
+        # Durable at each checkpoint only, which is safe with WAL
+        "synchronous": SECRET.SQLITE_SYNCHRONOUS,
+        "busy_timeout": SECRET.SQLITE_BUSY_TIMEOUT_MS,
+        "foreign_keys": "ON",
+        "temp_store": "MEMORY",
+        # A negative cache size is in KiB instead of pages
+        "cache_size": -SECRET.SQLITE_CACHE_SIZE_KB,
+        "mmap_size": SECRET.SQLITE_MMAP_SIZE_MB * 1024 * 1024,
+    }
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in get_sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+def get_engine_options(url: str) -> dict:
+    if is_sqlite_url(url) and is_memory_url(url):
+        # Each connection to :memory: is a new empty database
+        return {"poolclass": StaticPool}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": SECRET.DB_POOL_SIZE,
+        "max_overflow": SECRET.DB_MAX_OVERFLOW,
+        "pool_timeout": SECRET.DB_POOL_TIMEOUT,
+        "pool_recycle": SECRET.DB_POOL_RECYCLE,
+        # An embedded database can not drop the connection
+        "pool_pre_ping": SECRET.DB_POOL_PRE_PING and not is_sqlite_url(url),
+    }
+
+
+def create_database_engine(url: Optional[str] = None, **kwargs) -> AsyncEngine:
+    """Async engine of the configured backend, or of the given url"""
+    url = url or get_database_url()
+    engine = create_async_engine(url=url, **{**get_engine_options(url), **kwargs})
+    if is_sqlite_url(url):
+        event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+    instrument_engine(engine)
+    return engine
+
+
+def create_sync_database_engine(url: Optional[str] = None, **kwargs) -> Engine:
+    """Sync engine for the fixtures, the migrations and the scripts"""
+    url = url or get_database_url(is_async=False)
+    engine = create_engine(url, **kwargs)
+    if is_sqlite_url(url):
+        event.listen(engine, "connect", set_sqlite_pragmas)
+    return engine
+
+
+class WriterQueue:
+    """
+    SQLite only accepts one writer at a time, the others would spin on the busy
+    timeout. Write transactions wait here in arrival order instead.
+    """
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.waiting = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        self.waiting += 1
+        try:
+            await self._lock.acquire()
+        finally:
+            self.waiting -= 1
+
+    def release(self):
+        self._lock.release()
+
+    @asynccontextmanager
+    async def hold(self):
+        if not self.enabled:
+            yield
+            return
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class WriterQueuedSession(AsyncSession):
+    """
+    Joins the writer queue at its first write only: an INSERT, UPDATE or
+    DELETE, or a query that flushes pending changes. It leaves at the end of
+    the transaction, the reads of a session never wait.
+    """
+
+    def __init__(self, *args, writer_queue: Optional[WriterQueue] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.writer_queue = writer_queue
+        self.holds_writer = False
+
+    async def queue_write(self, statement=None):
+        if self.holds_writer or self.writer_queue is None:
+            return
+        if not self.writer_queue.enabled:
+            return
+        has_changes = bool(self.new or self.dirty or self.deleted)
+        if has_changes or getattr(statement, "is_dml", False):
+            await self.writer_queue.acquire()
+            self.holds_writer = True
+
+    def release_writer(self):
+        if self.holds_writer:
+            self.holds_writer = False
+            self.writer_queue.release()
+
+    async def exec(self, statement, *args, **kwargs):
+        await self.queue_write(statement)
+        return await super().exec(statement, *args, **kwargs)
+
+    async def execute(self, statement, *args, **kwargs):
+        await self.queue_write(statement)
+        return await super().execute(statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        await self.queue_write(statement)
+        return await super().scalar(statement, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        await self.queue_write()
+        return await super().get(*args, **kwargs)
+
+    async def refresh(self, *args, **kwargs):
+        await self.queue_write()
+        return await super().refresh(*args, **kwargs)
+
+    async def flush(self, objects=None):
+        await self.queue_write()
+        await super().flush(objects=objects)
+
+    async def commit(self):
+        await self.queue_write()
+        try:
+            await super().commit()
+        finally:
+            self.release_writer()
+
+    async def rollback(self):
+        try:
+            await super().rollback()
+        finally:
+            self.release_writer()
+
+    async def close(self):
+        try:
+            await super().close()
+        finally:
+            self.release_writer()
@@ -0,0 +1,90 @@
+from bisect import bisect_left
+from threading import Lock
+from time import perf_counter
+from typing import List, Optional
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue, Empty
+
+# Upper bounds (in milliseconds) of the connection wait time histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class WaitHistogram:
+    def __init__(self, buckets_ms: tuple = WAIT_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        # The last bucket collects every wait above the highest bound
+        self.counts: List[int] = [0] * (len(self.buckets_ms) + 1)
+        self.total_count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.timeouts = 0
+
+    def observe(self, elapsed_ms: float):
+        index = bisect_left(self.buckets_ms, elapsed_ms)
+        with self._lock:
+            self.counts[index] += 1
+            self.total_count += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def observe_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def buckets(self) -> List[tuple[Optional[float], int]]:
+        bounds = list(self.buckets_ms) + [None]
+        return list(zip(bounds, self.counts))
+
+
+class TimedQueue(AsyncAdaptedQueue):
+    """Pool queue recording the time spent waiting for an idle connection"""
+
+    wait_histogram: Optional[WaitHistogram] = None
+
+    def get(self, block: bool = True, timeout: Optional[float] = None):
+        start_time = perf_counter()
+        try:
+            entry = super().get(block, timeout)
+        except Empty:
+            # A blocking get only gives up once the pool timeout is reached,
+            # a non blocking one lets the pool open a new connection instead
+            if block:
+                self._record_timeout()
+            raise
+        self._record_wait(start_time)
+        return entry
+
+    def _record_wait(self, start_time: float):
+        if self.wait_histogram is not None:
+            self.wait_histogram.observe((perf_counter() - start_time) * 1000)
+
+    def _record_timeout(self):
+        if self.wait_histogram is not None:
+            self.wait_histogram.observe_timeout()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool recording how long each checkout waited in the queue.
+    Opening new connections and the pre-ping are not part of the wait time.
+    """
+
+    _queue_class = TimedQueue
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.set_wait_histogram(WaitHistogram())
+
+    def set_wait_histogram(self, histogram: WaitHistogram):
+        self.wait_histogram = histogram
+        self._pool.wait_histogram = histogram
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.set_wait_histogram(self.wait_histogram)
+        return pool
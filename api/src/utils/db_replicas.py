@@ -0,0 +1,76 @@
+from time import monotonic
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy.exc import DBAPIError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+SessionFactoryType = Callable[[], AsyncSession]
+
+
+def is_disconnect_error(error: BaseException) -> bool:
+    """Only lost or refused connections take a replica out, not query errors"""
+    return isinstance(error, DBAPIError) and error.connection_invalidated
+
+
+class ReplicaRouter:
+    """
+    Round-robin over the read replicas, skipping the ones marked down
+    until their retry delay is over. Falls back on the primary
+    when no replica is available.
+    """
+
+    def __init__(
+        self,
+        primary_factory: SessionFactoryType,
+        replica_factories: List[SessionFactoryType],
+        retry_seconds: float,
+    ):
+        self.primary_factory = primary_factory
+        self.replica_factories = replica_factories
+        self.retry_seconds = retry_seconds
+        self._down_until = [0.0] * len(replica_factories)
+        self._next_index = 0
+
+    def candidates(self) -> List[int]:
+        """Healthy replicas in round-robin order, starting after the last pick"""
+        now = monotonic()
+        replica_count = len(self.replica_factories)
+        healthy = [
+            (self._next_index + offset) % replica_count
+            for offset in range(replica_count)
+            if self._down_until[(self._next_index + offset) % replica_count] <= now
+        ]
+        if healthy:
+            self._next_index = healthy[0] + 1
+        return healthy
+
+    def pick(self) -> Tuple[Optional[int], SessionFactoryType]:
+        candidates = self.candidates()
+        if candidates:
+            return candidates[0], self.replica_factories[candidates[0]]
+        return None, self.primary_factory
+
+    async def open_session(self) -> Tuple[Optional[int], AsyncSession]:
+        """
+        Open a session on the first replica answering, checking out its
+        connection right away so a dead replica is skipped before the
+        request runs. Falls back on the primary, which stays lazy.
+        """
+        for index in self.candidates():
+            session = self.replica_factories[index]()
+            try:
+                await session.connection()
+            except DBAPIError as error:
+                await session.close()
+                if not is_disconnect_error(error):
+                    raise
+                self.mark_down(index)
+                continue
+            return index, session
+        return None, self.primary_factory()
+
+    def mark_down(self, index: int):
+        self._down_until[index] = monotonic() + self.retry_seconds
+
+    def is_down(self, index: int) -> bool:
+        return self._down_until[index] > monotonic()
@@ -0,0 +1,78 @@
+from hashlib import blake2b
+from typing import Awaitable, Callable, Hashable, Iterable, Optional
+
+from sqlalchemy import func
+from sqlmodel import select
+from starlette import status
+from starlette.responses import Response
+
+from src.utils.cache import REVALIDATE_HEADERS, CachedResponse, LRUCache
+from src.utils.db import SessionDep
+
+
+def make_etag(*parts) -> str:
+    """Strong validator of the response built from these parts"""
+    return f'"{blake2b(repr(parts).encode(), digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses the weak comparison, W/ prefixes are ignored"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, **REVALIDATE_HEADERS},
+    )
+
+
+def get_cached_response(if_none_match: Optional[str], cached: CachedResponse) -> Response:
+    """304 when the client already has this body, the body otherwise"""
+    if etag_matches(if_none_match, cached.etag):
+        return not_modified_response(cached.etag)
+    return cached.to_response()
+
+
+async def get_table_version(session: SessionDep, id_column, *criteria) -> tuple:
+    """
+    Row count and highest id of the rows matching the criteria: any insert or
+    delete changes one of them, and both come from an index.
+    """
+    sql = select(func.count(id_column), func.max(id_column))
+    for criterion in criteria:
+        sql = sql.where(criterion)
+    result = await session.exec(sql)
+    return tuple(result.one())
+
+
+async def get_conditional_response(
+    if_none_match: Optional[str],
+    key: Hashable,
+    get_version: Callable[[], Awaitable[Hashable]],
+    build_body: Callable[[], Awaitable[bytes]],
+    cache: Optional[LRUCache] = None,
+    tags: Iterable[str] = (),
+) -> Response:
+    """
+    Answer 304 when the client already has the current version, checked
+    against the cached entry first, then against the version query.
+    The body is only built when the client needs it. A None version means
+    there is nothing to compare against: the body is built and raises its 404.
+    """
+    cached: Optional[CachedResponse] = cache.get(key) if cache is not None else None
+    if cached is None:
+        # Same session as the body, which reads one snapshot on MariaDB
+        version = await get_version()
+        etag = make_etag(key, version)
+        if version is not None and etag_matches(if_none_match, etag):
+            return not_modified_response(etag)
+        cached = CachedResponse(body=await build_body(), etag=etag)
+        if cache is not None:
+            cache.set(key, cached, tags=tags)
+    return get_cached_response(if_none_match, cached)
@@ -0,0 +1,70 @@
+import csv
+import io
+from typing import AsyncIterator, Iterable, List, Type
+
+from pydantic import BaseModel
+from starlette.responses import StreamingResponse
+
+from src.enums.ExportFormat import ExportFormat
+from src.security.secrets import SECRET
+from src.utils.db import SessionOpener
+from src.utils.ndjson import NDJSON_MEDIA_TYPE
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: NDJSON_MEDIA_TYPE,
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def encode_ndjson(models: List[BaseModel]) -> bytes:
+    return "".join(f"{model.model_dump_json()}\n" for model in models).encode()
+
+
+def encode_csv(rows: Iterable[Iterable]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def get_csv_values(model: BaseModel) -> List:
+    # Same text as in JSON for dates and enums, an empty cell for None
+    return [
+        "" if value is None else value
+        for value in model.model_dump(mode="json").values()
+    ]
+
+
+async def stream_export(
+    open_session: SessionOpener,
+    sql,
+    model: Type[BaseModel],
+    export_format: ExportFormat,
+) -> AsyncIterator[bytes]:
+    """
+    Rows of the query encoded batch by batch. The rows come from a server-side
+    cursor, only EXPORT_BATCH_SIZE of them are held in memory at a time.
+    """
+    async with open_session() as session:
+        result = await session.stream(
+            sql.execution_options(yield_per=SECRET.EXPORT_BATCH_SIZE)
+        )
+        if export_format == ExportFormat.CSV:
+            yield encode_csv([list(model.model_fields)])
+        async for rows in result.partitions():
+            models = [model.model_validate(row._mapping) for row in rows]
+            if export_format == ExportFormat.CSV:
+                yield encode_csv(get_csv_values(item) for item in models)
+            else:
+                yield encode_ndjson(models)
+
+
+def export_response(
+    body: AsyncIterator[bytes], export_format: ExportFormat, name: str
+) -> StreamingResponse:
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.{export_format.value}"'
+        },
+    )
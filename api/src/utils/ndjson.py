@@ -0,0 +1,33 @@
+from typing import AsyncIterable, AsyncIterator, Optional, Tuple
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes], max_line_bytes: int
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Numbered non-empty lines of a streamed body, only one line is held in
+    memory at a time. A line longer than max_line_bytes is skipped and
+    yielded as None.
+    """
+    buffer = b""
+    line_number = 1
+    too_long = False
+    async for chunk in chunks:
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            if too_long or len(line) > max_line_bytes:
+                yield line_number, None
+                too_long = False
+            elif line.strip():
+                yield line_number, line
+            line_number += 1
+        if len(buffer) > max_line_bytes:
+            # The rest of the line is dropped as it comes
+            too_long = True
+            buffer = b""
+    if too_long:
+        yield line_number, None
+    elif buffer.strip():
+        yield line_number, buffer
@@ -0,0 +1,20 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Opaque position of a row in the (created_at, id) descending order"""
+    payload = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Raise ValueError when the cursor was not made by encode_cursor"""
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        return datetime.fromisoformat(created_at), int(id)
+    except (TypeError, ValueError) as error:
+        raise ValueError(f"Invalid cursor: {cursor}") from error
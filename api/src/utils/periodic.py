@@ -0,0 +1,58 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger("cesi_zen.periodic")
+
+
+class PeriodicTask:
+    """Run a coroutine every interval_seconds in the background of the worker"""
+
+    def __init__(
+        self,
+        name: str,
+        interval_seconds: float,
+        function: Callable[[], Awaitable[None]],
+    ):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.function = function
+        self._task: Optional[asyncio.Task] = None
+        # The run in flight, never cancelled halfway by stop
+        self._run_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self, run_last: bool = True):
+        """
+        Cancel the loop and wait for the run in flight, then run once more so
+        that nothing is left behind
+        """
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        run_task, self._run_task = self._run_task, None
+        if run_task is not None:
+            await run_task
+        if run_last:
+            await self.run_once()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            self._run_task = asyncio.create_task(self.run_once())
+            await asyncio.shield(self._run_task)
+            self._run_task = None
+
+    async def run_once(self):
+        try:
+            await self.function()
+        except Exception:
+            # The next run tries again, the loop must outlive a lost connection
+            logger.exception("Periodic task %s failed", self.name)
@@ -0,0 +1,106 @@
+import logging
+import re
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Callable, List, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time"
+DUPLICATE_QUERY_HEADER = "X-DB-Duplicate-Queries"
+
+logger = logging.getLogger("cesi_zen.sql")
+
+_WHITESPACES = re.compile(r"\s+")
+# Expanded IN clauses differ by their number of placeholders only
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%s|%\(\w+\)s)\s*,)+\s*(?:\?|%s|%\(\w+\)s)\s*\)")
+
+
+def normalize_statement(statement: str) -> str:
+    statement = _WHITESPACES.sub(" ", statement).strip()
+    return _PLACEHOLDER_LIST.sub("(?)", statement)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_time: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total_time += elapsed
+        self.shapes[normalize_statement(statement)] += 1
+
+    @property
+    def duplicates(self) -> int:
+        """Statements that ran again with the same shape, the N+1 signature"""
+        return sum(count - 1 for count in self.shapes.values())
+
+    def repeated_shapes(self) -> List[str]:
+        return [shape for shape, count in self.shapes.items() if count > 1]
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+# Called with (conn, cursor, statement, parameters, context, executemany, elapsed)
+QueryObserver = Callable[..., None]
+_query_observers: List[QueryObserver] = []
+
+
+def register_query_observer(observer: QueryObserver):
+    if observer not in _query_observers:
+        _query_observers.append(observer)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # On the context of the statement: a statement that raises never reaches
+    # after_cursor_execute, and the context goes away with it
+    context.query_start_time = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = perf_counter() - context.query_start_time
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    for observer in _query_observers:
+        observer(conn, cursor, statement, parameters, context, executemany, elapsed)
+
+
+def instrument_engine(engine: Union[AsyncEngine, Engine]):
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def log_query_stats(method: str, uri: str, stats: QueryStats):
+    logger.info(
+        "%s %s: %d queries in %.2f ms, %d duplicates",
+        method,
+        uri,
+        stats.count,
+        stats.total_time * 1000,
+        stats.duplicates,
+        extra={
+            "db_query_count": stats.count,
+            "db_time": stats.total_time,
+            "db_duplicate_queries": stats.duplicates,
+        },
+    )
+    if stats.duplicates:
+        logger.warning(
+            "%s %s: possible N+1, repeated statements: %s",
+            method,
+            uri,
+            stats.repeated_shapes(),
+        )
@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Generic, List, Mapping, Optional, Type, TypeVar
+
+from sqlmodel import SQLModel, select
+
+from src.utils.cache import CachedResponse
+from src.utils.db import SessionDep, SessionFactory, SessionOpener
+from src.utils.etag import make_etag
+from src.utils.rows import fetch_dicts
+from src.utils.serialization import Serializer
+
+T = TypeVar("T", bound=SQLModel)
+
+# Every reference table of the process by name, loaded and refreshed together
+reference_tables: Dict[str, "ReferenceTable"] = {}
+
+
+@dataclass(frozen=True)
+class ReferenceSnapshot(Generic[T]):
+    """Rows of one load, never modified: a refresh builds a new snapshot"""
+
+    rows: Mapping[int, T]
+    body: CachedResponse
+    row_bodies: Mapping[int, CachedResponse]
+
+    def values(self) -> List[T]:
+        return list(self.rows.values())
+
+
+class ReferenceTable(Generic[T]):
+    """
+    Every row of a small table held in memory, with the JSON of the list and
+    of each row serialized once per load. Readers get the current snapshot,
+    a refresh swaps it whole.
+    """
+
+    def __init__(self, name: str, model: Type[T], order_by):
+        self.name = name
+        self.model = model
+        self.order_by = order_by
+        self.list_serializer = Serializer(List[model])
+        self.row_serializer = Serializer(model)
+        self.snapshot: Optional[ReferenceSnapshot[T]] = None
+        self.loads = 0
+        reference_tables[name] = self
+
+    async def load(self, session: SessionDep) -> ReferenceSnapshot[T]:
+        # Plain rows: the instances are never attached to the session
+        sql = select(*self.model.__table__.columns).order_by(self.order_by)
+        rows = [self.model.model_validate(row) for row in await fetch_dicts(session, sql)]
+        body = self.list_serializer.dump_json(rows)
+        row_bodies = {}
+        for row in rows:
+            row_body = self.row_serializer.dump_json(row)
+            row_bodies[row.id] = CachedResponse(
+                body=row_body, etag=make_etag(self.name, row.id, row_body)
+            )
+        self.snapshot = ReferenceSnapshot(
+            rows=MappingProxyType({row.id: row for row in rows}),
+            body=CachedResponse(body=body, etag=make_etag(self.name, body)),
+            row_bodies=MappingProxyType(row_bodies),
+        )
+        self.loads += 1
+        return self.snapshot
+
+    async def get_snapshot(self, session: SessionDep) -> ReferenceSnapshot[T]:
+        """Loaded by the lifespan, or by the first reader when it did not run"""
+        if self.snapshot is None:
+            return await self.load(session)
+        return self.snapshot
+
+    async def open_snapshot(self, open_session: SessionOpener) -> ReferenceSnapshot[T]:
+        """For the reads served from memory: a session is only opened to load"""
+        if self.snapshot is None:
+            async with open_session() as session:
+                return await self.load(session)
+        return self.snapshot
+
+    def clear(self):
+        self.snapshot = None
+
+
+async def load_reference_tables(session: SessionDep):
+    for table in reference_tables.values():
+        await table.load(session)
+
+
+async def refresh_reference_tables():
+    """
+    Pick up the rows written by the other workers or around the API.
+    Read on the primary, a lagging replica would bring back older rows.
+    """
+    async with SessionFactory() as session:
+        await load_reference_tables(session)
+
+
+def clear_reference_tables():
+    for table in reference_tables.values():
+        table.clear()
@@ -0,0 +1,55 @@
+from time import time
+from typing import Dict, Optional, Tuple
+
+
+class RevocationList:
+    """
+    Revoked tokens of the process, checked on every request without a query:
+    single tokens by their jti, and the tokens of a user issued before a time.
+    Entries only go away once every token they revoke has expired.
+    """
+
+    def __init__(self):
+        # jti -> expiry of the token
+        self._tokens: Dict[str, float] = {}
+        # user id -> (tokens issued up to then are revoked, expiry of the entry)
+        self._users: Dict[str, Tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._tokens) + len(self._users)
+
+    def revoke_token(self, jti: str, expires_at: float):
+        self._tokens[jti] = max(expires_at, self._tokens.get(jti, expires_at))
+
+    def revoke_user(self, user_id: str, revoked_before: float, expires_at: float):
+        current = self._users.get(user_id)
+        if current is not None:
+            revoked_before = max(revoked_before, current[0])
+            expires_at = max(expires_at, current[1])
+        self._users[user_id] = (revoked_before, expires_at)
+
+    def is_revoked(self, claims: dict) -> bool:
+        jti = claims.get("jti")
+        if jti is not None and jti in self._tokens:
+            return True
+        revocation = self._users.get(claims.get("user_id"))
+        if revocation is None:
+            return False
+        issued_at = claims.get("iat")
+        # Tokens issued before the claim existed cannot be told apart
+        return issued_at is None or issued_at <= revocation[0]
+
+    def prune(self, now: Optional[float] = None):
+        now = time() if now is None else now
+        self._tokens = {
+            jti: expires_at for jti, expires_at in self._tokens.items() if expires_at > now
+        }
+        self._users = {
+            user_id: revocation
+            for user_id, revocation in self._users.items()
+            if revocation[1] > now
+        }
+
+    def clear(self):
+        self._tokens = {}
+        self._users = {}
@@ -0,0 +1,15 @@
+from typing import List
+
+from src.utils.db import SessionDep
+
+
+async def fetch_dicts(session: SessionDep, sql) -> List[dict]:
+    """
+    Rows of a select of columns as plain dicts, ready to be validated by the
+    response models. The statement runs on the connection of the session:
+    no ORM result processing, and no RowMapping lookup per column.
+    """
+    connection = await session.connection()
+    result = await connection.execute(sql)
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result.all()]
@@ -1,10 +1,19 @@
 import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from hashlib import blake2b
+from typing import Dict, List, Optional
 
 from bleach.sanitizer import Cleaner
 
+from src.security.secrets import SECRET
+from src.utils.cache import LRUCache
 
-_cleaner = Cleaner(
-    tags={
+
+ALLOWED_TAGS = frozenset(
+    {
         "b",
         "i",
         "u",
@@ -24,11 +33,209 @@ _cleaner = Cleaner(
         "h2",
         "h3",
         "h4",
-    },
-    strip=True,
+    }
+)
+# A Cleaner keeps its parser state between calls, one per thread
+_local = threading.local()
+
+
+class ContentTooLargeError(ValueError):
+    pass
+
+
+class SanitizeUnavailableError(RuntimeError):
+    pass
+
+
+class SanitizeTimeoutError(SanitizeUnavailableError, TimeoutError):
+    pass
+
+
+def get_cleaner() -> Cleaner:
+    cleaner = getattr(_local, "cleaner", None)
+    if cleaner is None:
+        cleaner = _local.cleaner = Cleaner(tags=ALLOWED_TAGS, strip=True)
+    return cleaner
+
+
+def clean_html(content: str) -> str:
+    return get_cleaner().clean(content)
+
+
+def clean_html_batch(contents: List[str]) -> List[str]:
+    """Several contents for the price of one round trip to a worker"""
+    cleaner = get_cleaner()
+    return [cleaner.clean(content) for content in contents]
+
+
+def get_content_key(content: str) -> bytes:
+    return blake2b(content.encode(), digest_size=16).digest()
+
+
+class Sanitizer:
+    """
+    Cleans article HTML in worker processes: bleach is pure Python and would
+    hold the GIL of the event loop for the whole document otherwise.
+    Cleaned contents are memoized by hash, sending the same content again
+    costs a lookup.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_content_bytes: int,
+        timeout_seconds: float,
+        memo_size: int,
+    ):
+        self.workers = workers
+        self.max_content_bytes = max_content_bytes
+        self.timeout_seconds = timeout_seconds
+        self.memo = (
+            LRUCache("sanitizer", max_size=memo_size, ttl_seconds=3600)
+            if memo_size
+            else None
+        )
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Calls sent to the worker processes and not done yet, with their pool
+        self._calls: Dict[Future, ProcessPoolExecutor] = {}
+
+    def get_executor(self) -> Optional[Executor]:
+        """The worker processes start on the first call, None runs in threads"""
+        if not self.workers:
+            return None
+        if self._executor is None:
+            # A forked child would inherit the locks held by the event loop threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def check_size(self, content: str):
+        size = len(content.encode())
+        if size > self.max_content_bytes:
+            raise ContentTooLargeError(
+                f"Le contenu fait {size} octets, la limite est de {self.max_content_bytes}"
+            )
+
+    async def sanitize(self, content: str) -> str:
+        return (await self.sanitize_batch([content]))[0]
+
+    async def sanitize_batch(self, contents: List[str]) -> List[str]:
+        for content in contents:
+            self.check_size(content)
+        keys = [get_content_key(content) for content in contents]
+        cleaned = {}
+        if self.memo is not None:
+            for key in keys:
+                memoized = self.memo.get(key)
+                if memoized is not None:
+                    cleaned[key] = memoized
+        missing = {
+            key: content for key, content in zip(keys, contents) if key not in cleaned
+        }
+        if missing:
+            missing_keys = list(missing)
+            results = await self._clean_in_workers(list(missing.values()))
+            for key, result in zip(missing_keys, results):
+                cleaned[key] = result
+                if self.memo is not None:
+                    self.memo.set(key, result)
+        return [cleaned[key] for key in keys]
+
+    async def _clean_in_workers(self, contents: List[str]) -> List[str]:
+        try:
+            return await self._clean_chunks(contents)
+        except BrokenProcessPool:
+            # A worker died under the call, it is sent once more to a fresh pool
+            pass
+        try:
+            return await self._clean_chunks(contents)
+        except BrokenProcessPool:
+            raise SanitizeUnavailableError(
+                "Les processus de nettoyage ne répondent pas"
+            )
+
+    def _submit(
+        self, executor: Optional[ProcessPoolExecutor], chunk: List[str]
+    ) -> asyncio.Future:
+        if executor is None:
+            return asyncio.get_running_loop().run_in_executor(
+                None, clean_html_batch, chunk
+            )
+        future = executor.submit(clean_html_batch, chunk)
+        self._calls[future] = executor
+        future.add_done_callback(lambda done: self._calls.pop(done, None))
+        return asyncio.wrap_future(future)
+
+    async def _clean_chunks(self, contents: List[str]) -> List[str]:
+        executor = self.get_executor()
+        # One chunk per worker, each one is a single call with its own timeout
+        nb_chunks = max(1, min(self.workers, len(contents)))
+        chunks = [contents[index::nb_chunks] for index in range(nb_chunks)]
+        calls = [
+            asyncio.wait_for(self._submit(executor, chunk), self.timeout_seconds)
+            for chunk in chunks
+        ]
+        try:
+            chunk_results = await asyncio.gather(*calls)
+        except asyncio.TimeoutError:
+            if executor is not None:
+                # The worker is still busy with the document, only a new one frees it
+                self.retire(executor)
+            raise SanitizeTimeoutError(
+                f"Le nettoyage a dépassé {self.timeout_seconds} secondes"
+            )
+        except BrokenProcessPool:
+            self.retire(executor)
+            raise
+        results = [None] * len(contents)
+        for index, chunk_result in enumerate(chunk_results):
+            results[index::nb_chunks] = chunk_result
+        return results
+
+    def retire(self, executor: ProcessPoolExecutor):
+        """
+        New calls go to a fresh pool. The calls of the other requests still
+        finish in the retired one, then its processes are killed: the only
+        ones left running are stuck.
+        """
+        if self._executor is executor:
+            self._executor = None
+        running = [
+            future for future, owner in list(self._calls.items()) if owner is executor
+        ]
+        executor.shutdown(wait=False)
+        threading.Thread(
+            target=self._terminate_when_done,
+            args=(executor, running, self.timeout_seconds),
+            name="sanitizer-retire",
+            daemon=True,
+        ).start()
+
+    @staticmethod
+    def _terminate_when_done(
+        executor: ProcessPoolExecutor, running: List[Future], timeout_seconds: float
+    ):
+        # Past their timeout the calls are given up by their request anyway
+        wait(running, timeout=timeout_seconds)
+        # The executor has no public way to stop a running task
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+
+    def shutdown(self):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+sanitizer = Sanitizer(
+    workers=SECRET.SANITIZER_WORKERS,
+    max_content_bytes=SECRET.SANITIZER_MAX_CONTENT_BYTES,
+    timeout_seconds=SECRET.SANITIZER_TIMEOUT_SECONDS,
+    memo_size=SECRET.SANITIZER_MEMO_SIZE,
 )
 
 
 async def sanitize_content_async(content: str) -> str:
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, _cleaner.clean, content)
+    return await sanitizer.sanitize(content)
@@ -0,0 +1,117 @@
+import html
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+# Okapi BM25 parameters
+K1 = 1.2
+B = 0.75
+# A word of the title counts as much as this many words of the content
+TITLE_WEIGHT = 3
+
+_TAGS = re.compile(r"<[^>]+>")
+_WORDS = re.compile(r"[a-z0-9]+")
+_LIGATURES = str.maketrans({"œ": "oe", "æ": "ae", "Œ": "oe", "Æ": "ae"})
+STOP_WORDS = frozenset(
+    (
+        "a au aux avec ce ces d dans de des du elle en est et il ils j je l la le "
+        "les leur lui m ma mais me mes moi mon n ne nos notre nous on ou par pas "
+        "pour qu que qui s sa se ses son sur t ta te tes toi ton tu un une vos "
+        "votre vous y"
+    ).split()
+)
+
+
+def fold(text: str) -> str:
+    """Lower case without accents, so that 'Méditation' finds 'meditation'"""
+    decomposed = unicodedata.normalize("NFKD", text.translate(_LIGATURES))
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Terms of a text or of a sanitized HTML content"""
+    text = html.unescape(_TAGS.sub(" ", text))
+    terms = []
+    for word in _WORDS.findall(fold(text)):
+        if word in STOP_WORDS:
+            continue
+        # Plural forms of French words share the singular term
+        if len(word) > 3 and word[-1] in "sx":
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+
+class SearchIndex:
+    """In-memory inverted index ranking documents with BM25"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.clear()
+
+    def clear(self):
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._documents: Dict[int, Counter] = {}
+        self._lengths: Dict[int, int] = {}
+        self._total_length = 0
+        # Highest id indexed so far and version of the table it was synced with
+        self.max_id = 0
+        self.version: Optional[tuple] = None
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, document_id: int, title: str, content: str):
+        frequencies = Counter(tokenize(content))
+        for term in tokenize(title):
+            frequencies[term] += TITLE_WEIGHT
+        with self._lock:
+            self._remove(document_id)
+            for term, frequency in frequencies.items():
+                self._postings[term][document_id] = frequency
+            self._documents[document_id] = frequencies
+            length = sum(frequencies.values())
+            self._lengths[document_id] = length
+            self._total_length += length
+            self.max_id = max(self.max_id, document_id)
+
+    def remove(self, document_id: int):
+        with self._lock:
+            self._remove(document_id)
+
+    def _remove(self, document_id: int):
+        frequencies = self._documents.pop(document_id, None)
+        if frequencies is None:
+            return
+        for term in frequencies:
+            postings = self._postings[term]
+            postings.pop(document_id, None)
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(document_id)
+
+    def search(self, query: str) -> List[Tuple[int, float]]:
+        """Every document holding a term of the query, best score first"""
+        scores: Dict[int, float] = defaultdict(float)
+        with self._lock:
+            nb_documents = len(self._documents)
+            if not nb_documents:
+                return []
+            average_length = self._total_length / nb_documents
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(
+                    1 + (nb_documents - len(postings) + 0.5) / (len(postings) + 0.5)
+                )
+                for document_id, frequency in postings.items():
+                    norm = 1 - B + B * self._lengths[document_id] / average_length
+                    scores[document_id] += (
+                        idf * frequency * (K1 + 1) / (frequency + K1 * norm)
+                    )
+        # The newest document wins a tie
+        return sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
@@ -0,0 +1,96 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Generic, Iterator, Mapping, Optional, Type, TypeVar
+
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from starlette.responses import Response
+
+SERIALIZATION_TIME_HEADER = "X-Serialization-Time"
+
+logger = logging.getLogger("cesi_zen.serialization")
+
+T = TypeVar("T")
+
+
+@dataclass
+class SerializationStats:
+    count: int = 0
+    total_time: float = 0.0
+
+    def record(self, elapsed: float):
+        self.count += 1
+        self.total_time += elapsed
+
+
+current_serialization_stats: ContextVar[Optional[SerializationStats]] = ContextVar(
+    "current_serialization_stats", default=None
+)
+
+
+@contextmanager
+def measure_serialization() -> Iterator[None]:
+    """Add the time of the block to the stats of the current request"""
+    start_time = perf_counter()
+    try:
+        yield
+    finally:
+        stats = current_serialization_stats.get()
+        if stats is not None:
+            stats.record(perf_counter() - start_time)
+
+
+class TimedORJSONResponse(ORJSONResponse):
+    """
+    Default response class of the app: orjson encodes datetimes, UUIDs and
+    enums itself, and the time it takes goes into the request stats.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with measure_serialization():
+            return super().render(content)
+
+
+class Serializer(Generic[T]):
+    """
+    JSON encoder of a response type, built once at import. A route returning
+    serializer.response(value) skips the validation and the jsonable
+    conversion FastAPI runs on a returned model.
+    """
+
+    def __init__(self, type_: Type[T]):
+        self.adapter = TypeAdapter(type_)
+
+    def dump_json(self, value: T) -> bytes:
+        with measure_serialization():
+            return self.adapter.dump_json(value)
+
+    def response(
+        self,
+        value: T,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Response:
+        return Response(
+            content=self.dump_json(value),
+            status_code=status_code,
+            headers=headers,
+            media_type="application/json",
+        )
+
+
+def log_serialization_stats(method: str, uri: str, stats: SerializationStats):
+    logger.debug(
+        "%s %s: %d serializations in %.2f ms",
+        method,
+        uri,
+        stats.count,
+        stats.total_time * 1000,
+        extra={
+            "serialization_count": stats.count,
+            "serialization_time": stats.total_time,
+        },
+    )
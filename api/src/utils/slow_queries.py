@@ -0,0 +1,127 @@
+import logging
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from threading import Lock
+from typing import Any, List, Optional
+
+import greenlet
+
+from src.utils.query_stats import normalize_statement
+
+logger = logging.getLogger("cesi_zen.sql.slow")
+
+SERVICES_MODULE = "src.services."
+EXPLAIN_PREFIXES = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "mysql": "EXPLAIN ",
+    "mariadb": "EXPLAIN ",
+}
+
+
+@dataclass
+class SlowQuery:
+    statement: str
+    parameter_shapes: List[str]
+    duration_ms: float
+    caller: Optional[str]
+    explain: Optional[List[dict]]
+    recorded_at: datetime = field(default_factory=datetime.now)
+
+
+def get_parameter_shapes(parameters: Any, executemany: bool) -> List[str]:
+    """Type of each bound parameter, the values themselves are never kept"""
+    if executemany and parameters:
+        return [f"{len(parameters)} rows of"] + get_parameter_shapes(
+            parameters[0], False
+        )
+    if isinstance(parameters, dict):
+        return [f"{key}:{type(value).__name__}" for key, value in parameters.items()]
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return []
+
+
+def find_service_caller() -> Optional[str]:
+    """
+    Qualified name of the service method running the statement.
+    The async session runs the statement in a child greenlet,
+    so the search goes on in the frames of the parent greenlets.
+    """
+    frame = sys._getframe(1)
+    current = greenlet.getcurrent()
+    while True:
+        while frame is not None:
+            if frame.f_globals.get("__name__", "").startswith(SERVICES_MODULE):
+                return frame.f_code.co_qualname
+            frame = frame.f_back
+        current = current.parent
+        if current is None:
+            return None
+        frame = current.gr_frame
+
+
+class SlowQueryRecorder:
+    def __init__(self, threshold_ms: float, size: int, explain: bool = True):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self._records: deque = deque(maxlen=size)
+        self._lock = Lock()
+
+    def records(self) -> List[SlowQuery]:
+        with self._lock:
+            return list(reversed(self._records))
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def observe(
+        self, conn, cursor, statement, parameters, context, executemany, elapsed
+    ):
+        duration_ms = elapsed * 1000
+        if duration_ms < self.threshold_ms:
+            return
+        record = SlowQuery(
+            statement=normalize_statement(statement),
+            parameter_shapes=get_parameter_shapes(parameters, executemany),
+            duration_ms=duration_ms,
+            caller=find_service_caller(),
+            explain=self.run_explain(conn, statement, parameters, context, executemany),
+        )
+        with self._lock:
+            self._records.append(record)
+        logger.warning(
+            "Slow query (%.2f ms) from %s: %s",
+            duration_ms,
+            record.caller,
+            record.statement,
+        )
+
+    def run_explain(
+        self, conn, statement, parameters, context, executemany
+    ) -> Optional[List[dict]]:
+        if not self.explain:
+            return None
+        prefix = EXPLAIN_PREFIXES.get(conn.dialect.name)
+        if (
+            prefix is None
+            or executemany
+            or not statement.lstrip().upper().startswith("SELECT")
+            # A server side cursor is still reading its rows on this connection
+            or (context is not None and context.execution_options.get("stream_results"))
+        ):
+            return None
+        try:
+            # The raw DBAPI cursor does not fire the engine events again
+            explain_cursor = conn.connection.dbapi_connection.cursor()
+            try:
+                explain_cursor.execute(prefix + statement, parameters)
+                columns = [column[0] for column in explain_cursor.description]
+                return [dict(zip(columns, row)) for row in explain_cursor.fetchall()]
+            finally:
+                explain_cursor.close()
+        except Exception as error:
+            logger.debug("EXPLAIN failed for %s: %s", statement, error)
+            return None
@@ -1,6 +1,16 @@
 import pytest
 from datetime import datetime
 
+from src.services.JWTService import revocation_list
+from src.utils.cache import clear_caches
+
+
+@pytest.fixture(autouse=True, scope="function")
+def reset_caches():
+    # The verified and the revoked tokens would leak from a test to the next one
+    clear_caches()
+    revocation_list.clear()
+
 
 @pytest.fixture(scope="function")
 def use_time_machine(time_machine):
@@ -1,9 +1,17 @@
 import pytest_asyncio
 import pytest
 from collections.abc import Iterator
+from contextlib import asynccontextmanager
 
 from main import app
-from src.utils.db import get_session
+from src.services.ArticlesService import (
+    article_search_index,
+    article_views,
+    popular_articles,
+)
+from src.utils.cache import clear_caches
+from src.utils.db import get_read_session, get_read_session_opener, get_session
+from src.utils.reference_data import clear_reference_tables
 from tests.utils.utils_db import reset_test_db, delete_db, Session, get_test_session
 
 
@@ -11,7 +19,16 @@ from tests.utils.utils_db import reset_test_db, delete_db, Session, get_test_ses
 def reset_db() -> Iterator:
     # Setup
     reset_test_db()
+    clear_caches()
+    article_search_index.clear()
+    article_views.drain()
+    popular_articles.clear()
+    clear_reference_tables()
     app.dependency_overrides[get_session] = get_test_session
+    app.dependency_overrides[get_read_session] = get_test_session
+    app.dependency_overrides[get_read_session_opener] = lambda: asynccontextmanager(
+        get_test_session
+    )
 
     # Test
     yield
@@ -1,6 +1,11 @@
+import asyncio
+import json
+
 import pytest
+from sqlmodel import select
 
 from src.dto.dto_articles import (
+    CreateArticle,
     GetArticleResponseMin,
     GetAllArticleResponse,
     GetArticleResponseFull,
@@ -16,21 +21,33 @@ from tests.integration.endpoints.setup.articles_setup import (
     CREATED_AT,
     CONTENT,
 )
+from src.models import Article, User
+from src.security.secrets import SECRET
+from src.utils.serialization import SERIALIZATION_TIME_HEADER
+from src.services.ArticlesService import (
+    ArticleService,
+    article_cache,
+    article_views,
+)
 from tests.utils.utils_client import get_test_client
+from tests.utils.utils_constant import USER_ID
+from tests.utils.utils_queries import (
+    assert_max_queries,
+    assert_no_duplicate_queries,
+    get_query_count,
+)
 
 
 get_all_params = {
     "zero": {
         "loader": do_nothing,
         "expected": GetAllArticleResponse(
-            count=0,
             articles=[],
         ),
     },
     "one": {
         "loader": push_one_article_bundle,
         "expected": GetAllArticleResponse(
-            count=1,
             articles=[
                 GetArticleResponseMin(
                     id=1,
@@ -46,7 +63,6 @@ get_all_params = {
     "ten": {
         "loader": push_ten_articles_bundle,
         "expected": GetAllArticleResponse(
-            count=10,
             articles=[
                 GetArticleResponseMin(
                     id=id + 1,
@@ -56,7 +72,7 @@ get_all_params = {
                     category=LABEL,
                     created_at=CREATED_AT.isoformat(),
                 )
-                for id in range(10)
+                for id in reversed(range(10))
             ],
         ),
     },
@@ -64,7 +80,6 @@ get_all_params = {
         "route": "/articles/?category_id=1",
         "loader": push_ten_articles_with_2_categories_bundle,
         "expected": GetAllArticleResponse(
-            count=5,
             articles=[
                 GetArticleResponseMin(
                     id=id + 1,
@@ -74,7 +89,7 @@ get_all_params = {
                     category=f"{LABEL}1",
                     created_at=CREATED_AT.isoformat(),
                 )
-                for id in range(1, 10 + 1, 2)
+                for id in reversed(range(1, 10 + 1, 2))
             ],
         ),
     },
@@ -82,7 +97,6 @@ get_all_params = {
         "route": "/articles/?category_id=2",
         "loader": push_one_article_bundle,
         "expected": GetAllArticleResponse(
-            count=0,
             articles=[],
         ),
     },
@@ -102,6 +116,66 @@ async def test_get_all(values: dict):
         response = await client.get(route)
     assert response.status_code == 200
     assert response.json() == values["expected"].model_dump(mode="json")
+    # The version of the list, then the page itself
+    assert_max_queries(response, 2)
+    assert_no_duplicate_queries(response)
+
+
+@pytest.mark.asyncio
+async def test_get_all_walks_pages_with_cursor():
+    # Arrange
+    await push_ten_articles_bundle()
+    pages = []
+    route = "/articles/?limit=4"
+
+    # Act
+    async with get_test_client() as client:
+        while route:
+            response = await client.get(route)
+            assert response.status_code == 200
+            assert_max_queries(response, 2)
+            body = response.json()
+            pages.append([article["id"] for article in body["articles"]])
+            cursor = body["next_cursor"]
+            route = f"/articles/?limit=4&cursor={cursor}" if cursor else None
+
+    # Assert
+    assert pages == [[10, 9, 8, 7], [6, 5, 4, 3], [2, 1]]
+
+
+@pytest.mark.asyncio
+async def test_get_all_with_count():
+    # Arrange
+    await push_ten_articles_with_2_categories_bundle()
+
+    # Act
+    async with get_test_client() as client:
+        response = await client.get("/articles/?category_id=1&limit=2&with_count=true")
+
+    # Assert
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 5
+    assert [article["id"] for article in body["articles"]] == [10, 8]
+    assert body["next_cursor"] is not None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "route",
+    ["/articles/?cursor=not-a-cursor", "/articles/?limit=0", "/articles/?limit=101"],
+    ids=["invalid_cursor", "limit_too_small", "limit_too_big"],
+)
+async def test_get_all_bad_request(route: str):
+    # Arrange
+    await push_one_article_bundle()
+
+    # Act
+    async with get_test_client() as client:
+        response = await client.get(route)
+
+    # Assert
+    assert response.status_code == 400
 
 
 get_one_params = {
@@ -144,3 +218,403 @@ async def test_get_one(values: dict):
     # Assert
     assert response.status_code == values["return_code"]
     assert response.json() == values["expected"]
+    assert_max_queries(response, 2)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("route", ["/articles/", "/articles/1"], ids=["list", "detail"])
+async def test_get_served_from_cache(route: str):
+    # Arrange
+    await push_ten_articles_bundle()
+
+    # Act
+    async with get_test_client() as client:
+        first_response = await client.get(route)
+        hits = article_cache.hits
+        second_response = await client.get(route)
+
+    # Assert
+    assert second_response.status_code == 200
+    assert second_response.content == first_response.content
+    assert get_query_count(second_response) == 0
+    assert article_cache.hits == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_serialization_time_reported_until_cached():
+    # Arrange
+    await push_ten_articles_bundle()
+
+    # Act
+    async with get_test_client() as client:
+        first_response = await client.get("/articles/")
+        second_response = await client.get("/articles/")
+
+    # Assert
+    assert float(first_response.headers[SERIALIZATION_TIME_HEADER]) > 0
+    assert float(second_response.headers[SERIALIZATION_TIME_HEADER]) == 0
+
+
+@pytest.mark.asyncio
+async def test_create_article_invalidates_list(session):
+    # Arrange
+    await push_ten_articles_bundle()
+    async with get_test_client() as client:
+        await client.get("/articles/?with_count=true")
+    user = await session.get(User, USER_ID)
+
+    # Act
+    await ArticleService.create_article(
+        session, user, CreateArticle(title=TITLE, content=CONTENT, category=1)
+    )
+    async with get_test_client() as client:
+        response = await client.get("/articles/?with_count=true")
+
+    # Assert
+    assert response.json()["count"] == 11
+    assert get_query_count(response) > 0
+
+
+@pytest.mark.asyncio
+async def test_delete_article_invalidates_detail(session):
+    # Arrange
+    await push_ten_articles_bundle()
+    async with get_test_client() as client:
+        await client.get("/articles/1")
+
+    # Act
+    await ArticleService.delete_article(session, 1)
+    async with get_test_client() as client:
+        response = await client.get("/articles/1")
+
+    # Assert
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_all_not_modified_without_loading_articles():
+    # Arrange
+    await push_ten_articles_bundle()
+    async with get_test_client() as client:
+        first_response = await client.get("/articles/")
+    article_cache.clear()
+
+    # Act
+    async with get_test_client() as client:
+        response = await client.get(
+            "/articles/", headers={"If-None-Match": first_response.headers["ETag"]}
+        )
+
+    # Assert
+    assert response.status_code == 304
+    assert get_query_count(response) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_one_not_modified_from_cache():
+    # Arrange
+    await push_ten_articles_bundle()
+    async with get_test_client() as client:
+        first_response = await client.get("/articles/1")
+
+        # Act
+        response = await client.get(
+            "/articles/1", headers={"If-None-Match": first_response.headers["ETag"]}
+        )
+
+    # Assert
+    assert response.status_code == 304
+    assert get_query_count(response) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_missing_article_with_any_etag_not_found():
+    # Arrange
+    await push_ten_articles_bundle()
+
+    # Act
+    async with get_test_client() as client:
+        response = await client.get("/articles/9999", headers={"If-None-Match": "*"})
+
+    # Assert
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_delete_article_changes_list_etag(session):
+    # Arrange
+    await push_ten_articles_bundle()
+    async with get_test_client() as client:
+        first_response = await client.get("/articles/")
+
+    # Act
+    await ArticleService.delete_article(session, 1)
+    async with get_test_client() as client:
+        response = await client.get(
+            "/articles/", headers={"If-None-Match": first_response.headers["ETag"]}
+        )
+
+    # Assert
+    assert response.status_code == 200
+    assert response.headers["ETag"] != first_response.headers["ETag"]
+
+
+@pytest.mark.asyncio
+async def test_search_pages_ranked_articles():
+    # Arrange
+    await push_ten_articles_bundle()
+
+    # Act
+    query = "Title1 title2 content3"
+    async with get_test_client() as client:
+        first_page = await client.get(f"/articles/search?q={query}&size=2")
+        last_page = await client.get(f"/articles/search?q={query}&size=2&page=2")
+
+    # Assert
+    assert first_page.status_code == 200
+    body = first_page.json()
+    assert (body["total"], body["total_pages"], body["current_page"]) == (3, 2, 1)
+    # A title match weighs more than a content match
+    assert [article["id"] for article in body["articles"]] == [2, 1]
+    assert body["articles"][0]["creator"] == LOGIN
+    assert [article["id"] for article in last_page.json()["articles"]] == [3]
+
+
+@pytest.mark.asyncio
+async def test_search_finds_created_article_without_accents(session):
+    # Arrange
+    await push_ten_articles_bundle()
+    user = await session.get(User, USER_ID)
+    async with get_test_client() as client:
+        await client.get("/articles/search?q=respiration")
+
+    # Act
+    article = await ArticleService.create_article(
+        session,
+        user,
+        CreateArticle(title="Cohérence cardiaque", content="<p>Respiration</p>", category=1),
+    )
+    async with get_test_client() as client:
+        response = await client.get("/articles/search?q=coherence")
+
+    # Assert
+    assert [result["id"] for result in response.json()["articles"]] == [article.id]
+
+
+@pytest.mark.asyncio
+async def test_search_skips_article_deleted_elsewhere(session):
+    # Arrange
+    await push_ten_articles_bundle()
+    async with get_test_client() as client:
+        await client.get("/articles/search?q=title1")
+    article = await session.get(Article, 1)
+    await session.delete(article)
+    await session.commit()
+
+    # Act
+    async with get_test_client() as client:
+        response = await client.get("/articles/search?q=title1")
+
+    # Assert
+    assert response.json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_get_one_compressed_once_per_version(session):
+    # Arrange
+    await push_one_article_bundle()
+    user = await session.get(User, USER_ID)
+    content = "<p>Inspirez lentement, puis expirez.</p>" * 200
+    article = await ArticleService.create_article(
+        session, user, CreateArticle(title=TITLE, content=content, category=1)
+    )
+    route = f"/articles/{article.id}"
+    headers = {"Accept-Encoding": "br"}
+
+    # Act
+    async with get_test_client() as client:
+        first = await client.get(route, headers=headers)
+        second = await client.get(route, headers=headers)
+        not_modified = await client.get(
+            route, headers={**headers, "If-None-Match": second.headers["etag"]}
+        )
+        identity = await client.get(route, headers={"Accept-Encoding": "identity"})
+
+    # Assert
+    assert first.headers["content-encoding"] == "br"
+    assert first.json()["content"] == content
+    assert second.headers["etag"].startswith("W/")
+    (cached,) = [
+        entry.value
+        for entry in article_cache._entries.values()
+        if entry.value.etag in second.headers["etag"]
+    ]
+    assert set(cached.encoded_bodies) == {"br"}
+    assert int(second.headers["content-length"]) == len(cached.encoded_bodies["br"])
+    assert not_modified.status_code == 304
+    assert "content-encoding" not in identity.headers
+    assert identity.json()["content"] == content
+
+
+async def read_articles(*article_ids: int):
+    async with get_test_client() as client:
+        for article_id in article_ids:
+            await client.get(f"/articles/{article_id}")
+
+
+@pytest.mark.asyncio
+async def test_views_are_flushed_in_one_write(session):
+    # Arrange
+    await push_ten_articles_bundle()
+    await read_articles(3, 3, 3, 5, 99)
+    async with get_test_client() as client:
+        etag = (await client.get("/articles/5")).headers["ETag"]
+        await client.get("/articles/5", headers={"If-None-Match": etag})
+
+    # Act
+    await ArticleService.flush_article_views(session)
+
+    # Assert
+    articles = (await session.exec(select(Article).order_by(Article.id))).all()
+    views = {article.id: article.view_count for article in articles}
+    # The missing article is not counted, the cached and not modified reads are
+    assert {id: count for id, count in views.items() if count} == {3: 3, 5: 3}
+    assert len(article_views) == 0
+
+
+@pytest.mark.asyncio
+async def test_popular_articles_served_from_memory(session):
+    # Arrange
+    await push_ten_articles_bundle()
+    await read_articles(3, 3, 5, 7, 7, 7)
+    await ArticleService.flush_article_views(session)
+    await read_articles(5, 5, 5)
+
+    # Act
+    async with get_test_client() as client:
+        response = await client.get("/articles/popular?limit=3")
+
+    # Assert
+    assert [(article["id"], article["views"]) for article in response.json()] == [
+        (5, 4),
+        (7, 3),
+        (3, 2),
+    ]
+    assert response.json()[0]["creator"] == LOGIN
+    assert get_query_count(response) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error",
+    [ConnectionError("lost"), asyncio.CancelledError()],
+    ids=["case_0", "case_1"],
+)
+async def test_flush_failure_keeps_the_views(session, mocker, error):
+    # Arrange
+    await push_ten_articles_bundle()
+    await read_articles(2, 2)
+    mocker.patch.object(session, "commit", side_effect=error)
+
+    # Act
+    with pytest.raises(type(error)):
+        await ArticleService.flush_article_views(session)
+
+    # Assert
+    assert article_views.get(2) == 2
+
+
+async def stream_ndjson(*items):
+    for item in items:
+        line = item if isinstance(item, bytes) else json.dumps(item).encode()
+        yield line + b"\n"
+
+
+@pytest.mark.asyncio
+async def test_import_articles_reports_wrong_lines(session, mocker):
+    # Arrange
+    mocker.patch.object(SECRET, "ARTICLE_IMPORT_CHUNK_SIZE", 2)
+    await push_one_article_bundle()
+    user = await session.get(User, USER_ID)
+    async with get_test_client() as client:
+        await client.get("/articles/?with_count=true")
+    body = stream_ndjson(
+        {"title": "Import 1", "content": "<p>un</p><script>x</script>", "category": 1},
+        b"{not json",
+        {"title": "Import 2", "content": "<p>deux</p>", "category": 99},
+        {"title": "Import 3", "content": "<p>trois</p>", "category": 1},
+        {"title": "Import 4", "category": 1},
+        {"title": "Import 5", "content": "<p>cinq</p>", "category": 1},
+    )
+
+    # Act
+    result = await ArticleService.import_articles(session, user, body)
+    async with get_test_client() as client:
+        response = await client.get("/articles/?with_count=true")
+        search = await client.get("/articles/search?q=trois")
+        category = await client.get("/categories/1")
+
+    # Assert
+    assert result.imported == 3
+    assert [(error.line, error.detail) for error in result.errors] == [
+        (2, "Invalid JSON: key must be a string at line 1 column 2"),
+        (3, "La catégorie n'existe pas"),
+        (5, "content: Field required"),
+    ]
+    assert response.json()["count"] == 4
+    assert [article["title"] for article in response.json()["articles"]][:3] == [
+        "Import 5",
+        "Import 3",
+        "Import 1",
+    ]
+    assert search.json()["articles"][0]["title"] == "Import 3"
+    # The bundle article was loaded around the API, only the imported ones count
+    assert category.json()["article_count"] == 3
+    first = await session.get(Article, 2)
+    assert first.content == "<p>un</p>x"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "route",
+    ["/articles/search", "/articles/search?q=", "/articles/search?q=a&page=0"],
+    ids=["missing_query", "empty_query", "page_too_small"],
+)
+async def test_search_bad_request(route: str):
+    # Act
+    async with get_test_client() as client:
+        response = await client.get(route)
+
+    # Assert
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_import_articles_chunks_bounded_by_content_size(session, mocker):
+    # Arrange
+    mocker.patch.object(SECRET, "ARTICLE_IMPORT_CHUNK_MAX_BYTES", 100)
+    await push_one_article_bundle()
+    user = await session.get(User, USER_ID)
+    spy_chunk = mocker.spy(ArticleService, "insert_import_chunk")
+    spy_exec = mocker.spy(session, "exec")
+    content = "<p>" + "a" * 50 + "</p>"
+    body = stream_ndjson(
+        *(
+            {"title": f"Import {index}", "content": content, "category": 1}
+            for index in range(3)
+        )
+    )
+
+    # Act
+    result = await ArticleService.import_articles(session, user, body)
+
+    # Assert
+    assert result.imported == 3
+    # 2 contents reach the limit of a chunk, each one goes in its own INSERT
+    assert spy_chunk.call_count == 2
+    inserts = [
+        call
+        for call in spy_exec.call_args_list
+        if str(call.args[0]).startswith("INSERT INTO article")
+    ]
+    assert len(inserts) == 3
@@ -6,18 +6,27 @@ import pytest
 from httpx import Response
 from sqlmodel import select
 
+from src.Messages.jwt_messages import REVOKED_TOKEN_EXCEPTION
 from src.Messages.validators_messages import VALIDATION_ERROR
 from src.dto.dto_token import LoginResponse
 from src.enums.Roles import Roles
-from src.models import LoginLog, User
+from src.models import LoginLog, TokenRevocation, User
 from main import app
 from src.security.secrets import SECRET
-from src.services.JWTService import JWTService
+from src.services.JWTService import JWTService, revocation_list
+from src.services.RevocationService import RevocationService
+from src.services.UserService import UserService
 from src.utils.db import get_session
-from tests.integration.endpoints.setup.user_setup import push_one_user
+from tests.integration.endpoints.setup.user_setup import (
+    get_admin,
+    get_user,
+    push_one_user,
+)
 from tests.utils.utils_constant import PLAIN_PASSWORD, USER_LOGIN, USER_ID, USER_EMAIL
 from tests.utils.utils_db import get_test_session
-from tests.utils.utils_client import execute_post_request
+from tests.utils.utils_client import execute_post_request, get_test_client
+from tests.utils.utils_db import load_objects
+from tests.utils.utils_queries import get_query_count
 from tests.utils.utils_random import extract_body_to_model
 
 app.dependency_overrides[get_session] = get_test_session
@@ -309,3 +318,200 @@ async def test_login__10_login__check_loginlog_date(session, use_time_machine):
     # Assert
     login_log = await get_user_log(session)
     assert len(login_log) == 10
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "route", ["/admin/users", "/auth/session"], ids=["admin", "session"]
+)
+async def test_token_verified_once_per_request(mocker, route: str):
+    # Arrange
+    admin = get_admin()
+    await load_objects([admin])
+    headers = {"Authorization": f"Bearer {JWTService.create_access_token(admin)}"}
+    spy_decode = mocker.spy(JWTService, "decode_jwt")
+    spy_get_user = mocker.spy(UserService, "get_user_by_login_with_validity_check")
+
+    # Act
+    async with get_test_client() as client:
+        response = await client.get(route, headers=headers)
+
+    # Assert
+    assert response.status_code == 200
+    assert spy_decode.call_count == 1
+    assert spy_get_user.call_count == 1
+
+
+def get_bearer_headers(user: User) -> dict:
+    return {"Authorization": f"Bearer {JWTService.create_access_token(user)}"}
+
+
+@pytest.mark.asyncio
+async def test_session_served_from_user_cache():
+    # Arrange
+    user = get_user()
+    await load_objects([user])
+    headers = get_bearer_headers(user)
+
+    # Act
+    async with get_test_client() as client:
+        first_response = await client.get("/auth/session", headers=headers)
+        response = await client.get("/auth/session", headers=headers)
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json() == first_response.json()
+    assert get_query_count(first_response) == 1
+    assert get_query_count(response) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "route", ["/admin/users/disable", "/admin/users/delete"], ids=["disable", "delete"]
+)
+async def test_cached_user_refused_right_after_admin_write(route: str):
+    # Arrange
+    user, admin = get_user(), get_admin()
+    await load_objects([user, admin])
+    user_headers = get_bearer_headers(user)
+    async with get_test_client() as client:
+        first_response = await client.get("/auth/session", headers=user_headers)
+
+        # Act
+        write_method = client.patch if route.endswith("disable") else client.delete
+        write_response = await write_method(
+            f"{route}/{user.id}", headers=get_bearer_headers(admin)
+        )
+        response = await client.get("/auth/session", headers=user_headers)
+
+    # Assert
+    assert first_response.status_code == 200
+    assert write_response.status_code == 200
+    assert response.status_code != 200
+
+
+@pytest.mark.asyncio
+async def test_login_ignores_user_cached_before_write_of_other_worker(session):
+    # Arrange
+    user = get_user()
+    await load_objects([user])
+    async with get_test_client() as client:
+        await client.get("/auth/session", headers=get_bearer_headers(user))
+        # Written by another worker, the cache of this one is not dropped
+        stored_user = await session.get(User, user.id)
+        stored_user.disabled_at = datetime.now()
+        await session.commit()
+
+        # Act
+        response = await client.post(
+            "/auth/login", data={USERNAME_KEY: user.login, PASSWORD_KEY: PLAIN_PASSWORD}
+        )
+
+    # Assert
+    assert response.status_code != 200
+    assert "access_token" not in response.json()
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_only_its_token(session):
+    # Arrange
+    user = get_user()
+    await load_objects([user])
+    headers, other_headers = get_bearer_headers(user), get_bearer_headers(user)
+
+    # Act
+    async with get_test_client() as client:
+        logout_response = await client.post("/auth/logout", headers=headers)
+        response = await client.get("/auth/session", headers=headers)
+        other_response = await client.get("/auth/session", headers=other_headers)
+
+    # Assert
+    assert logout_response.status_code == 200
+    assert response.status_code == 401
+    assert response.json()["message"] == str(REVOKED_TOKEN_EXCEPTION)
+    assert other_response.status_code == 200
+    revocations = (await session.exec(select(TokenRevocation))).all()
+    assert len(revocations) == 1
+    assert revocations[0].jti is not None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "route", ["/admin/users/disable", "/admin/users/delete"], ids=["disable", "delete"]
+)
+async def test_admin_write_revokes_user_tokens(route: str):
+    # Arrange
+    user, admin = get_user(), get_admin()
+    await load_objects([user, admin])
+    user_headers = get_bearer_headers(user)
+
+    # Act
+    async with get_test_client() as client:
+        write_method = client.patch if route.endswith("disable") else client.delete
+        await write_method(f"{route}/{user.id}", headers=get_bearer_headers(admin))
+        response = await client.get("/auth/session", headers=user_headers)
+
+    # Assert
+    # Refused by the token check, before the user is looked up
+    assert response.status_code == 401
+    assert response.json()["message"] == str(REVOKED_TOKEN_EXCEPTION)
+    assert get_query_count(response) == 0
+
+
+@pytest.mark.asyncio
+async def test_reset_password_revokes_previous_tokens():
+    # Arrange
+    user = get_user()
+    await load_objects([user])
+    headers = get_bearer_headers(user)
+    new_password = "N3w-Passw0rd!"
+
+    # Act
+    async with get_test_client() as client:
+        reset_response = await client.patch(
+            "/user/reset-password",
+            headers=headers,
+            json={
+                "old_password": PLAIN_PASSWORD,
+                "password": new_password,
+                "confirm_password": new_password,
+            },
+        )
+        response = await client.get("/auth/session", headers=headers)
+        login_response = await client.post(
+            "/auth/login", data={USERNAME_KEY: user.login, PASSWORD_KEY: new_password}
+        )
+        new_response = await client.get(
+            "/auth/session",
+            headers={"Authorization": f"Bearer {login_response.json()['access_token']}"},
+        )
+
+    # Assert
+    assert reset_response.status_code == 200
+    assert response.status_code == 401
+    assert new_response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_revocations_of_other_workers_picked_up_and_pruned(session):
+    # Arrange
+    user, expired_user = get_user(), get_admin()
+    await load_objects([user, expired_user])
+    headers = get_bearer_headers(user)
+    RevocationService.revoke_user_tokens(session, user)
+    expired = RevocationService.revoke_user_tokens(session, expired_user)
+    expired.expires_at = expired.revoked_before
+    await session.commit()
+
+    # Act
+    async with get_test_client() as client:
+        first_response = await client.get("/auth/session", headers=headers)
+        await RevocationService.refresh_revocations(session)
+        response = await client.get("/auth/session", headers=headers)
+
+    # Assert
+    assert first_response.status_code == 200
+    assert response.status_code == 401
+    assert len(revocation_list) == 1
+    revocations = (await session.exec(select(TokenRevocation))).all()
+    assert [revocation.id_user for revocation in revocations] == [user.id]
@@ -0,0 +1,93 @@
+import csv
+import io
+import json
+
+import pytest
+
+from src.services.JWTService import JWTService
+from tests.integration.endpoints.setup.articles_setup import (
+    CONTENT,
+    LOGIN,
+    push_ten_articles_bundle,
+)
+from tests.integration.endpoints.setup.user_setup import get_admin
+from tests.utils.utils_client import get_test_client
+from tests.utils.utils_constant import ADMIN_LOGIN, USER_ID
+from tests.utils.utils_db import load_objects
+
+
+async def get_admin_headers() -> dict:
+    admin = get_admin()
+    await load_objects([admin])
+    return {"Authorization": f"Bearer {JWTService.create_access_token(admin)}"}
+
+
+@pytest.mark.asyncio
+async def test_export_articles_ndjson():
+    # Arrange
+    await push_ten_articles_bundle()
+    headers = await get_admin_headers()
+
+    # Act
+    async with get_test_client() as client:
+        response = await client.get("/admin/articles/export", headers=headers)
+
+    # Assert
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="articles.ndjson"' in response.headers["content-disposition"]
+    articles = [json.loads(line) for line in response.text.splitlines()]
+    assert [article["id"] for article in articles] == list(range(1, 11))
+    assert articles[0]["content"] == f"{CONTENT}1"
+    assert articles[0]["creator"] == LOGIN
+
+
+@pytest.mark.asyncio
+async def test_export_users_csv_in_batches(mocker):
+    # Arrange
+    mocker.patch("src.utils.export.SECRET.EXPORT_BATCH_SIZE", 1)
+    await push_ten_articles_bundle()
+    headers = await get_admin_headers()
+
+    # Act
+    async with get_test_client() as client:
+        response = await client.get(
+            "/admin/users/export", params={"format": "csv"}, headers=headers
+        )
+
+    # Assert
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert sorted(row["login"] for row in rows) == sorted([LOGIN, ADMIN_LOGIN])
+    assert "hashed_password" not in rows[0]
+    user = next(row for row in rows if row["id"] == str(USER_ID))
+    assert user["role"] == "user"
+    assert user["deleted_at"] == ""
+
+
+@pytest.mark.asyncio
+async def test_export_users_filtered_by_role():
+    # Arrange
+    await push_ten_articles_bundle()
+    headers = await get_admin_headers()
+
+    # Act
+    async with get_test_client() as client:
+        response = await client.get(
+            "/admin/users/export", params={"role": "admin"}, headers=headers
+        )
+
+    # Assert
+    users = [json.loads(line) for line in response.text.splitlines()]
+    assert [user["login"] for user in users] == [ADMIN_LOGIN]
+
+
+@pytest.mark.asyncio
+async def test_export_needs_admin():
+    # Act
+    async with get_test_client() as client:
+        response = await client.get("/admin/articles/export")
+
+    # Assert
+    assert response.status_code == 401
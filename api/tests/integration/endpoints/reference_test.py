@@ -0,0 +1,178 @@
+import pytest
+from sqlmodel import select
+
+from src.dto.dto_articles import CreateArticle
+from src.models import Category, User
+from src.services.ArticlesService import ArticleService
+from src.services.CategoryService import CategoryService
+from tests.integration.endpoints.setup.articles_setup import (
+    push_ten_articles_with_2_categories_bundle,
+)
+from tests.integration.endpoints.setup.reference_setup import (
+    push_two_categories_bundle,
+    push_two_exercises_bundle,
+)
+from src.utils.reference_data import load_reference_tables
+from tests.utils.utils_client import get_test_client
+from tests.utils.utils_constant import USER_ID
+from tests.utils.utils_db import load_objects
+from tests.utils.utils_queries import get_query_count
+
+routes_params = {
+    "categories": {"route": "/categories/", "loader": push_two_categories_bundle},
+    "category": {"route": "/categories/1", "loader": push_two_categories_bundle},
+    "exercises": {"route": "/exercises/", "loader": push_two_exercises_bundle},
+    "exercise": {"route": "/exercises/1", "loader": push_two_exercises_bundle},
+}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "values",
+    routes_params.values(),
+    ids=[f"case_{k}" for k in routes_params.keys()],
+)
+async def test_get_with_current_etag_is_not_modified(values: dict):
+    # Arrange
+    await values["loader"]()
+    async with get_test_client() as client:
+        first_response = await client.get(values["route"])
+
+        # Act
+        response = await client.get(
+            values["route"],
+            headers={"If-None-Match": first_response.headers["ETag"]},
+        )
+
+    # Assert
+    assert first_response.status_code == 200
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == first_response.headers["ETag"]
+    # Answered from the reference data in memory
+    assert get_query_count(response) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "values",
+    routes_params.values(),
+    ids=[f"case_{k}" for k in routes_params.keys()],
+)
+async def test_get_reference_data_without_query_once_loaded(values: dict):
+    # Arrange
+    await values["loader"]()
+    async with get_test_client() as client:
+        first_response = await client.get(values["route"])
+
+        # Act
+        response = await client.get(values["route"])
+
+    # Assert
+    assert get_query_count(first_response) == 1
+    assert response.status_code == 200
+    assert response.content == first_response.content
+    assert get_query_count(response) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_categories_with_old_etag_after_refresh(session):
+    # Arrange
+    await push_two_categories_bundle()
+    async with get_test_client() as client:
+        first_response = await client.get("/categories/")
+        await load_objects([Category(id=3, label="new")])
+        stale_response = await client.get("/categories/")
+        await load_reference_tables(session)
+
+        # Act
+        response = await client.get(
+            "/categories/", headers={"If-None-Match": first_response.headers["ETag"]}
+        )
+
+    # Assert
+    assert len(stale_response.json()) == 2
+    assert response.status_code == 200
+    assert response.headers["ETag"] != first_response.headers["ETag"]
+    assert len(response.json()) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_missing_category_is_not_found():
+    # Arrange
+    await push_two_categories_bundle()
+
+    # Act
+    async with get_test_client() as client:
+        response = await client.get("/categories/3")
+
+    # Assert
+    assert response.status_code == 404
+    assert "ETag" not in response.headers
+
+
+async def get_article_counts() -> dict:
+    async with get_test_client() as client:
+        response = await client.get("/categories/")
+    return {
+        category["id"]: category["article_count"] for category in response.json()
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_categories_counts_articles_written_by_the_api(session):
+    # Arrange
+    await push_ten_articles_with_2_categories_bundle()
+    await session.exec(CategoryService.build_recount_query())
+    await session.commit()
+    counts_before = await get_article_counts()
+    user = await session.get(User, USER_ID)
+
+    # Act
+    await ArticleService.create_article(
+        session, user, CreateArticle(title="title", content="content", category=0)
+    )
+    await ArticleService.delete_article(session, 2)
+    await ArticleService.delete_article(session, 4)
+    counts_after = await get_article_counts()
+
+    # Assert
+    assert counts_before == {0: 5, 1: 5}
+    assert counts_after == {0: 6, 1: 3}
+
+
+@pytest.mark.asyncio
+async def test_get_categories_not_modified_until_an_article_is_written(session):
+    # Arrange
+    await push_two_categories_bundle()
+    user = User(id=USER_ID, login="login", email="login@email.com", hashed_password="x")
+    await load_objects([user])
+    async with get_test_client() as client:
+        first_response = await client.get("/categories/")
+
+        # Act
+        await ArticleService.create_article(
+            session, user, CreateArticle(title="title", content="content", category=2)
+        )
+        response = await client.get(
+            "/categories/", headers={"If-None-Match": first_response.headers["ETag"]}
+        )
+
+    # Assert
+    assert response.status_code == 200
+    assert [category["article_count"] for category in response.json()] == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_recount_query_counts_every_article(session):
+    # Arrange
+    await push_ten_articles_with_2_categories_bundle()
+    await load_objects([Category(id=3, label="empty", article_count=7)])
+
+    # Act
+    await session.exec(CategoryService.build_recount_query())
+    await session.commit()
+
+    # Assert
+    categories = (await session.exec(select(Category).order_by(Category.id))).all()
+    assert [category.article_count for category in categories] == [5, 5, 0]
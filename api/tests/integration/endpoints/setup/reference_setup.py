@@ -0,0 +1,23 @@
+from src.models import Category, ExerciseCoherenceCardiac
+from tests.utils.utils_db import load_objects
+
+from tests.utils.utils_constant import LABEL
+
+
+def get_basic_exercise(id: int) -> ExerciseCoherenceCardiac:
+    return ExerciseCoherenceCardiac(
+        id=id,
+        name=f"exercise{id}",
+        duration_inspiration=4,
+        duration_apnea=2,
+        duration_expiration=6,
+        number_cycles=10,
+    )
+
+
+async def push_two_categories_bundle():
+    await load_objects([Category(id=id, label=f"{LABEL}{id}") for id in (1, 2)])
+
+
+async def push_two_exercises_bundle():
+    await load_objects([get_basic_exercise(id) for id in (1, 2)])
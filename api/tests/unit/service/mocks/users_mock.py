@@ -36,6 +36,14 @@ def get_user_with_validity_check_mock(mocker, return_value: Optional[User]):
     )
 
 
+def get_valid_user_by_login_mock(mocker, return_value: Optional[User]):
+    return mocker.patch.object(
+        UserService,
+        "get_valid_user_by_login",
+        return_value=return_value,
+    )
+
+
 def get_user_by_email_mock(mocker, return_value: bool):
     return mocker.patch.object(
         UserService,
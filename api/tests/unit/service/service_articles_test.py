@@ -0,0 +1,60 @@
+import pytest
+from fastapi.exceptions import HTTPException
+
+from src.models import Article
+from src.services.ArticlesService import ArticleService
+from src.services.CategoryService import CategoryService
+from tests.unit.service.mocks.session_mock import session_mock
+
+
+def test_build_list_query_never_selects_content():
+    # Act
+    sql = ArticleService.build_list_query()
+
+    # Assert
+    assert [column.name for column in sql.selected_columns] == [
+        "id",
+        "title",
+        "id_category",
+        "created_at",
+        "creator",
+        "category",
+    ]
+    assert "content" not in str(sql)
+
+
+@pytest.mark.asyncio
+async def test_delete_article_without_loading_content(mocker):
+    # Arrange
+    mock_session = session_mock(mocker)
+    article = Article(id=1, title="title", content="content")
+    mock_session.get.return_value = article
+    mock_refresh_categories = mocker.patch.object(CategoryService, "refresh_categories")
+
+    # Act
+    result = await ArticleService.delete_article(mock_session, 1)
+
+    # Assert
+    assert result is True
+    _, kwargs = mock_session.get.call_args
+    (option,) = kwargs["options"]
+    assert option.context[0].path[-1] is Article.content.property
+    assert ("deferred", True) in option.context[0].strategy
+    mock_session.delete.assert_called_once_with(article)
+    mock_session.commit.assert_called_once()
+    mock_refresh_categories.assert_called_once_with(mock_session)
+
+
+@pytest.mark.asyncio
+async def test_delete_article_not_found(mocker):
+    # Arrange
+    mock_session = session_mock(mocker)
+    mock_session.get.return_value = None
+
+    # Act
+    with pytest.raises(HTTPException) as error:
+        await ArticleService.delete_article(mock_session, 1)
+
+    # Assert
+    assert error.value.status_code == 404
+    mock_session.delete.assert_not_called()
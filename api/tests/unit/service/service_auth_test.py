@@ -1,6 +1,7 @@
 from datetime import datetime
 
 import pytest
+from starlette.requests import Request
 
 from src.Messages.jwt_messages import (
     JwtCredentialsError,
@@ -10,11 +11,15 @@ from src.Messages.jwt_messages import (
 )
 from src.enums.Roles import Roles
 from src.models import User
+from src.security.principal import Principal, get_principal
 from src.services.AuthService import AuthService
 from tests.unit.service.mocks.jwt_mock import decode_service_mock
 from tests.unit.service.mocks.password_mock import verify_password_mock
 from tests.unit.service.mocks.session_mock import session_mock
-from tests.unit.service.mocks.users_mock import get_user_with_validity_check_mock
+from tests.unit.service.mocks.users_mock import (
+    get_user_with_validity_check_mock,
+    get_valid_user_by_login_mock,
+)
 from tests.unit.service.service_jwt_test import get_user
 
 from tests.utils.utils_constant import (
@@ -31,7 +36,7 @@ from tests.utils.utils_constant import (
 async def test_authenticate_user_success(mocker):
     # Arrange
     user = get_user()
-    mock_get_user = get_user_with_validity_check_mock(mocker, user)
+    mock_get_user = get_valid_user_by_login_mock(mocker, user)
     mock_verify = verify_password_mock(mocker, True)
     mock_session = session_mock(mocker)
 
@@ -57,7 +62,7 @@ async def test_authenticate_user_success(mocker):
 @pytest.mark.asyncio
 async def test_authenticate_user_nonexistent(mocker):
     # Arrange
-    mock_get_user = get_user_with_validity_check_mock(mocker, None)
+    mock_get_user = get_valid_user_by_login_mock(mocker, None)
     mock_verify = verify_password_mock(mocker, True)
     mock_session = session_mock(mocker)
 
@@ -76,7 +81,7 @@ async def test_authenticate_user_nonexistent(mocker):
 async def test_authenticate_user_wrong_password(mocker):
     # Arrange
     user = get_user()
-    mock_get_user = get_user_with_validity_check_mock(mocker, user)
+    mock_get_user = get_valid_user_by_login_mock(mocker, user)
     mock_verify = verify_password_mock(mocker, False)
     mock_session = session_mock(mocker)
 
@@ -91,35 +96,58 @@ async def test_authenticate_user_wrong_password(mocker):
     mock_session.commit.assert_not_called()
 
 
+def get_request() -> Request:
+    return Request({"type": "http", "headers": []})
+
+
+@pytest.mark.asyncio
+async def test_get_principal_decodes_once_per_request(mocker):
+    # Arrange
+    mock_decode = decode_service_mock(mocker, {"sub": LOGIN, "role": Roles.USER})
+    request = get_request()
+
+    # Act
+    first_principal = await get_principal(request, FAKE_TOKEN)
+    second_principal = await get_principal(request, FAKE_TOKEN)
+    other_principal = await get_principal(get_request(), FAKE_TOKEN)
+
+    # Assert
+    assert second_principal is first_principal
+    assert other_principal is not first_principal
+    assert first_principal.login == LOGIN
+    assert mock_decode.call_count == 2
+
+
 @pytest.mark.asyncio
 async def test_get_current_user_in_jwt_success(mocker):
     # Arrange
     user = User(login=LOGIN, email=EMAIL, hashed_password=HASHED_PASSWORD)
-    mock_decode = decode_service_mock(mocker, {"sub": LOGIN})
+    principal = Principal(claims={"sub": LOGIN})
     mock_get_user = get_user_with_validity_check_mock(mocker, user)
     mock_session = session_mock(mocker)
 
     # Act
-    result = await AuthService.get_current_user_in_jwt(mock_session, FAKE_TOKEN)
+    result = await AuthService.get_current_user_in_jwt(mock_session, principal)
+    second_result = await AuthService.get_current_user_in_jwt(mock_session, principal)
 
     # Assert
-    mock_decode.assert_called_once_with(FAKE_TOKEN)
     mock_get_user.assert_called_once_with(mock_session, LOGIN)
     assert result == user
+    assert second_result is result
 
 
 @pytest.mark.asyncio
 async def test_get_current_user_in_jwt_user_not_found(mocker):
     # Arrange
-    mock_decode = decode_service_mock(mocker, {"sub": LOGIN})
+    principal = Principal(claims={"sub": LOGIN})
     mock_get_user = get_user_with_validity_check_mock(mocker, None)
     mock_session = session_mock(mocker)
 
     # Act
-    result = await AuthService.get_current_user_in_jwt(mock_session, FAKE_TOKEN)
+    result = await AuthService.get_current_user_in_jwt(mock_session, principal)
+    await AuthService.get_current_user_in_jwt(mock_session, principal)
 
     # Assert
-    mock_decode.assert_called_once_with(FAKE_TOKEN)
     mock_get_user.assert_called_once_with(mock_session, LOGIN)
     assert result is None
 
@@ -129,28 +157,26 @@ async def test_get_current_user_in_jwt_user_not_found(mocker):
     "role",
     list(Roles.__members__.values()),
 )
-async def test_is_logged_as_user_success(mocker, role):
+async def test_is_logged_as_user_success(role):
     # Arrange
-    mock_decode = decode_service_mock(mocker, {"role": role})
+    principal = Principal(claims={"role": role})
 
     # Act
-    result = await AuthService.is_logged_as_user(FAKE_TOKEN)
+    result = await AuthService.is_logged_as_user(principal)
 
     # Assert
-    mock_decode.assert_called_once_with(FAKE_TOKEN)
     assert result is True
 
 
 @pytest.mark.asyncio
-async def test_is_logged_as_admin_success(mocker):
+async def test_is_logged_as_admin_success():
     # Arrange
-    mock_decode = decode_service_mock(mocker, {"role": Roles.ADMIN})
+    principal = Principal(claims={"role": Roles.ADMIN})
 
     # Act
-    result = await AuthService.is_logged_as_admin(FAKE_TOKEN)
+    result = await AuthService.is_logged_as_admin(principal)
 
     # Assert
-    mock_decode.assert_called_once_with(FAKE_TOKEN)
     assert result is True
 
 
@@ -164,14 +190,13 @@ async def test_is_logged_as_admin_success(mocker):
     ],
     ids=[f"admin-{UNKNOWN_ROLE}", f"admin-{Roles.USER}", f"user-{UNKNOWN_ROLE}"],
 )
-async def test_is_logged_as_error(mocker, method_to_test, role):
+async def test_is_logged_as_error(method_to_test, role):
     # Arrange
-    mock_decode = decode_service_mock(mocker, {"role": role})
+    principal = Principal(claims={"role": role})
 
     # Act
     with pytest.raises(JwtError) as error:
-        await method_to_test(FAKE_TOKEN)
+        await method_to_test(principal)
 
     # Assert
-    mock_decode.assert_called_once_with(FAKE_TOKEN)
     assert error.value.detail == str(INSUFFISANT_ROLE_EXCEPTION)
@@ -1,20 +1,23 @@
 from datetime import datetime, timedelta, timezone
+from time import monotonic
 
 import pytest
-from jwt import ExpiredSignatureError
+from jwt import ExpiredSignatureError, InvalidSignatureError
 
 from src.Messages.jwt_messages import (
     JwtError,
     EXPIRED_EXCEPTION,
     CANT_FIND_USER_TOKEN_EXCEPTION,
     INVALID_ROLE_EXCEPTION,
+    REVOKED_TOKEN_EXCEPTION,
     JwtCredentialsError,
     CREDENTIALS_EXCEPTION,
 )
 from src.enums.Roles import Roles
 from src.models import User
 from src.security.secrets import SECRET
-from src.services.JWTService import JWTService
+from src.services.JWTService import JWTService, revocation_list, token_cache
+from src.utils import cache as cache_module
 from tests.unit.service.mocks.jwt_mock import (
     decode_module_mock,
     encode_mock,
@@ -98,11 +101,117 @@ def test_decode_jwt_token_wrong_role(mocker, data):
     assert error.value.detail == str(INVALID_ROLE_EXCEPTION)
 
 
+def test_decode_jwt_served_from_cache(mocker):
+    # Arrange
+    data = {"sub": LOGIN, "role": Roles.USER}
+    mock_decode = decode_module_mock(mocker, data)
+    JWTService.decode_jwt(FAKE_TOKEN)
+    hits = token_cache.hits
+
+    # Act
+    result = JWTService.decode_jwt(FAKE_TOKEN)
+
+    # Assert
+    assert result is data
+    mock_decode.assert_called_once()
+    assert token_cache.hits == hits + 1
+
+
+def test_decode_jwt_cached_until_expiry(mocker, use_time_machine):
+    # Arrange
+    token = JWTService.create_token(
+        {"sub": LOGIN, "role": Roles.USER.value}, timedelta(minutes=5)
+    )
+    JWTService.decode_jwt(token)
+    expirations = token_cache.expirations
+
+    # Act
+    use_time_machine.shift(timedelta(minutes=5, seconds=1))
+    mocker.patch.object(cache_module, "monotonic", return_value=monotonic() + 301)
+    with pytest.raises(JwtError) as error:
+        JWTService.decode_jwt(token)
+
+    # Assert
+    assert error.value.detail == str(EXPIRED_EXCEPTION)
+    assert token_cache.expirations == expirations + 1
+
+
+def test_decode_jwt_cache_dropped_when_key_changes(mocker):
+    # Arrange
+    token = JWTService.create_token(
+        {"sub": LOGIN, "role": Roles.USER.value}, timedelta(minutes=5)
+    )
+    JWTService.decode_jwt(token)
+    hits = token_cache.hits
+    mocker.patch.object(SECRET, "SECRET_KEY", "another-secret-key")
+
+    # Act
+    with pytest.raises(InvalidSignatureError):
+        JWTService.decode_jwt(token)
+
+    # Assert
+    assert token_cache.hits == hits
+    assert len(token_cache) == 0
+
+
+def test_decode_jwt_invalid_token_not_cached(mocker):
+    # Arrange
+    mock_decode = decode_module_mock(mocker, {"sub": LOGIN, "role": "UnvalidRole"})
+
+    # Act
+    for _ in range(2):
+        with pytest.raises(JwtError):
+            JWTService.decode_jwt(FAKE_TOKEN)
+
+    # Assert
+    assert mock_decode.call_count == 2
+    assert len(token_cache) == 0
+
+
+def test_decode_jwt_revoked_token_refused_from_cache():
+    # Arrange
+    token = JWTService.create_access_token(get_user())
+    claims = JWTService.decode_jwt(token)
+    hits = token_cache.hits
+
+    # Act
+    revocation_list.revoke_token(claims["jti"], claims["exp"])
+    with pytest.raises(JwtError) as error:
+        JWTService.decode_jwt(token)
+
+    # Assert
+    assert error.value.detail == str(REVOKED_TOKEN_EXCEPTION)
+    assert token_cache.hits == hits + 1
+
+
+def test_decode_jwt_user_revocation_spares_later_tokens():
+    # Arrange
+    user = get_user()
+    old_token = JWTService.create_access_token(user)
+    claims = JWTService.decode_jwt(old_token)
+    revocation_list.revoke_user(claims["user_id"], claims["iat"], claims["exp"])
+
+    # Act
+    new_token = JWTService.create_access_token(user)
+    with pytest.raises(JwtError) as error:
+        JWTService.decode_jwt(old_token)
+    new_claims = JWTService.decode_jwt(new_token)
+
+    # Assert
+    assert error.value.detail == str(REVOKED_TOKEN_EXCEPTION)
+    assert new_claims["sub"] == LOGIN
+    assert new_claims["jti"] != claims["jti"]
+
+
 def test_create_access_token_success(mocker):
     # Arrange
     user = get_user()
     mock_create_token = create_token_mock(mocker)
+    mocker.patch("src.services.JWTService.uuid4").return_value.hex = "jti"
+    mocker.patch("src.services.JWTService.time", return_value=1700000000.5)
     expected_data = {
+        "jti": "jti",
+        "iat": 1700000000.5,
         "user_id": str(user.id),
         "sub": user.login,
         "email": user.email,
@@ -0,0 +1,74 @@
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.services.MonitoringService import MonitoringService
+from src.utils.cache import LRUCache
+from src.utils.db_backend import create_database_engine
+from src.utils.db_pool import InstrumentedQueuePool
+
+
+def test_get_engine_pool_stats_read_pool_settings():
+    # Arrange
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///replica.db",
+        poolclass=InstrumentedQueuePool,
+        pool_size=3,
+        max_overflow=7,
+        pool_recycle=60,
+        pool_pre_ping=True,
+    )
+
+    # Act
+    result = MonitoringService.get_engine_pool_stats("replica_0", engine)
+
+    # Assert
+    assert result.name == "replica_0"
+    assert result.host == "replica.db"
+    assert result.size == 3
+    assert result.max_overflow == 7
+    assert result.recycle == 60
+    assert result.pre_ping is True
+    assert result.checked_out == 0
+
+
+def test_get_db_pool_stats_report_every_engine(mocker):
+    # Arrange
+    replica = create_async_engine(
+        "sqlite+aiosqlite:///replica.db", poolclass=InstrumentedQueuePool
+    )
+    mocker.patch("src.services.MonitoringService.replica_engines", [replica])
+
+    # Act
+    result = MonitoringService.get_db_pool_stats()
+
+    # Assert
+    assert [stats.name for stats in result] == ["primary", "replica_0"]
+
+
+def test_get_db_pool_stats_skip_pools_not_instrumented(mocker):
+    # Arrange
+    memory_replica = create_database_engine("sqlite+aiosqlite://")
+    mocker.patch("src.services.MonitoringService.replica_engines", [memory_replica])
+
+    # Act
+    result = MonitoringService.get_db_pool_stats()
+
+    # Assert
+    assert [stats.name for stats in result] == ["primary"]
+
+
+def test_get_cache_stats_report_counters(mocker):
+    # Arrange
+    mocker.patch.dict("src.utils.cache.caches", clear=True)
+    cache = LRUCache("articles", max_size=4, ttl_seconds=30)
+    cache.set("key", "value")
+    cache.get("key")
+    cache.get("missing")
+
+    # Act
+    result = MonitoringService.get_cache_stats()
+
+    # Assert
+    assert len(result) == 1
+    assert result[0].name == "articles"
+    assert (result[0].size, result[0].max_size) == (1, 4)
+    assert (result[0].hits, result[0].misses) == (1, 1)
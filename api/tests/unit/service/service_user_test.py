@@ -23,7 +23,7 @@ from src.Messages.validators_messages import (
     LOGIN_ALREADY_EXISTS_ERROR,
 )
 from src.models import User
-from src.services.UserService import UserService
+from src.services.UserService import UserService, user_cache
 from tests.unit.service.mocks.password_mock import (
     get_string_hash_mock,
     verify_password_mock,
@@ -146,13 +146,19 @@ async def test_get_user_by_login(mocker):
 async def test_get_users_paginated(mocker):
     # Arrange
     mock_session = session_mock(mocker)
+    mock_fetch_dicts = mocker.patch(
+        "src.services.UserService.fetch_dicts", return_value=[]
+    )
 
     # Act
     await UserService.get_users_paginated(mock_session, PAGE, SIZE, STATUS, ROLE)
 
     # Assert
-    mock_session.exec.assert_called_once()
-    mock_session.exec.return_value.all.assert_called_once_with()
+    mock_fetch_dicts.assert_called_once()
+    session, sql = mock_fetch_dicts.call_args.args
+    assert session is mock_session
+    assert "hashed_password" not in str(sql)
+    mock_session.exec.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -173,12 +179,13 @@ async def test_get_users_with_pagination(mocker):
     # Arrange
     total_user_result = 45
     user_list_for_mock = [
-        User(id=USER_ID, login=LOGIN, email=EMAIL, hashed_password=HASHED_PASSWORD)
+        User(id=USER_ID, login=LOGIN, email=EMAIL).model_dump(
+            exclude={"hashed_password"}
+        )
         for _ in range(10)
     ]
     expected_list_result = [
-        UserAdminViewSingleUser.model_validate(user.model_dump())
-        for user in user_list_for_mock
+        UserAdminViewSingleUser.model_validate(user) for user in user_list_for_mock
     ]
     mock_session = session_mock(mocker)
     mock_get_users_paginated = get_users_paginated_mock(mocker, user_list_for_mock)
@@ -227,6 +234,43 @@ async def test_get_user_by_login_with_validity_check_success(mocker):
     mock_user_by_login.assert_called_once_with(mock_session, LOGIN)
 
 
+@pytest.mark.asyncio
+async def test_get_user_by_login_with_validity_check_from_cache(mocker):
+    # Arrange
+    fake_user = User(id=USER_ID, login=LOGIN, email=EMAIL, hashed_password=HASHED_PASSWORD)
+    mock_session = session_mock(mocker)
+    mock_session.merge.side_effect = lambda user, load: user
+    mock_user_by_login = get_user_by_login_mock(mocker, fake_user)
+    await UserService.get_user_by_login_with_validity_check(mock_session, LOGIN)
+
+    # Act
+    result = await UserService.get_user_by_login_with_validity_check(
+        mock_session, LOGIN
+    )
+
+    # Assert
+    assert result == fake_user
+    assert result is not fake_user
+    mock_user_by_login.assert_called_once_with(mock_session, LOGIN)
+    mock_session.merge.assert_called_once_with(result, load=False)
+
+
+@pytest.mark.asyncio
+async def test_patch_disable_user_drops_cached_user(mocker):
+    # Arrange
+    fake_user = User(id=USER_ID, login=LOGIN, email=EMAIL, hashed_password=HASHED_PASSWORD)
+    mock_session = session_mock(mocker)
+    get_user_by_login_mock(mocker, fake_user)
+    get_user_mock(mocker, fake_user)
+    await UserService.get_user_by_login_with_validity_check(mock_session, LOGIN)
+
+    # Act
+    await UserService.admin_patch_disable_user(mock_session, USER_ID)
+
+    # Assert
+    assert user_cache.get(LOGIN) is None
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "fake_user,expected_error",
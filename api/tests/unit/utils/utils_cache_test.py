@@ -0,0 +1,124 @@
+import pytest
+
+from src.utils import cache as cache_module
+from src.utils.cache import LRUCache, caches, clear_caches
+
+
+@pytest.fixture(autouse=True)
+def isolated_registry(mocker):
+    # The caches of the application stay registered once the test is over
+    mocker.patch.dict(cache_module.caches, clear=True)
+
+
+def get_cache(max_size: int = 2, ttl_seconds: float = 60) -> LRUCache:
+    return LRUCache("test", max_size=max_size, ttl_seconds=ttl_seconds)
+
+
+def test_get_counts_hits_and_misses():
+    # Arrange
+    cache = get_cache()
+    cache.set("key", "value")
+
+    # Act
+    results = [cache.get("key"), cache.get("other")]
+
+    # Assert
+    assert results == ["value", None]
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_rate == 0.5
+
+
+def test_set_evicts_least_recently_used():
+    # Arrange
+    cache = get_cache(max_size=2)
+    cache.set("first", 1)
+    cache.set("second", 2)
+    cache.get("first")
+
+    # Act
+    cache.set("third", 3)
+
+    # Assert
+    assert cache.get("second") is None
+    assert cache.get("first") == 1
+    assert cache.get("third") == 3
+    assert cache.evictions == 1
+
+
+def test_get_drops_expired_entry(mocker):
+    # Arrange
+    mock_monotonic = mocker.patch.object(cache_module, "monotonic", return_value=100)
+    cache = get_cache(ttl_seconds=10)
+    cache.set("key", "value")
+    mock_monotonic.return_value = 110
+
+    # Act
+    result = cache.get("key")
+
+    # Assert
+    assert result is None
+    assert cache.expirations == 1
+    assert len(cache) == 0
+
+
+def test_set_with_shorter_ttl_expires_entry_first(mocker):
+    # Arrange
+    mock_monotonic = mocker.patch.object(cache_module, "monotonic", return_value=100)
+    cache = get_cache(ttl_seconds=10)
+    cache.set("short", "value", ttl_seconds=5)
+    cache.set("long", "value", ttl_seconds=20)
+    mock_monotonic.return_value = 105
+
+    # Act
+    results = [cache.get("short"), cache.get("long")]
+    mock_monotonic.return_value = 110
+
+    # Assert
+    assert results == [None, "value"]
+    assert cache.get("long") is None
+
+
+def test_invalidate_drops_one_entry():
+    # Arrange
+    cache = get_cache()
+    cache.set("first", 1)
+    cache.set("second", 2)
+
+    # Act
+    cache.invalidate("first")
+    cache.invalidate("missing")
+
+    # Assert
+    assert cache.get("first") is None
+    assert cache.get("second") == 2
+    assert cache.invalidations == 1
+
+
+def test_invalidate_tags_only_drops_tagged_entries():
+    # Arrange
+    cache = get_cache(max_size=10)
+    cache.set("all", 1, tags=["list:all"])
+    cache.set("category", 2, tags=["list:category:1"])
+    cache.set("other", 3, tags=["list:category:2"])
+
+    # Act
+    cache.invalidate_tags("list:all", "list:category:1")
+
+    # Assert
+    assert cache.get("all") is None
+    assert cache.get("category") is None
+    assert cache.get("other") == 3
+    assert cache.invalidations == 2
+
+
+def test_clear_caches_empties_registered_caches():
+    # Arrange
+    cache = get_cache()
+    cache.set("key", "value")
+
+    # Act
+    clear_caches()
+
+    # Assert
+    assert caches["test"] is cache
+    assert len(cache) == 0
@@ -0,0 +1,152 @@
+import gzip
+
+import brotli
+import pytest
+import zstandard
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from src.utils.compression import (
+    CompressionMiddleware,
+    choose_encoding,
+    compress,
+)
+
+BODY = b"respirez " * 500
+
+choose_encoding_params = {
+    "none": {"header": None, "expected": None},
+    "gzip_only": {"header": "gzip", "expected": "gzip"},
+    "server_preference": {"header": "gzip, br, zstd", "expected": "zstd"},
+    "client_weight": {"header": "zstd;q=0.5, br;q=0.8, gzip", "expected": "gzip"},
+    "refused": {"header": "gzip;q=0", "expected": None},
+    "wildcard": {"header": "*", "expected": "zstd"},
+    "wildcard_except": {"header": "*, zstd;q=0", "expected": "br"},
+    "unknown": {"header": "deflate, compress", "expected": None},
+    "bad_weight": {"header": "br;q=abc, gzip", "expected": "gzip"},
+}
+
+
+@pytest.mark.parametrize(
+    "values",
+    choose_encoding_params.values(),
+    ids=[f"case_{k}" for k in choose_encoding_params.keys()],
+)
+def test_choose_encoding(values: dict):
+    # Act / Assert
+    assert choose_encoding(values["header"]) == values["expected"]
+
+
+@pytest.mark.parametrize(
+    "encoding, decompress",
+    [
+        ("gzip", gzip.decompress),
+        ("br", brotli.decompress),
+        ("zstd", zstandard.ZstdDecompressor().decompressobj().decompress),
+    ],
+    ids=["gzip", "br", "zstd"],
+)
+def test_compress_round_trip(encoding, decompress):
+    # Act
+    compressed = compress(BODY, encoding, 5)
+
+    # Assert
+    assert len(compressed) < len(BODY)
+    assert decompress(compressed) == BODY
+
+
+async def stream_body():
+    for _ in range(3):
+        yield BODY
+
+
+async def large(request):
+    return PlainTextResponse(BODY, headers={"ETag": '"v1"'})
+
+
+async def small(request):
+    return PlainTextResponse(b"ok")
+
+
+async def image(request):
+    return Response(BODY, media_type="image/png")
+
+
+async def stream(request):
+    return StreamingResponse(stream_body(), media_type="application/x-ndjson")
+
+
+async def encoded(request):
+    return Response(
+        compress(BODY, "gzip", 1),
+        headers={"Content-Encoding": "gzip"},
+        media_type="text/plain",
+    )
+
+
+def get_app() -> Starlette:
+    app = Starlette(
+        routes=[
+            Route(f"/{endpoint.__name__}", endpoint)
+            for endpoint in (large, small, image, stream, encoded)
+        ]
+    )
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+    return app
+
+
+async def get(route: str, accept_encoding: str = "gzip"):
+    async with AsyncClient(
+        transport=ASGITransport(app=get_app()), base_url="http://test"
+    ) as client:
+        return await client.get(route, headers={"Accept-Encoding": accept_encoding})
+
+
+@pytest.mark.asyncio
+async def test_middleware_compresses_large_response():
+    # Act
+    response = await get("/large", "br")
+
+    # Assert
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"v1"'
+    assert int(response.headers["content-length"]) < len(BODY)
+    assert response.content == BODY
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "route, accept_encoding",
+    [("/small", "gzip"), ("/image", "gzip"), ("/large", "identity")],
+    ids=["under_threshold", "not_compressible", "not_accepted"],
+)
+async def test_middleware_sends_as_is(route, accept_encoding):
+    # Act
+    response = await get(route, accept_encoding)
+
+    # Assert
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_middleware_compresses_stream():
+    # Act
+    response = await get("/stream", "zstd")
+
+    # Assert
+    assert response.headers["content-encoding"] == "zstd"
+    assert "content-length" not in response.headers
+    assert response.content == BODY * 3
+
+
+@pytest.mark.asyncio
+async def test_middleware_keeps_encoded_response():
+    # Act
+    response = await get("/encoded", "br")
+
+    # Assert
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == BODY
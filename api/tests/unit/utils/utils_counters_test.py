@@ -0,0 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.counters import ShardedCounter
+
+
+def test_increment_and_get():
+    # Arrange
+    counter = ShardedCounter(4)
+
+    # Act
+    counter.increment(1)
+    counter.increment(1)
+    counter.increment(2, 5)
+
+    # Assert
+    assert counter.get(1) == 2
+    assert counter.get(2) == 5
+    assert counter.get(3) == 0
+    assert len(counter) == 2
+
+
+def test_drain_starts_again_from_zero():
+    # Arrange
+    counter = ShardedCounter(4)
+    for key in range(1, 10):
+        counter.increment(key, key)
+
+    # Act
+    drained = counter.drain()
+
+    # Assert
+    assert drained == {key: key for key in range(1, 10)}
+    assert len(counter) == 0
+    assert counter.get(5) == 0
+
+
+def test_restore_adds_to_new_counts():
+    # Arrange
+    counter = ShardedCounter(2)
+    counter.increment(1, 3)
+    drained = counter.drain()
+    counter.increment(1)
+
+    # Act
+    counter.restore(drained)
+
+    # Assert
+    assert counter.get(1) == 4
+
+
+def test_no_increment_lost_while_draining():
+    # Arrange
+    counter = ShardedCounter(8)
+    drained_total = 0
+
+    def increment_many(key: int):
+        for _ in range(10000):
+            counter.increment(key)
+
+    # Act
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(increment_many, key) for key in range(4)]
+        while not all(future.done() for future in futures):
+            drained_total += sum(counter.drain().values())
+    drained_total += sum(counter.drain().values())
+
+    # Assert
+    assert drained_total == 40000
@@ -0,0 +1,156 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.pool import StaticPool
+
+from src.models.Category import Category
+from src.security.secrets import SECRET
+from src.utils.db import create_session_factory
+from src.utils.db_backend import (
+    WriterQueue,
+    WriterQueuedSession,
+    create_database_engine,
+    get_database_url,
+)
+from src.utils.db_pool import InstrumentedQueuePool
+from sqlmodel import SQLModel, select
+
+
+@pytest.mark.parametrize(
+    "backend,is_async,expected_driver",
+    [
+        ("mariadb", True, "mysql+aiomysql://"),
+        ("mariadb", False, "mysql+pymysql://"),
+        ("sqlite", True, "sqlite+aiosqlite:///"),
+        ("sqlite", False, "sqlite:///"),
+    ],
+    ids=["mariadb_async", "mariadb_sync", "sqlite_async", "sqlite_sync"],
+)
+def test_get_database_url(mocker, backend, is_async, expected_driver):
+    # Arrange
+    mocker.patch.object(SECRET, "DB_BACKEND", backend)
+
+    # Act
+    url = get_database_url(is_async)
+
+    # Assert
+    assert url.startswith(expected_driver)
+
+
+@pytest.mark.asyncio
+async def test_sqlite_engine_applies_pragmas(tmp_path):
+    # Arrange
+    engine = create_database_engine(f"sqlite+aiosqlite:///{tmp_path / 'wal.db'}")
+
+    # Act
+    async with engine.connect() as connection:
+        journal_mode = (await connection.execute(text("PRAGMA journal_mode"))).scalar()
+        busy_timeout = (await connection.execute(text("PRAGMA busy_timeout"))).scalar()
+        foreign_keys = (await connection.execute(text("PRAGMA foreign_keys"))).scalar()
+    await engine.dispose()
+
+    # Assert
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+    assert journal_mode == "wal"
+    assert busy_timeout == SECRET.SQLITE_BUSY_TIMEOUT_MS
+    assert foreign_keys == 1
+
+
+def test_memory_sqlite_engine_shares_one_connection():
+    # Act
+    engine = create_database_engine("sqlite+aiosqlite://")
+
+    # Assert
+    assert isinstance(engine.pool, StaticPool)
+
+
+@pytest.mark.asyncio
+async def test_writer_queue_serializes_writers():
+    # Arrange
+    queue = WriterQueue(enabled=True)
+    events = []
+
+    async def write(name: str):
+        async with queue.hold():
+            events.append(f"start {name}")
+            await asyncio.sleep(0.01)
+            events.append(f"end {name}")
+
+    # Act
+    await asyncio.gather(write("first"), write("second"))
+
+    # Assert
+    assert events == ["start first", "end first", "start second", "end second"]
+    assert queue.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_disabled_writer_queue_does_not_wait():
+    # Arrange
+    queue = WriterQueue(enabled=False)
+
+    # Act
+    async with queue.hold():
+        async with queue.hold():
+            nested = True
+
+    # Assert
+    assert nested is True
+
+
+@pytest_asyncio.fixture
+async def queued_factory(tmp_path):
+    engine = create_database_engine(f"sqlite+aiosqlite:///{tmp_path / 'queue.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+    queue = WriterQueue(enabled=True)
+    yield create_session_factory(
+        engine, class_=WriterQueuedSession, writer_queue=queue
+    ), queue
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_queued_session_reads_without_waiting(queued_factory):
+    # Arrange
+    factory, queue = queued_factory
+    await queue.acquire()
+
+    # Act
+    async with factory() as session:
+        result = await asyncio.wait_for(session.exec(select(Category)), 1)
+        categories = result.all()
+        holds_writer = session.holds_writer
+    queue.release()
+
+    # Assert
+    assert categories == []
+    assert holds_writer is False
+
+
+@pytest.mark.asyncio
+async def test_queued_session_holds_queue_from_first_write_until_commit(
+    queued_factory,
+):
+    # Arrange
+    factory, queue = queued_factory
+    async with factory() as writer, factory() as other:
+        writer.add(Category(id=1, label="first"))
+        await writer.flush()
+
+        # Act
+        await asyncio.wait_for(other.exec(select(Category)), 1)
+        other.add(Category(id=2, label="second"))
+        pending_commit = asyncio.create_task(other.commit())
+        await asyncio.sleep(0.01)
+        waiting = queue.waiting
+        await writer.commit()
+        await asyncio.wait_for(pending_commit, 1)
+
+        # Assert
+        assert waiting == 1
+        assert writer.holds_writer is False
+        assert other.holds_writer is False
+        assert queue.waiting == 0
@@ -0,0 +1,81 @@
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.utils.db_pool import InstrumentedQueuePool, WaitHistogram
+
+
+@pytest.mark.parametrize(
+    "elapsed_ms,expected_index",
+    [(0.5, 0), (1, 0), (3, 1), (60, 5), (20000, 12)],
+    ids=["below_first", "on_bound", "second", "middle", "overflow"],
+)
+def test_wait_histogram_observe(elapsed_ms, expected_index):
+    # Arrange
+    histogram = WaitHistogram()
+
+    # Act
+    histogram.observe(elapsed_ms)
+
+    # Assert
+    assert histogram.counts[expected_index] == 1
+    assert histogram.total_count == 1
+    assert histogram.total_ms == elapsed_ms
+    assert histogram.max_ms == elapsed_ms
+
+
+def test_wait_histogram_buckets_end_with_overflow():
+    # Arrange
+    histogram = WaitHistogram(buckets_ms=(1, 10))
+
+    # Act
+    buckets = histogram.buckets()
+
+    # Assert
+    assert buckets == [(1, 0), (10, 0), (None, 0)]
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_records_checkouts():
+    # Arrange
+    engine = create_async_engine(
+        "sqlite+aiosqlite://", poolclass=InstrumentedQueuePool, pool_size=1
+    )
+
+    # Act
+    for _ in range(3):
+        async with engine.connect() as connection:
+            await connection.execute(text("select 1"))
+    pool = engine.pool
+    checked_out = pool.checkedout()
+    await engine.dispose()
+
+    # Assert
+    assert pool.wait_histogram.total_count == 3
+    assert pool.wait_histogram.timeouts == 0
+    assert checked_out == 0
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_records_timeout_once():
+    # Arrange
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+    )
+    histogram = engine.pool.wait_histogram
+
+    # Act
+    async with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            async with engine.connect():
+                pass
+    await engine.dispose()
+
+    # Assert
+    # Only the checkout served by the idle connection is a wait sample
+    assert histogram.timeouts == 1
+    assert histogram.total_count == 1
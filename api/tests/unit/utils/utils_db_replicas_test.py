@@ -0,0 +1,175 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.exc import OperationalError
+
+from src.utils import db, db_replicas
+from src.utils.db import create_session_factory, get_read_session
+from src.utils.db_replicas import ReplicaRouter
+
+PRIMARY = "primary"
+REPLICA_1 = "replica_1"
+REPLICA_2 = "replica_2"
+
+
+def get_router(replicas: list) -> ReplicaRouter:
+    return ReplicaRouter(
+        primary_factory=PRIMARY, replica_factories=replicas, retry_seconds=30
+    )
+
+
+def test_pick_round_robin():
+    # Arrange
+    router = get_router([REPLICA_1, REPLICA_2])
+
+    # Act
+    picked = [router.pick() for _ in range(3)]
+
+    # Assert
+    assert picked == [(0, REPLICA_1), (1, REPLICA_2), (0, REPLICA_1)]
+
+
+def test_pick_without_replica_uses_primary():
+    # Arrange
+    router = get_router([])
+
+    # Act
+    result = router.pick()
+
+    # Assert
+    assert result == (None, PRIMARY)
+
+
+def test_pick_skip_replica_down():
+    # Arrange
+    router = get_router([REPLICA_1, REPLICA_2])
+    router.mark_down(0)
+
+    # Act
+    picked = [router.pick() for _ in range(2)]
+
+    # Assert
+    assert picked == [(1, REPLICA_2), (1, REPLICA_2)]
+
+
+def test_pick_every_replica_down_uses_primary():
+    # Arrange
+    router = get_router([REPLICA_1, REPLICA_2])
+    router.mark_down(0)
+    router.mark_down(1)
+
+    # Act
+    result = router.pick()
+
+    # Assert
+    assert result == (None, PRIMARY)
+
+
+def test_pick_replica_back_after_retry_delay(mocker):
+    # Arrange
+    mock_monotonic = mocker.patch.object(db_replicas, "monotonic", return_value=100)
+    router = get_router([REPLICA_1])
+    router.mark_down(0)
+
+    # Act
+    mock_monotonic.return_value = 131
+    result = router.pick()
+
+    # Assert
+    assert result == (0, REPLICA_1)
+
+
+@pytest.mark.asyncio
+async def test_get_read_session_reads_on_replica(mocker):
+    # Arrange
+    engine = create_async_engine("sqlite+aiosqlite://")
+    router = get_router([create_session_factory(engine)])
+    mocker.patch.object(db, "read_router", router)
+
+    # Act
+    generator = get_read_session()
+    session = await anext(generator)
+    result = await session.exec(text("select 1"))
+    value = result.scalar_one()
+    await generator.aclose()
+    await engine.dispose()
+
+    # Assert
+    assert value == 1
+
+
+def get_disconnect_error() -> OperationalError:
+    return OperationalError(
+        "select 1", {}, Exception(), connection_invalidated=True
+    )
+
+
+def get_dead_replica_factory(mocker):
+    session = mocker.AsyncMock()
+    session.connection.side_effect = get_disconnect_error()
+    return mocker.MagicMock(return_value=session)
+
+
+@pytest.mark.asyncio
+async def test_open_session_skip_dead_replica(mocker):
+    # Arrange
+    engine = create_async_engine("sqlite+aiosqlite://")
+    dead_factory = get_dead_replica_factory(mocker)
+    router = get_router([dead_factory, create_session_factory(engine)])
+
+    # Act
+    index, session = await router.open_session()
+    await session.close()
+    await engine.dispose()
+
+    # Assert
+    assert index == 1
+    assert router.is_down(0) is True
+    dead_factory.return_value.close.assert_awaited_once_with()
+
+
+@pytest.mark.asyncio
+async def test_open_session_every_replica_dead_uses_primary(mocker):
+    # Arrange
+    primary_factory = mocker.MagicMock()
+    router = ReplicaRouter(
+        primary_factory=primary_factory,
+        replica_factories=[get_dead_replica_factory(mocker)],
+        retry_seconds=30,
+    )
+
+    # Act
+    index, session = await router.open_session()
+
+    # Assert
+    assert index is None
+    assert session is primary_factory.return_value
+    assert router.is_down(0) is True
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "connection_invalidated,expected_down",
+    [(True, True), (False, False)],
+    ids=["disconnect", "query_error"],
+)
+async def test_get_read_session_mark_replica_down_only_on_disconnect(
+    mocker, connection_invalidated, expected_down
+):
+    # Arrange
+    engine = create_async_engine("sqlite+aiosqlite://")
+    router = get_router([create_session_factory(engine)])
+    mocker.patch.object(db, "read_router", router)
+    generator = get_read_session()
+    await anext(generator)
+    error = OperationalError(
+        "select 1", {}, Exception(), connection_invalidated=connection_invalidated
+    )
+
+    # Act
+    with pytest.raises(OperationalError):
+        await generator.athrow(error)
+    await engine.dispose()
+
+    # Assert
+    assert router.is_down(0) is expected_down
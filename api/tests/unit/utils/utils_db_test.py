@@ -0,0 +1,38 @@
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.utils.db import SessionFactory, async_engine, get_session
+
+
+@pytest.mark.asyncio
+async def test_get_session_yields_session_without_connection():
+    # Act
+    generator = get_session()
+    session = await anext(generator)
+    in_transaction = session.in_transaction()
+    await generator.aclose()
+
+    # Assert
+    assert isinstance(session, AsyncSession)
+    assert session.bind is async_engine
+    assert in_transaction is False
+
+
+@pytest.mark.asyncio
+async def test_get_session_uses_module_factory(mocker):
+    # Arrange
+    mock_factory = mocker.patch("src.utils.db.SessionFactory")
+
+    # Act
+    generator = get_session()
+    session = await anext(generator)
+    await generator.aclose()
+
+    # Assert
+    mock_factory.assert_called_once_with()
+    assert session is mock_factory.return_value.__aenter__.return_value
+
+
+def test_session_factory_keeps_objects_after_commit():
+    # Assert
+    assert SessionFactory.kw["expire_on_commit"] is False
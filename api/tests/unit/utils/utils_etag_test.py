@@ -0,0 +1,33 @@
+import pytest
+
+from src.utils.etag import etag_matches, make_etag
+
+ETAG = make_etag("categories", (2, 2))
+
+
+def test_make_etag_is_strong_and_stable():
+    # Act
+    etag = make_etag("categories", (2, 2))
+
+    # Assert
+    assert etag == ETAG
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag != make_etag("categories", (3, 3))
+
+
+@pytest.mark.parametrize(
+    "if_none_match,expected",
+    [
+        (None, False),
+        ("", False),
+        (ETAG, True),
+        (f'"other", {ETAG}', True),
+        (f"W/{ETAG}", True),
+        ("*", True),
+        ('"other"', False),
+    ],
+    ids=["missing", "empty", "same", "in_list", "weak", "any", "other"],
+)
+def test_etag_matches(if_none_match, expected):
+    # Act / Assert
+    assert etag_matches(if_none_match, ETAG) is expected
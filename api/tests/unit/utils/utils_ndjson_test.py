@@ -0,0 +1,50 @@
+import pytest
+
+from src.utils.ndjson import iter_lines
+
+
+async def stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+iter_lines_params = {
+    "one_chunk": {
+        "chunks": [b'{"a": 1}\n{"a": 2}\n'],
+        "expected": [(1, b'{"a": 1}'), (2, b'{"a": 2}')],
+    },
+    "line_across_chunks": {
+        "chunks": [b'{"a"', b": 1}\n", b'{"a": 2}'],
+        "expected": [(1, b'{"a": 1}'), (2, b'{"a": 2}')],
+    },
+    "blank_lines_keep_numbers": {
+        "chunks": [b"\n  \n1\n\n2"],
+        "expected": [(3, b"1"), (5, b"2")],
+    },
+    "too_long_in_one_chunk": {
+        "chunks": [b"1\n0123456789\n2\n"],
+        "expected": [(1, b"1"), (2, None), (3, b"2")],
+    },
+    "too_long_across_chunks": {
+        "chunks": [b"1\n01234", b"56789", b"0123\n2"],
+        "expected": [(1, b"1"), (2, None), (3, b"2")],
+    },
+    "too_long_last_line": {
+        "chunks": [b"1\n01234", b"56789"],
+        "expected": [(1, b"1"), (2, None)],
+    },
+}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "values",
+    iter_lines_params.values(),
+    ids=[f"case_{k}" for k in iter_lines_params.keys()],
+)
+async def test_iter_lines(values: dict):
+    # Act
+    lines = [line async for line in iter_lines(stream(*values["chunks"]), 8)]
+
+    # Assert
+    assert lines == values["expected"]
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+import pytest
+
+from src.utils.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    # Arrange
+    created_at = datetime(2025, 7, 30, 11, 40, 32, 706653)
+
+    # Act
+    cursor = encode_cursor(created_at, 42)
+
+    # Assert
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    ["not-a-cursor", "", encode_cursor(datetime(2025, 1, 1), 1)[:-3]],
+    ids=["garbage", "empty", "truncated"],
+)
+def test_decode_invalid_cursor(cursor: str):
+    # Act / Assert
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
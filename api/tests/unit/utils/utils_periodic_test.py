@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from src.utils.periodic import PeriodicTask
+
+
+@pytest.mark.asyncio
+async def test_runs_every_interval_and_once_on_stop():
+    # Arrange
+    calls = []
+
+    async def function():
+        calls.append(1)
+
+    task = PeriodicTask("test", 0.01, function)
+
+    # Act
+    task.start()
+    await asyncio.sleep(0.055)
+    await task.stop()
+
+    # Assert
+    assert len(calls) >= 4
+
+
+@pytest.mark.asyncio
+async def test_keeps_running_after_a_failure():
+    # Arrange
+    calls = []
+
+    async def function():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ConnectionError("lost")
+
+    task = PeriodicTask("test", 0.01, function)
+
+    # Act
+    task.start()
+    # The logged traceback of the failure can take a while on a loaded machine
+    for _ in range(100):
+        if len(calls) >= 2:
+            break
+        await asyncio.sleep(0.01)
+    await task.stop(run_last=False)
+    nb_calls = len(calls)
+    await asyncio.sleep(0.02)
+
+    # Assert
+    assert nb_calls >= 2
+    assert len(calls) == nb_calls
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_the_run_in_flight():
+    # Arrange
+    calls = []
+
+    async def function():
+        calls.append("started")
+        await asyncio.sleep(0.05)
+        calls.append("done")
+
+    task = PeriodicTask("test", 0.01, function)
+
+    # Act
+    task.start()
+    await asyncio.sleep(0.03)
+    await task.stop(run_last=False)
+
+    # Assert
+    assert calls == ["started", "done"]
@@ -0,0 +1,78 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from src.utils.query_stats import (
+    QueryStats,
+    current_query_stats,
+    instrument_engine,
+    normalize_statement,
+)
+
+
+@pytest.mark.parametrize(
+    "statement,expected",
+    [
+        ("SELECT *\n  FROM user", "SELECT * FROM user"),
+        ("SELECT * FROM user WHERE id IN (?, ?, ?)", "SELECT * FROM user WHERE id IN (?)"),
+        ("SELECT * FROM user WHERE id IN (%s, %s)", "SELECT * FROM user WHERE id IN (?)"),
+    ],
+    ids=["whitespaces", "qmark_in_clause", "format_in_clause"],
+)
+def test_normalize_statement(statement, expected):
+    assert normalize_statement(statement) == expected
+
+
+def test_query_stats_duplicates():
+    # Arrange
+    stats = QueryStats()
+
+    # Act
+    for statement in ["SELECT 1", "SELECT 2", "SELECT 2", "SELECT 2"]:
+        stats.record(statement, 0.5)
+
+    # Assert
+    assert stats.count == 4
+    assert stats.total_time == 2
+    assert stats.duplicates == 2
+    assert stats.repeated_shapes() == ["SELECT 2"]
+
+
+def test_instrument_engine_count_inside_context_only():
+    # Arrange
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    instrument_engine(engine)
+    stats = QueryStats()
+
+    # Act
+    with engine.connect() as connection:
+        connection.execute(text("select 1"))
+        token = current_query_stats.set(stats)
+        connection.execute(text("select 1"))
+        current_query_stats.reset(token)
+        connection.execute(text("select 1"))
+
+    # Assert
+    assert stats.count == 1
+    assert stats.duplicates == 0
+
+
+def test_instrument_engine_failed_statement_leaves_nothing_behind():
+    # Arrange
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    stats = QueryStats()
+
+    # Act
+    with engine.connect() as connection:
+        token = current_query_stats.set(stats)
+        with pytest.raises(OperationalError):
+            connection.execute(text("select * from missing_table"))
+        connection.execute(text("select 1"))
+        current_query_stats.reset(token)
+        info = dict(connection.info)
+
+    # Assert
+    assert stats.count == 1
+    assert "query_start_times" not in info
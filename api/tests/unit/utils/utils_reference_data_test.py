@@ -0,0 +1,96 @@
+import json
+from contextlib import nullcontext
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.models.Category import Category
+from src.utils import reference_data
+from src.utils.reference_data import ReferenceTable
+
+
+@pytest_asyncio.fixture
+async def session(mocker):
+    # The tables of the test stay out of the registry of the app
+    mocker.patch.dict(reference_data.reference_tables, clear=True)
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+        await connection.execute(
+            insert(Category), [{"id": 1, "label": "b"}, {"id": 2, "label": "a"}]
+        )
+    async with AsyncSession(engine) as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_load_builds_rows_and_bodies(session):
+    # Arrange
+    table = ReferenceTable("test_categories", Category, order_by=Category.label)
+
+    # Act
+    snapshot = await table.load(session)
+
+    # Assert
+    assert list(snapshot.rows) == [2, 1]
+    assert [category["label"] for category in json.loads(snapshot.body.body)] == [
+        "a",
+        "b",
+    ]
+    assert json.loads(snapshot.row_bodies[1].body)["label"] == "b"
+    assert snapshot.body.etag != snapshot.row_bodies[1].etag
+    assert snapshot.rows[1] not in session
+    with pytest.raises(TypeError):
+        snapshot.rows[3] = Category(id=3, label="c")
+
+
+@pytest.mark.asyncio
+async def test_get_snapshot_loads_once(session):
+    # Arrange
+    table = ReferenceTable("test_categories", Category, order_by=Category.label)
+
+    # Act
+    first_snapshot = await table.get_snapshot(session)
+    second_snapshot = await table.get_snapshot(session)
+
+    # Assert
+    assert second_snapshot is first_snapshot
+    assert table.loads == 1
+
+
+@pytest.mark.asyncio
+async def test_reload_changes_etag_only_when_rows_change(session):
+    # Arrange
+    table = ReferenceTable("test_categories", Category, order_by=Category.label)
+    first_snapshot = await table.load(session)
+
+    # Act
+    same_snapshot = await table.load(session)
+    await session.exec(insert(Category).values(id=3, label="c"))
+    new_snapshot = await table.load(session)
+
+    # Assert
+    assert same_snapshot.body.etag == first_snapshot.body.etag
+    assert new_snapshot.body.etag != first_snapshot.body.etag
+    assert new_snapshot.row_bodies[1].etag == first_snapshot.row_bodies[1].etag
+    assert len(first_snapshot.rows) == 2
+
+
+@pytest.mark.asyncio
+async def test_open_snapshot_opens_session_only_to_load(session, mocker):
+    # Arrange
+    table = ReferenceTable("test_categories", Category, order_by=Category.label)
+    opener = mocker.Mock(return_value=nullcontext(session))
+
+    # Act
+    first_snapshot = await table.open_snapshot(opener)
+    second_snapshot = await table.open_snapshot(opener)
+
+    # Assert
+    assert second_snapshot is first_snapshot
+    opener.assert_called_once_with()
@@ -0,0 +1,62 @@
+import pytest
+
+from src.utils.revocation import RevocationList
+
+USER_ID = "a4b0f9a6-0d3c-4d0e-9a57-7c1f0e3b2d11"
+
+
+@pytest.mark.parametrize(
+    "claims, expected",
+    [
+        ({"jti": "revoked", "user_id": "other", "iat": 150}, True),
+        ({"jti": "valid", "user_id": USER_ID, "iat": 50}, True),
+        ({"jti": "valid", "user_id": USER_ID, "iat": 100}, True),
+        ({"jti": "valid", "user_id": USER_ID, "iat": 100.5}, False),
+        ({"user_id": USER_ID}, True),
+        ({"jti": "valid", "user_id": "other", "iat": 50}, False),
+        ({"sub": "login"}, False),
+    ],
+    ids=[f"case_{k}" for k in range(7)],
+)
+def test_is_revoked(claims, expected):
+    # Arrange
+    revocation_list = RevocationList()
+    revocation_list.revoke_token("revoked", expires_at=1000)
+    revocation_list.revoke_user(USER_ID, revoked_before=100, expires_at=1000)
+
+    # Act
+    result = revocation_list.is_revoked(claims)
+
+    # Assert
+    assert result is expected
+
+
+def test_revoke_user_keeps_latest_revocation():
+    # Arrange
+    revocation_list = RevocationList()
+
+    # Act
+    revocation_list.revoke_user(USER_ID, revoked_before=200, expires_at=2000)
+    revocation_list.revoke_user(USER_ID, revoked_before=100, expires_at=1000)
+
+    # Assert
+    assert revocation_list.is_revoked({"user_id": USER_ID, "iat": 150})
+    revocation_list.prune(now=1500)
+    assert len(revocation_list) == 1
+
+
+def test_prune_drops_expired_entries():
+    # Arrange
+    revocation_list = RevocationList()
+    revocation_list.revoke_token("expired", expires_at=100)
+    revocation_list.revoke_token("valid", expires_at=300)
+    revocation_list.revoke_user(USER_ID, revoked_before=50, expires_at=100)
+
+    # Act
+    revocation_list.prune(now=200)
+
+    # Assert
+    assert len(revocation_list) == 1
+    assert not revocation_list.is_revoked({"jti": "expired"})
+    assert revocation_list.is_revoked({"jti": "valid"})
+    assert not revocation_list.is_revoked({"user_id": USER_ID, "iat": 10})
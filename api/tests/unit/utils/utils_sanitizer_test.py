@@ -0,0 +1,148 @@
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from src.utils import cache as cache_module
+from src.utils.sanitizer import (
+    ContentTooLargeError,
+    SanitizeTimeoutError,
+    SanitizeUnavailableError,
+    Sanitizer,
+    clean_html,
+)
+
+DIRTY_HTML = '<p onclick="steal()">Bonjour <script>alert(1)</script><b>toi</b></p>'
+CLEAN_HTML = "<p>Bonjour alert(1)<b>toi</b></p>"
+
+
+@pytest.fixture(autouse=True)
+def isolated_registry(mocker):
+    mocker.patch.dict(cache_module.caches, clear=True)
+
+
+@pytest.fixture
+def process_sanitizer():
+    sanitizer = Sanitizer(
+        workers=2, max_content_bytes=10_000, timeout_seconds=30, memo_size=10
+    )
+    yield sanitizer
+    sanitizer.shutdown()
+
+
+def test_clean_html_strips_forbidden_markup():
+    # Act / Assert
+    assert clean_html(DIRTY_HTML) == CLEAN_HTML
+
+
+@pytest.mark.asyncio
+async def test_sanitize_batch_in_worker_processes(process_sanitizer):
+    # Arrange
+    contents = [f"<p>{index}<script>x</script></p>" for index in range(5)]
+
+    # Act
+    result = await process_sanitizer.sanitize_batch(contents + [DIRTY_HTML])
+
+    # Assert
+    assert result == [f"<p>{index}x</p>" for index in range(5)] + [CLEAN_HTML]
+
+
+@pytest.mark.asyncio
+async def test_sanitize_memoizes_by_content(mocker):
+    # Arrange
+    sanitizer = Sanitizer(
+        workers=0, max_content_bytes=10_000, timeout_seconds=30, memo_size=10
+    )
+    spy_clean = mocker.spy(sanitizer, "_clean_in_workers")
+
+    # Act
+    first = await sanitizer.sanitize(DIRTY_HTML)
+    second = await sanitizer.sanitize(DIRTY_HTML)
+
+    # Assert
+    assert first == second == CLEAN_HTML
+    spy_clean.assert_called_once()
+    assert sanitizer.memo.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_sanitize_rejects_large_content():
+    # Arrange
+    sanitizer = Sanitizer(workers=0, max_content_bytes=10, timeout_seconds=30, memo_size=0)
+
+    # Act / Assert
+    with pytest.raises(ContentTooLargeError):
+        await sanitizer.sanitize("<p>" + "é" * 10 + "</p>")
+
+
+@pytest.mark.asyncio
+async def test_sanitize_timeout_restarts_workers(process_sanitizer, mocker):
+    # Arrange
+    await process_sanitizer.sanitize("<p>warm up</p>")
+    executor = process_sanitizer.get_executor()
+    process_sanitizer.timeout_seconds = 0.000001
+
+    # Act
+    with pytest.raises(SanitizeTimeoutError):
+        await process_sanitizer.sanitize("<p>too slow</p>")
+
+    # Assert
+    assert process_sanitizer.get_executor() is not executor
+
+
+@pytest.mark.asyncio
+async def test_retire_lets_running_calls_of_other_requests_finish():
+    # Arrange
+    sanitizer = Sanitizer(
+        workers=2, max_content_bytes=10_000_000, timeout_seconds=30, memo_size=0
+    )
+    await sanitizer.sanitize("<p>warm up</p>")
+    executor = sanitizer.get_executor()
+    content = "<p>long<script>x</script></p>" * 20_000
+    running_call = asyncio.create_task(sanitizer.sanitize(content))
+    await asyncio.sleep(0.1)
+
+    # Act
+    # Another request timed out on the same pool meanwhile
+    sanitizer.retire(executor)
+    result = await running_call
+
+    # Assert
+    assert result == "<p>longx</p>" * 20_000
+    assert sanitizer.get_executor() is not executor
+    sanitizer.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_broken_pool_retried_once(mocker):
+    # Arrange
+    sanitizer = Sanitizer(
+        workers=0, max_content_bytes=10_000, timeout_seconds=30, memo_size=0
+    )
+    mock_clean = mocker.patch.object(
+        sanitizer, "_clean_chunks", side_effect=[BrokenProcessPool(), [CLEAN_HTML]]
+    )
+
+    # Act
+    result = await sanitizer.sanitize(DIRTY_HTML)
+
+    # Assert
+    assert result == CLEAN_HTML
+    assert mock_clean.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_broken_pool_twice_unavailable(mocker):
+    # Arrange
+    sanitizer = Sanitizer(
+        workers=0, max_content_bytes=10_000, timeout_seconds=30, memo_size=0
+    )
+    mocker.patch.object(
+        sanitizer,
+        "_clean_chunks",
+        side_effect=[BrokenProcessPool(), BrokenProcessPool()],
+    )
+
+    # Act / Assert
+    with pytest.raises(SanitizeUnavailableError):
+        await sanitizer.sanitize(DIRTY_HTML)
@@ -0,0 +1,76 @@
+import pytest
+
+from src.utils.search import SearchIndex, fold, tokenize
+
+
+def test_fold_removes_accents_and_ligatures():
+    # Act / Assert
+    assert fold("Méditation du Cœur À l'ÉTÉ") == "meditation du coeur a l'ete"
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("<p>La <b>Méditation</b> guidée</p>", ["meditation", "guidee"]),
+        ("Les exercices de respiration", ["exercice", "respiration"]),
+        ("&eacute;t&eacute; 2025", ["ete", "2025"]),
+    ],
+    ids=["html", "stop_words_and_plural", "entities"],
+)
+def test_tokenize(text, expected):
+    # Act / Assert
+    assert tokenize(text) == expected
+
+
+def get_index() -> SearchIndex:
+    index = SearchIndex()
+    index.add(1, "Méditation guidée", "<p>Respirer calmement le matin</p>")
+    index.add(2, "Sommeil", "<p>La méditation aide au sommeil</p>")
+    index.add(3, "Sport", "<p>Courir chaque semaine</p>")
+    return index
+
+
+def test_search_ranks_title_matches_first():
+    # Arrange
+    index = get_index()
+
+    # Act
+    result = index.search("meditation")
+
+    # Assert
+    assert [document_id for document_id, _ in result] == [1, 2]
+    assert result[0][1] > result[1][1] > 0
+
+
+def test_search_without_known_term():
+    # Arrange
+    index = get_index()
+
+    # Act / Assert
+    assert index.search("yoga") == []
+    assert index.search("les") == []
+
+
+def test_remove_drops_document_from_results():
+    # Arrange
+    index = get_index()
+
+    # Act
+    index.remove(1)
+
+    # Assert
+    assert [document_id for document_id, _ in index.search("méditation")] == [2]
+    assert len(index) == 2
+    assert index.max_id == 3
+
+
+def test_add_again_replaces_document():
+    # Arrange
+    index = get_index()
+
+    # Act
+    index.add(3, "Yoga", "<p>Postures</p>")
+
+    # Assert
+    assert index.search("sport") == []
+    assert [document_id for document_id, _ in index.search("yoga")] == [3]
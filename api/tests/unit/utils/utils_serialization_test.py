@@ -0,0 +1,90 @@
+import json
+import uuid
+from datetime import datetime
+from typing import List
+
+from src.dto.dto_articles import GetArticleResponseMin
+from src.enums.Roles import Roles
+from src.utils.serialization import (
+    SerializationStats,
+    Serializer,
+    TimedORJSONResponse,
+    current_serialization_stats,
+    measure_serialization,
+)
+
+CREATED_AT = datetime(2025, 1, 2, 3, 4, 5)
+
+
+def get_article(id: int) -> GetArticleResponseMin:
+    return GetArticleResponseMin(
+        id=id,
+        title=f"title {id}",
+        id_category=1,
+        creator="creator",
+        category="category",
+        created_at=CREATED_AT,
+    )
+
+
+def test_serializer_dumps_same_json_as_pydantic():
+    # Arrange
+    serializer = Serializer(List[GetArticleResponseMin])
+    articles = [get_article(1), get_article(2)]
+
+    # Act
+    body = serializer.dump_json(articles)
+
+    # Assert
+    assert json.loads(body) == [
+        json.loads(article.model_dump_json()) for article in articles
+    ]
+
+
+def test_serializer_response():
+    # Arrange
+    serializer = Serializer(GetArticleResponseMin)
+
+    # Act
+    response = serializer.response(get_article(1), status_code=201)
+
+    # Assert
+    assert response.status_code == 201
+    assert response.media_type == "application/json"
+    assert json.loads(response.body)["created_at"] == CREATED_AT.isoformat()
+
+
+def test_timed_orjson_response_encodes_natively():
+    # Arrange
+    user_id = uuid.uuid4()
+
+    # Act
+    response = TimedORJSONResponse(
+        {"id": user_id, "created_at": CREATED_AT, "role": Roles.ADMIN}
+    )
+
+    # Assert
+    assert json.loads(response.body) == {
+        "id": str(user_id),
+        "created_at": CREATED_AT.isoformat(),
+        "role": Roles.ADMIN.value,
+    }
+
+
+def test_serialization_recorded_inside_context_only():
+    # Arrange
+    serializer = Serializer(GetArticleResponseMin)
+    stats = SerializationStats()
+
+    # Act
+    serializer.dump_json(get_article(1))
+    token = current_serialization_stats.set(stats)
+    serializer.dump_json(get_article(2))
+    TimedORJSONResponse({"hello": "world"})
+    current_serialization_stats.reset(token)
+    with measure_serialization():
+        pass
+
+    # Assert
+    assert stats.count == 2
+    assert stats.total_time > 0
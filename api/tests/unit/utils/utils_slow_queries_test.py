@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.services.ArticlesService import ArticleService
+from src.utils.query_stats import instrument_engine
+from src.utils.slow_queries import SlowQueryRecorder, get_parameter_shapes
+from src.utils import query_stats
+
+
+@pytest.mark.parametrize(
+    "parameters,executemany,expected",
+    [
+        ({"login": "user", "limit": 10}, False, ["login:str", "limit:int"]),
+        (("user", 10), False, ["str", "int"]),
+        ([("user",), ("admin",)], True, ["2 rows of", "str"]),
+        (None, False, []),
+    ],
+    ids=["named", "positional", "executemany", "none"],
+)
+def test_get_parameter_shapes(parameters, executemany, expected):
+    assert get_parameter_shapes(parameters, executemany) == expected
+
+
+@pytest.mark.asyncio
+async def test_slow_query_recorded_with_caller_and_explain(mocker):
+    # Arrange
+    recorder = SlowQueryRecorder(threshold_ms=0, size=5)
+    mocker.patch.object(query_stats, "_query_observers", [recorder.observe])
+    engine = create_async_engine("sqlite+aiosqlite://")
+    instrument_engine(engine)
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+    recorder.clear()
+
+    # Act
+    async with AsyncSession(engine) as session:
+        await ArticleService.get_article_version(session, 1)
+    await engine.dispose()
+
+    # Assert
+    records = recorder.records()
+    assert len(records) == 1
+    assert records[0].statement.startswith("SELECT article.id")
+    assert records[0].caller == "ArticleService.get_article_version"
+    assert records[0].parameter_shapes == ["int"]
+    assert records[0].explain
+
+
+def test_slow_query_recorder_is_bounded():
+    # Arrange
+    recorder = SlowQueryRecorder(threshold_ms=0, size=2, explain=False)
+
+    # Act
+    for index in range(3):
+        recorder.observe(None, None, f"UPDATE t SET a = {index}", (), None, False, 1)
+
+    # Assert
+    assert [record.statement for record in recorder.records()] == [
+        "UPDATE t SET a = 2",
+        "UPDATE t SET a = 1",
+    ]
+
+
+def test_slow_query_below_threshold_ignored():
+    # Arrange
+    recorder = SlowQueryRecorder(threshold_ms=100, size=2)
+
+    # Act
+    recorder.observe(None, None, "SELECT 1", (), None, False, 0.05)
+
+    # Assert
+    assert recorder.records() == []
@@ -1,21 +1,22 @@
 import os
 from typing import List
 
-from sqlmodel import SQLModel, create_engine
+from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
 
+from src.utils.db_backend import create_database_engine, create_sync_database_engine
+
 
 IS_ECHO = False
 IS_ECHO_ASYNC = False
 DB_NAME = "test.db"
 
-sqlite_sync_engine = create_engine(
+sqlite_sync_engine = create_sync_database_engine(
     f"sqlite:///{DB_NAME}", echo=IS_ECHO, query_cache_size=0
 )
-sqlite_async_engine = create_async_engine(
-    url=f"sqlite+aiosqlite:///{DB_NAME}", echo=IS_ECHO_ASYNC, query_cache_size=0
+sqlite_async_engine = create_database_engine(
+    f"sqlite+aiosqlite:///{DB_NAME}", echo=IS_ECHO_ASYNC, query_cache_size=0
 )
 
 Session = sessionmaker(
@@ -26,8 +27,10 @@ Session = sessionmaker(
 
 
 def delete_db():
-    if os.path.exists(DB_NAME):
-        os.remove(DB_NAME)
+    # The write-ahead log must go with the database it belongs to
+    for path in (DB_NAME, f"{DB_NAME}-wal", f"{DB_NAME}-shm"):
+        if os.path.exists(path):
+            os.remove(path)
 
 
 def reset_test_db():
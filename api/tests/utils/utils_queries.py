@@ -0,0 +1,19 @@
+from httpx import Response
+
+from src.utils.query_stats import DUPLICATE_QUERY_HEADER, QUERY_COUNT_HEADER
+
+
+def get_query_count(response: Response) -> int:
+    return int(response.headers[QUERY_COUNT_HEADER])
+
+
+def assert_max_queries(response: Response, max_queries: int) -> None:
+    query_count = get_query_count(response)
+    assert query_count <= max_queries, (
+        f"{query_count} queries executed, expected at most {max_queries}"
+    )
+
+
+def assert_no_duplicate_queries(response: Response) -> None:
+    duplicates = int(response.headers[DUPLICATE_QUERY_HEADER])
+    assert duplicates == 0, f"{duplicates} statements were repeated (N+1)"
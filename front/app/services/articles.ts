@@ -19,9 +19,12 @@ export interface Article {
 
 export interface ArticlesResponse {
   articles: Article[];
-  count: number;
+  count: number | null;
+  next_cursor: string | null;
 }
 
+const ARTICLES_PAGE_SIZE = 100;
+
 export async function createArticle(articleData: ArticleData, token?: string) {
   const body = JSON.stringify({
     title: articleData.title,
@@ -77,17 +80,30 @@ export async function getArticle(articleId: string | number): Promise<Article> {
 }
 
 export async function getAllArticles(categoryId?: number): Promise<ArticlesResponse> {
-  const url = new URL(`${CLIENT_API_URL}/articles/`);
+  const articles: Article[] = [];
+  let cursor: string | null = null;
+
+  // L'API renvoie les articles par page, on suit le curseur jusqu'à la dernière
+  do {
+    const url = new URL(`${CLIENT_API_URL}/articles/`);
+    url.searchParams.append('limit', ARTICLES_PAGE_SIZE.toString());
+    if (categoryId) {
+      url.searchParams.append('category_id', categoryId.toString());
+    }
+    if (cursor) {
+      url.searchParams.append('cursor', cursor);
+    }
 
-  if (categoryId) {
-    url.searchParams.append('category_id', categoryId.toString());
-  }
+    const response = await fetch(url.toString());
+    if (!response.ok) {
+      const error = await response.json();
+      throw new Error(error.message ?? 'Erreur lors de la récupération des articles');
+    }
 
-  const response = await fetch(url.toString());
-  if (!response.ok) {
-    const error = await response.json();
-    throw new Error(error.message ?? 'Erreur lors de la récupération des articles');
-  }
+    const page: ArticlesResponse = await response.json();
+    articles.push(...page.articles);
+    cursor = page.next_cursor;
+  } while (cursor);
 
-  return await response.json();
+  return { articles, count: articles.length, next_cursor: null };
 }
@@ -2,6 +2,7 @@ import { CLIENT_API_URL } from '@/next.config';
 export interface Category {
   id: number;
   label: string;
+  article_count: number;
 }
 
 export async function getAllCategories(): Promise<Category[]> {